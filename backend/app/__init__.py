@@ -1,15 +1,19 @@
 from __future__ import annotations
+import hmac
 import os
-from flask import Flask
+from flask import Flask, request
 from flask_cors import CORS
 from .config import settings
-from .db import init_engine, init_session, Base
+from .db import init_app as init_db, init_engine, init_replicas, init_session, replica_status
 from .routes import register_routes
 from .auth import init_jwt
+from .json_provider import json_provider
+from .services import http_metrics, profiling, query_stats
 
 
 def create_app() -> Flask:
     app = Flask(__name__)
+    app.json = json_provider(app, settings.JSON_PROVIDER)
 
     # CORS
     CORS(app, origins=settings.ALLOWED_ORIGINS, supports_credentials=True)
@@ -21,10 +25,20 @@ def create_app() -> Flask:
     app.config["MAX_CONTENT_LENGTH"] = 32 * 1024 * 1024
 
     # DB init
-    engine = init_engine(settings.DATABASE_URL)
+    pool = dict(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    engine = init_engine(settings.DATABASE_URL, **pool)
     init_session(engine)
-    if settings.AUTO_CREATE_TABLES:
-        Base.metadata.create_all(bind=engine)
+    init_replicas(settings.DATABASE_REPLICA_URLS, max_lag=settings.DB_REPLICA_MAX_LAG,
+                  check_interval=settings.DB_REPLICA_CHECK_INTERVAL, **pool)
+    init_db(app)
+    query_stats.init_app(app)
+    http_metrics.init_app(app)
+    profiling.init_app(app)
 
     # JWT
     init_jwt(app)
@@ -34,8 +48,18 @@ def create_app() -> Flask:
 
     @app.get("/health")
     def health():  # type: ignore
+        if settings.DATABASE_REPLICA_URLS:
+            return {"status": "ok", "replicas": replica_status()}
         return {"status": "ok"}
 
+    @app.get("/metrics")
+    def metrics():  # type: ignore
+        """Prometheus text exposition of every in-process metric."""
+        if settings.METRICS_TOKEN and not hmac.compare_digest(
+                request.headers.get("Authorization", ""), f"Bearer {settings.METRICS_TOKEN}"):
+            return {"error": "unauthorized"}, 401
+        return http_metrics.metrics_response()
+
     # ---- JSON error handlers ----
     from werkzeug.exceptions import HTTPException, RequestEntityTooLarge
     from flask import jsonify
@@ -1,24 +1,188 @@
 from __future__ import annotations
+import itertools
+import logging
+import threading
+import time
+from functools import wraps
+from typing import Iterator, List, Optional
+
+from flask import Flask, g, has_app_context
+from sqlalchemy.engine import Engine
 from sqlalchemy.orm import declarative_base, sessionmaker, Session
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, text
+
+from .services.metrics import counter
+
+log = logging.getLogger(__name__)
+request_sessions = counter("db_request_sessions_total", "Request-scoped sessions by database target", ["target"])
 
 Base = declarative_base()
 _engine = None
 SessionLocal: sessionmaker | None = None
 
 
-def init_engine(url: str):
+def _create_engine(url: str, pool_size: int = 10, max_overflow: int = 20,
+                   pool_recycle: int = 1800, pool_timeout: float = 30) -> Engine:
+    kwargs = {}
+    # SQLite (dev/tests) uses its own pool classes that don't take these options
+    if not url.startswith("sqlite"):
+        kwargs = dict(pool_size=pool_size, max_overflow=max_overflow,
+                      pool_recycle=pool_recycle, pool_timeout=pool_timeout)
+    return create_engine(url, pool_pre_ping=True, future=True, **kwargs)
+
+
+def init_engine(url: str, pool_size: int = 10, max_overflow: int = 20,
+                pool_recycle: int = 1800, pool_timeout: float = 30):
     global _engine
-    _engine = create_engine(url, pool_pre_ping=True, future=True)
+    _engine = _create_engine(url, pool_size, max_overflow, pool_recycle, pool_timeout)
     return _engine
 
 
+class Replica:
+    """A read replica engine plus its last observed health and replication lag."""
+
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+        self.lag: Optional[float] = None  # seconds behind primary; None = unknown/broken
+        self.checked_at = 0.0
+        self._lock = threading.Lock()
+        # Any connection error takes the replica out of rotation until the next check
+        event.listen(engine, "handle_error", lambda ctx: self._mark_down() if ctx.is_disconnect else None)
+
+    def _mark_down(self) -> None:
+        self.lag, self.checked_at = None, time.monotonic()
+
+    def _probe(self) -> Optional[float]:
+        with self.engine.connect() as conn:
+            if self.engine.dialect.name != "mysql":
+                conn.execute(text("SELECT 1"))
+                return 0.0
+            for stmt, column in (("SHOW REPLICA STATUS", "Seconds_Behind_Source"),
+                                 ("SHOW SLAVE STATUS", "Seconds_Behind_Master")):
+                try:
+                    row = conn.execute(text(stmt)).mappings().first()
+                except Exception:
+                    continue  # older server: try the legacy statement
+                if row is None:
+                    return 0.0  # not replicating (standalone copy), treat as current
+                lag = row.get(column)
+                return float(lag) if lag is not None else None  # NULL: replication stopped
+            return None
+
+    def usable(self, max_lag: float, check_interval: float) -> bool:
+        if time.monotonic() - self.checked_at >= check_interval and self._lock.acquire(blocking=False):
+            # One request refreshes the status; concurrent ones use the previous reading
+            try:
+                try:
+                    self.lag = self._probe()
+                except Exception as e:
+                    log.warning("replica %s unavailable: %s", self.engine.url.render_as_string(hide_password=True), e)
+                    self.lag = None
+                self.checked_at = time.monotonic()
+            finally:
+                self._lock.release()
+        return self.lag is not None and self.lag <= max_lag
+
+
+_replicas: List[Replica] = []
+_replica_turn = itertools.count()
+_replica_max_lag = 5.0
+_replica_check_interval = 5.0
+
+
+def init_replicas(urls: List[str], max_lag: float = 5.0, check_interval: float = 5.0, **pool) -> List[Replica]:
+    global _replicas, _replica_max_lag, _replica_check_interval
+    _replicas = [Replica(_create_engine(url, **pool)) for url in urls]
+    _replica_max_lag, _replica_check_interval = max_lag, check_interval
+    return _replicas
+
+
+def pick_replica() -> Optional[Replica]:
+    """Next usable replica in round-robin order, or None to read from the primary."""
+    if not _replicas:
+        return None
+    start = next(_replica_turn)
+    for i in range(len(_replicas)):
+        replica = _replicas[(start + i) % len(_replicas)]
+        if replica.usable(_replica_max_lag, _replica_check_interval):
+            return replica
+    return None
+
+
+def replica_status() -> List[dict]:
+    return [{
+        "url": r.engine.url.render_as_string(hide_password=True),
+        "lag_seconds": r.lag,
+        "usable": r.lag is not None and r.lag <= _replica_max_lag,
+        "checked_ago": round(time.monotonic() - r.checked_at, 1) if r.checked_at else None,
+    } for r in _replicas]
+
+
+def read_only(fn):
+    """Mark a view as read-only so its session may be served by a read replica.
+
+    Only for endpoints that never write and can tolerate a few seconds of
+    replication lag (listings, analytics); with no replicas configured, or
+    none healthy, the request reads from the primary as usual.
+    """
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        g._db_read_only = True
+        return fn(*args, **kwargs)
+    return wrapper
+
+
 def init_session(engine):
     global SessionLocal
     SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False, future=True)
 
 
-def get_db() -> Session:
+def new_session() -> Session:
+    """A session outside the request scope (background threads, long-lived streams); caller closes it."""
+    assert SessionLocal is not None, "Session not initialized"
+    return SessionLocal()
+
+
+def get_session() -> Session:
+    """Session for the current app/request context: created on first use, shared by every
+    caller in the request and closed (rolled back if the request failed) at teardown.
+    """
+    assert SessionLocal is not None, "Session not initialized"
+    session = g.get("_db_session")
+    if session is None:
+        replica = pick_replica() if g.get("_db_read_only") else None
+        session = g._db_session = SessionLocal(bind=replica.engine) if replica else SessionLocal()
+        request_sessions.inc("replica" if replica else "primary")
+    else:
+        # A helper that caught a failed flush/commit left the transaction unusable
+        tx = session.get_transaction()
+        if tx is not None and not tx.is_active:
+            session.rollback()
+    return session
+
+
+def _teardown_session(exc: BaseException | None) -> None:
+    session = g.pop("_db_session", None)
+    if session is None:
+        return
+    try:
+        if exc is not None:
+            session.rollback()
+    finally:
+        session.close()
+
+
+def init_app(app: Flask) -> None:
+    app.teardown_appcontext(_teardown_session)
+
+
+def get_db() -> Iterator[Session]:
+    """``for db in get_db():`` yields the request-scoped session inside a request; outside
+    one (worker threads, scripts) a private session that is closed when the loop ends.
+    """
+    if has_app_context():
+        yield get_session()
+        return
     assert SessionLocal is not None, "Session not initialized"
     db = SessionLocal()
     try:
@@ -2,15 +2,20 @@
 eNAM (National Agriculture Market) Web Scraper
 Scrapes trade data from https://enam.gov.in/web/dashboard/trade-data
 """
-import requests
 import json
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 import time
 import random
 
+try:
+    from .services.metrics import track_upstream
+except ImportError:  # run directly as a script
+    from contextlib import nullcontext as track_upstream
+
 class ENamScraper:
     def __init__(self):
+        import requests  # deferred: only the mandi fallback path needs it
         self.base_url = "https://enam.gov.in/web/"
         self.session = requests.Session()
         
@@ -27,7 +32,8 @@ class ENamScraper:
         """Get list of states from eNAM API"""
         try:
             url = f"{self.base_url}ajax_ctrl/states_name"
-            response = self.session.post(url, data={}, timeout=30)
+            with track_upstream("enam"):
+                response = self.session.post(url, data={}, timeout=30)
             
             if response.status_code == 200:
                 data = response.json()
@@ -42,7 +48,8 @@ class ENamScraper:
         """Get APMCs for a specific state"""
         try:
             url = f"{self.base_url}Ajax_ctrl/apmc_list"
-            response = self.session.post(url, data={'state_id': state_id}, timeout=30)
+            with track_upstream("enam"):
+                response = self.session.post(url, data={'state_id': state_id}, timeout=30)
             
             if response.status_code == 200:
                 data = response.json()
@@ -78,7 +85,8 @@ class ENamScraper:
                 'toDate': to_date
             }
             
-            response = self.session.post(url, data=payload, timeout=30)
+            with track_upstream("enam"):
+                response = self.session.post(url, data=payload, timeout=30)
             
             if response.status_code == 200:
                 data = response.json()
@@ -0,0 +1,91 @@
+"""
+JSON provider for ``jsonify`` and dict/list return values.
+
+``app.json`` is set in ``create_app``. ``JSON_PROVIDER`` chooses the
+implementation: ``orjson``, ``stdlib``, or ``auto``, which uses orjson when it
+is installed. Both implementations produce the same document:
+
+- datetime, date and time are written as ISO-8601, the same as
+  ``.isoformat()``. Flask's default provider would write an HTTP date
+  instead.
+- Enums are written as their ``.value``.
+- Decimal and UUID become strings, and dataclasses become objects.
+- Keys are sorted, as in Flask's default provider.
+
+So handlers can return model fields directly. orjson additionally
+serializes numpy arrays and scalars without conversion, and writes compact
+UTF-8 instead of ``\\u`` escapes.
+"""
+from __future__ import annotations
+import dataclasses
+import decimal
+import enum
+import typing as t
+import uuid
+from datetime import date, datetime, time
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional; the stdlib provider is used instead
+    orjson = None  # type: ignore
+
+
+def _default(o: t.Any) -> t.Any:
+    if isinstance(o, (datetime, date, time)):
+        return o.isoformat()
+    if isinstance(o, enum.Enum):
+        return o.value
+    if isinstance(o, (decimal.Decimal, uuid.UUID)):
+        return str(o)
+    if dataclasses.is_dataclass(o) and not isinstance(o, type):
+        return dataclasses.asdict(o)
+    if hasattr(o, "__html__"):
+        return str(o.__html__())
+    raise TypeError(f"Object of type {type(o).__name__} is not JSON serializable")
+
+
+class StdlibJSONProvider(DefaultJSONProvider):
+    """Flask's provider with ISO-8601 datetimes and enum values."""
+
+    default = staticmethod(_default)
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """orjson-backed provider. Calls with json.dumps keyword arguments (indent=...) use the stdlib path."""
+
+    default = staticmethod(_default)
+
+    def _option(self, pretty: bool = False) -> int:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj: t.Any, **kwargs: t.Any) -> str:
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=_default, option=self._option()).decode()
+
+    def loads(self, s: str | bytes, **kwargs: t.Any) -> t.Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: t.Any, **kwargs: t.Any):
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = self.compact is False or (self.compact is None and self._app.debug)
+        body = orjson.dumps(obj, default=_default, option=self._option(pretty))
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
+
+
+def json_provider(app: Flask, name: str = "auto") -> DefaultJSONProvider:
+    if name == "orjson" and orjson is None:
+        raise RuntimeError("JSON_PROVIDER=orjson but orjson is not installed")
+    if name in ("orjson", "auto") and orjson is not None:
+        return OrjsonProvider(app)
+    return StdlibJSONProvider(app)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, DateTime, Integer, String, JSON, Text, Float, ForeignKey, Boolean, Enum
+from sqlalchemy import Column, DateTime, Date, Integer, String, JSON, Text, Float, ForeignKey, Boolean, Enum, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from .db import Base
@@ -32,6 +32,11 @@ class User(Base):
 # Marketplace
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (
+        Index("ix_products_status_created", "status", "created_at"),
+        Index("ix_products_status_category", "status", "category"),
+        Index("ix_products_seller_status", "seller_id", "status"),
+    )
     id = Column(Integer, primary_key=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     seller_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -76,6 +81,9 @@ class BookingStatus(enum.Enum):
 # Cart System
 class CartItem(Base):
     __tablename__ = "cart_items"
+    __table_args__ = (
+        Index("ix_cart_items_user_product", "user_id", "product_id"),
+    )
     id = Column(Integer, primary_key=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
@@ -89,6 +97,11 @@ class CartItem(Base):
 # Enhanced Order System
 class Order(Base):
     __tablename__ = "orders"
+    __table_args__ = (
+        Index("ix_orders_seller_created", "seller_id", "created_at"),
+        Index("ix_orders_buyer_created", "buyer_id", "created_at"),
+        Index("ix_orders_status_created", "status", "created_at"),
+    )
     id = Column(Integer, primary_key=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     
@@ -134,6 +147,10 @@ class PaymentSession(Base):
 
 class OrderItem(Base):
     __tablename__ = "order_items"
+    __table_args__ = (
+        Index("ix_order_items_order", "order_id"),
+        Index("ix_order_items_product_order", "product_id", "order_id"),
+    )
     id = Column(Integer, primary_key=True)
     order_id = Column(Integer, ForeignKey("orders.id"), nullable=False)
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
@@ -148,6 +165,9 @@ class OrderItem(Base):
 # Reviews and Ratings
 class ProductReview(Base):
     __tablename__ = "product_reviews"
+    __table_args__ = (
+        Index("ix_product_reviews_product_created", "product_id", "created_at"),
+    )
     id = Column(Integer, primary_key=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     
@@ -165,6 +185,9 @@ class ProductReview(Base):
 
 class FarmerReview(Base):
     __tablename__ = "farmer_reviews"
+    __table_args__ = (
+        Index("ix_farmer_reviews_farmer_created", "farmer_id", "created_at"),
+    )
     id = Column(Integer, primary_key=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     
@@ -261,6 +284,9 @@ class Equipment(Base):
 
 class EquipmentBooking(Base):
     __tablename__ = "equipment_bookings"
+    __table_args__ = (
+        Index("ix_equipment_bookings_equipment_status_end", "equipment_id", "status", "end_datetime"),
+    )
     id = Column(Integer, primary_key=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     
@@ -298,6 +324,10 @@ class EquipmetalEquipment(Base):
 # Communication System
 class Conversation(Base):
     __tablename__ = "conversations"
+    __table_args__ = (
+        Index("ix_conversations_farmer_updated", "farmer_id", "updated_at"),
+        Index("ix_conversations_customer_updated", "customer_id", "updated_at"),
+    )
     id = Column(Integer, primary_key=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -316,6 +346,9 @@ class Conversation(Base):
 
 class Message(Base):
     __tablename__ = "messages"
+    __table_args__ = (
+        Index("ix_messages_conversation_created", "conversation_id", "created_at"),
+    )
     id = Column(Integer, primary_key=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     
@@ -345,6 +378,36 @@ class MarketPrice(Base):
     
     source = Column(String(100), nullable=False)  # government, enam, internal
 
+    # Mandi snapshot fields (nullable for rows recorded before history ingestion)
+    state = Column(String(100), nullable=True, index=True)
+    district = Column(String(100), nullable=True)
+    market = Column(String(255), nullable=True)
+    arrival_date = Column(Date, nullable=True, index=True)
+
+
+class MarketPriceRollup(Base):
+    """Pre-aggregated mandi prices per commodity-market and day/week bucket.
+    Prices are per quintal as reported by the source; modal is modal_sum / samples.
+    """
+    __tablename__ = "market_price_rollups"
+    __table_args__ = (
+        UniqueConstraint("bucket", "commodity", "state", "market", "bucket_start", name="uq_market_price_rollup"),
+        Index("ix_market_price_rollup_lookup", "bucket", "commodity", "state", "bucket_start"),
+    )
+    id = Column(Integer, primary_key=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    bucket = Column(String(8), nullable=False)  # day | week
+    bucket_start = Column(Date, nullable=False)
+    commodity = Column(String(100), nullable=False)  # lower-cased
+    state = Column(String(100), nullable=False)  # lower-cased
+    market = Column(String(255), nullable=False)
+
+    min_price = Column(Float, nullable=False)
+    max_price = Column(Float, nullable=False)
+    modal_sum = Column(Float, nullable=False, default=0.0)
+    samples = Column(Integer, nullable=False, default=0)
+
 
 class PricingInsight(Base):
     __tablename__ = "pricing_insights"
@@ -378,3 +441,24 @@ class SoilRecommendationLog(Base):
     response = Column(JSON, nullable=False)
 
     model_name = Column(String(255), nullable=True)
+    cache_key = Column(String(64), nullable=True, index=True)  # see services/ai_cache.py
+
+
+# Background inference jobs (see services/jobs.py)
+class InferenceJob(Base):
+    __tablename__ = "inference_jobs"
+
+    id = Column(String(32), primary_key=True)  # uuid4 hex
+    kind = Column(String(32), nullable=False)  # disease | media
+    status = Column(String(16), default="queued", nullable=False, index=True)  # queued | running | succeeded | failed
+    user_id = Column(String(64), nullable=True)
+
+    params = Column(JSON, nullable=True)
+    result = Column(JSON, nullable=True)
+    error = Column(String(255), nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    queue_seconds = Column(Float, nullable=True)
+    run_seconds = Column(Float, nullable=True)
@@ -15,6 +15,8 @@ from .routes_reviews import bp as reviews_bp
 from .routes_analytics import bp as analytics_bp
 from .routes_media import bp as media_bp
 from .routes_equipment import bp as equipment_bp
+from .routes_jobs import bp as jobs_bp
+from .routes_ops import bp as ops_bp
 
 
 def register_routes(app: Flask) -> None:
@@ -34,3 +36,5 @@ def register_routes(app: Flask) -> None:
     app.register_blueprint(analytics_bp)
     app.register_blueprint(media_bp)
     app.register_blueprint(equipment_bp)
+    app.register_blueprint(jobs_bp)
+    app.register_blueprint(ops_bp)
@@ -1,9 +1,12 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from sqlalchemy.orm import Session
-from .schemas import SoilRecommendationRequest
+from .config import settings
+from .schemas import SoilBatchRecommendationRequest, SoilRecommendationRequest
 from .services.gemini_core import recommend_from_soil
 from .db import get_db
-from .models import SoilRecommendationLog
+from .services.ai_cache import ai_cache_stats, cached_ai_response
+from .services.semantic_cache import chat_cache
+from .services.soil_batch import recommend_batch
 
 bp = Blueprint("ai", __name__, url_prefix="/api/v1/ai")
 
@@ -16,17 +19,62 @@ def recommend_soil():
     except Exception as e:
         return jsonify({"error": str(e)}), 400
 
-    data = recommend_from_soil(req.soil, req.language)
-
-    # Persist log
+    # Served from the answer cache when an equivalent request was seen; misses are logged
     for db in get_db():
         session: Session = db
-        log = SoilRecommendationLog(
-            request={"soil": req.soil, "language": req.language},
-            response=data,
-            model_name=data.get("model"),
+        data = cached_ai_response(
+            "soil", req.soil, req.language,
+            lambda: recommend_from_soil(req.soil, req.language),
+            session=session,
+            log_request={"soil": req.soil, "language": req.language},
         )
-        session.add(log)
-        session.commit()
+        # The log row is bookkeeping: losing it must not discard the recommendation
+        try:
+            session.commit()
+        except Exception:
+            session.rollback()
+            current_app.logger.warning("failed to log soil recommendation", exc_info=True)
 
     return jsonify(data)
+
+
+@bp.post("/recommend/soil/batch")
+def recommend_soil_batch():
+    """Recommendations for many soil health cards at once.
+    Body: {"items": [{"id": "farmer-1", "soil": {...}} | {...soil...}], "language": "hi"}
+    Returns one result per item, in order, plus grouping counts.
+    """
+    payload = request.get_json(force=True) or {}
+    try:
+        req = SoilBatchRecommendationRequest(**payload)
+    except Exception as e:
+        return jsonify({"error": str(e)}), 400
+    if not req.items:
+        return jsonify({"error": "items required"}), 400
+    if len(req.items) > settings.SOIL_BATCH_MAX_ITEMS:
+        return jsonify({"error": f"at most {settings.SOIL_BATCH_MAX_ITEMS} items per batch"}), 400
+
+    # A bare soil item carries its client id alongside the readings; it is not part of the soil
+    soils = [item["soil"] if isinstance(item.get("soil"), dict) else {k: v for k, v in item.items() if k != "id"}
+             for item in req.items]
+    for db in get_db():
+        session: Session = db
+        answers, logs, summary = recommend_batch(soils, req.language, session=session)
+        # All newly generated answers logged in one transaction
+        session.add_all(logs)
+        try:
+            session.commit()
+        except Exception:
+            session.rollback()
+            current_app.logger.warning("failed to log %d batch soil recommendations", len(logs), exc_info=True)
+
+    results = [
+        {"index": i, "id": item.get("id"), **answer}
+        for i, (item, answer) in enumerate(zip(req.items, answers))
+    ]
+    return jsonify({"results": results, **summary})
+
+
+@bp.get("/cache/stats")
+def ai_cache_stats_view():
+    return jsonify({**ai_cache_stats(), "chat": chat_cache.stats()})
@@ -1,5 +1,13 @@
-from flask import Blueprint, request, jsonify
+import json
+import time
+
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from .services.ai_cache import cached_ai_response
 from .services.gemini import recommend_from_soil
+from .services.metrics import histogram
+
+chat_first_token = histogram("chat_stream_first_token_seconds", "Time to first streamed chat delta")
+chat_stream_duration = histogram("chat_stream_duration_seconds", "Time to complete a streamed chat reply")
 
 bp = Blueprint("ai_ext", __name__, url_prefix="/api/v1/ai")
 
@@ -9,7 +17,8 @@ def recommend_fertilizer():
     # Reuse Gemini with different prompt via soil keys; stub for now delegates to same function
     soil = payload.get("soil") or {}
     language = payload.get("language")
-    data = recommend_from_soil(soil, language)
+    # Own cache kind: a fertilizer answer must never be served for /recommend/soil, or vice versa
+    data = cached_ai_response("fertilizer", soil, language, lambda: recommend_from_soil(soil, language))
     return jsonify(data)
 
 @bp.post("/predict/yield")
@@ -33,6 +42,46 @@ def chat_generic():
     data = agent.handle(query, language)
     return jsonify(data)
 
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@bp.post("/chat/stream")
+def chat_stream():
+    """Server-Sent Events variant of POST /chat: ``delta`` events with text as it is
+    generated, then ``done`` with the full reply and model (or ``error``).
+    """
+    payload = request.get_json(force=True) or {}
+    query = payload.get("message") or ""
+    language = payload.get("language")
+    from .services.agent import AgentService
+    agent = AgentService()
+
+    def generate():
+        started = time.perf_counter()
+        first = True
+        try:
+            for event in agent.handle_stream(query, language):
+                if "delta" in event:
+                    if first:
+                        chat_first_token.observe(value=time.perf_counter() - started)
+                        first = False
+                    yield _sse("delta", {"text": event["delta"]})
+                else:
+                    event.pop("done", None)
+                    yield _sse("done", event)
+        except Exception:
+            yield _sse("error", {"error": "I couldn't complete this request right now. Please try again later."})
+        finally:
+            chat_stream_duration.observe(value=time.perf_counter() - started)
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @bp.get("/chat")
 def chat_generic_get():
     # Convenience GET for testing in browser or curl
@@ -1,7 +1,8 @@
 from flask import Blueprint, request, jsonify
 from .services.gemini_rest import chat_from_message_rest
+from .services.gemini_client import generate_content, guard_stats, latency_summary, list_models
+from .services.gemini_models import model_resolver
 from .config import settings
-import httpx
 
 bp = Blueprint("ai_health", __name__, url_prefix="/api/v1/ai")
 
@@ -16,36 +17,26 @@ def diagnose():
     error = None
     try:
         base_model = settings.GEMINI_MODEL
-        params = {"key": settings.GEMINI_API_KEY}
         payload = {"contents": [{"role": "user", "parts": [{"text": "PING"}]}]}
-        with httpx.Client(timeout=10) as client:
-            url = f"https://generativelanguage.googleapis.com/v1/models/{base_model}:generateContent"
-            r = client.post(url, params=params, json=payload)
-            if r.status_code == 404:
-                url2 = f"https://generativelanguage.googleapis.com/v1/models/{base_model}-latest:generateContent"
-                r = client.post(url2, params=params, json=payload)
-            status = r.status_code
-            if r.status_code >= 400:
-                try:
-                    error = r.text[:300]
-                except Exception:
-                    error = f"HTTP {r.status_code}"
-            # Also fetch model list for guidance (v1 and v1beta)
-            model_names = []
+        r = generate_content(base_model, payload, timeout=10)
+        if r.status_code == 404:
+            r = generate_content(f"{base_model}-latest", payload, timeout=10)
+        status = r.status_code
+        if r.status_code >= 400:
             try:
-                lm_v1 = client.get("https://generativelanguage.googleapis.com/v1/models", params=params)
-                lj1 = lm_v1.json()
-                model_names += [m.get("name") for m in (lj1.get("models") or []) if m.get("name")]
+                error = r.text[:300]
             except Exception:
-                pass
+                error = f"HTTP {r.status_code}"
+        # Also fetch model list for guidance (v1 and v1beta)
+        model_names = []
+        for api_version in ("v1", "v1beta"):
             try:
-                lm_v1b = client.get("https://generativelanguage.googleapis.com/v1beta/models", params=params)
-                lj2 = lm_v1b.json()
-                model_names += [m.get("name") for m in (lj2.get("models") or []) if m.get("name")]
+                lj = list_models(api_version, timeout=10).json()
+                model_names += [m.get("name") for m in (lj.get("models") or []) if m.get("name")]
             except Exception:
                 pass
-            # Dedup and shorten
-            model_names = list(dict.fromkeys(model_names))
+        # Dedup and shorten
+        model_names = list(dict.fromkeys(model_names))
     except Exception as e:
         error = str(e)
         model_names = []
@@ -56,5 +47,8 @@ def diagnose():
         "reply_preview": (data.get("reply") or "")[:200],
         "rest_status": status,
         "rest_error": error,
-        "available_models": model_names[:10]
+        "available_models": model_names[:10],
+        "latency_by_model": latency_summary(),
+        "model_routing": model_resolver.stats(),
+        "guards": guard_stats()
     })
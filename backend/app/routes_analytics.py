@@ -5,7 +5,7 @@ from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime, timedelta
 from typing import Dict, List
 
-from .db import get_db
+from .db import get_db, read_only
 from .models import (
     User, Product, Order, OrderStatus, OrderItem,
     ProductReview, FarmerReview, ColdStorageBooking,
@@ -17,6 +17,7 @@ bp = Blueprint("analytics", __name__, url_prefix="/api/v1/analytics")
 
 
 @bp.get("/dashboard")
+@read_only
 @jwt_required()
 def get_dashboard_stats():
     """Get dashboard statistics based on user role"""
@@ -89,8 +90,8 @@ def _get_farmer_dashboard(session: Session, farmer_id: int) -> Dict:
             "id": order.id,
             "buyer_name": order.buyer.name,
             "total_amount": float(order.total_amount),
-            "status": order.status.value,
-            "created_at": order.created_at.isoformat(),
+            "status": order.status,
+            "created_at": order.created_at,
             "items_count": len(order.items)
         }
         for order in recent_orders
@@ -177,8 +178,8 @@ def _get_customer_dashboard(session: Session, customer_id: int) -> Dict:
             "id": order.id,
             "seller_name": order.seller.name,
             "total_amount": float(order.total_amount),
-            "status": order.status.value,
-            "created_at": order.created_at.isoformat(),
+            "status": order.status,
+            "created_at": order.created_at,
             "items_count": len(order.items)
         }
         for order in recent_orders
@@ -283,6 +284,7 @@ def _get_admin_dashboard(session: Session) -> Dict:
 
 
 @bp.get("/sales-report")
+@read_only
 @jwt_required()
 @role_required("farmer")
 def get_sales_report():
@@ -395,6 +397,7 @@ def get_sales_report():
 
 
 @bp.get("/customer-insights")
+@read_only
 @jwt_required()
 @role_required("farmer")
 def get_customer_insights():
@@ -485,6 +488,7 @@ def get_customer_insights():
 
 
 @bp.get("/market-trends")
+@read_only
 @jwt_required()
 def get_market_trends():
     """Get market trends and analytics"""
@@ -571,6 +575,7 @@ def get_market_trends():
 
 
 @bp.get("/performance-metrics")
+@read_only
 @jwt_required()
 @role_required("admin")
 def get_performance_metrics():
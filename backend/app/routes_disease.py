@@ -1,12 +1,31 @@
 from flask import Blueprint, request, jsonify
 from .services.gemini_image import diagnose_disease
+from .services.image_hash import diagnosis_index
+from .services.jobs import JobFailed, job_runner
+from .routes_jobs import submit_job
 
 bp = Blueprint("disease", __name__, url_prefix="/api/v1/disease")
 
+FALLBACK_DIAGNOSIS = {
+    "disease": "unknown",
+    "confidence": "low",
+    "description": "Could not determine disease.",
+    "management": [
+        "Remove severely affected leaves",
+        "Improve field sanitation",
+        "Use recommended fungicide/insecticide if symptoms worsen"
+    ],
+    "model": "rules-fallback"
+}
+
 @bp.get("/ping")
 def ping():
     return jsonify({"status": "ok"})
 
+@bp.get("/cache/stats")
+def cache_stats():
+    return jsonify(diagnosis_index.stats())
+
 @bp.post("/diagnose")
 def diagnose():
     if "image" not in request.files:
@@ -21,17 +40,29 @@ def diagnose():
         return jsonify(data)
     except Exception:
         # Fallback generic response
-        return jsonify({
-            "error": "gemini_unavailable",
-            "fallback": {
-                "disease": "unknown",
-                "confidence": "low",
-                "description": "Could not determine disease.",
-                "management": [
-                    "Remove severely affected leaves",
-                    "Improve field sanitation",
-                    "Use recommended fungicide/insecticide if symptoms worsen"
-                ],
-                "model": "rules-fallback"
-            }
-        }), 503
\ No newline at end of file
+        return jsonify({"error": "gemini_unavailable", "fallback": FALLBACK_DIAGNOSIS}), 503
+
+
+def _run_diagnosis_job(image_bytes: bytes, params: dict) -> dict:
+    try:
+        return diagnose_disease(image_bytes, params.get("mime_type") or "image/jpeg",
+                                crop=params.get("crop"), language=params.get("language"))
+    except Exception:
+        raise JobFailed("gemini_unavailable", {"fallback": FALLBACK_DIAGNOSIS})
+
+
+job_runner.register("disease", _run_diagnosis_job)
+
+
+@bp.post("/diagnose/jobs")
+def diagnose_async():
+    """Queue a diagnosis and return immediately; poll GET /api/v1/jobs/<id> for the result."""
+    if "image" not in request.files:
+        return jsonify({"error": "image file required"}), 400
+    f = request.files["image"]
+    params = {
+        "mime_type": f.mimetype or "image/jpeg",
+        "crop": request.form.get("crop"),
+        "language": request.form.get("language"),
+    }
+    return submit_job("disease", f.read(), params)
\ No newline at end of file
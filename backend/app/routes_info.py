@@ -2,6 +2,11 @@ from flask import Blueprint, request, jsonify
 from sqlalchemy.orm import Session
 from .db import get_db
 from .enam_scraper import ENamScraper
+from .services.geo_index import nearby_locations
+from .services.metrics import track_upstream
+from .services.price_history import BUCKETS, query_price_history, snapshot_writer
+from .services.price_forecast import MAX_HORIZON, price_forecaster
+from .auth import role_required
 
 bp = Blueprint("info", __name__, url_prefix="/api/v1/info")
 
@@ -24,6 +29,8 @@ def market_prices():
         records, gov_count, enam_count = get_hybrid_mandi_data(lat, lon)
         
         if records:
+            store_mandi_snapshot(records, gov_count)
+            
             # Process and categorize the hybrid data
             categorized_prices = categorize_mandi_data(records, lat, lon)
             
@@ -59,6 +66,7 @@ def market_prices():
                     "coordinates": f"{lat},{lon}" if lat and lon else None,
                     "location_filtered": categorized_prices.get('location_filtered', False),
                     "filtered_states": categorized_prices.get('filtered_states', []),
+                    "filtered_districts": categorized_prices.get('filtered_districts', []),
                     "original_records": categorized_prices.get('original_records', 0),
                     "filtered_records": categorized_prices.get('filtered_records', 0)
                 }
@@ -72,6 +80,80 @@ def market_prices():
         return get_fallback_prices(lat, lon)
 
 
+@bp.get("/market-prices/history")
+def market_price_history():
+    """Price trend for a commodity from pre-aggregated day/week rollups"""
+    from datetime import date, datetime, timedelta
+    
+    commodity = (request.args.get("commodity") or "").strip()
+    if not commodity:
+        return jsonify({"error": "commodity required"}), 400
+    bucket = (request.args.get("bucket") or "day").strip().lower()
+    if bucket not in BUCKETS:
+        return jsonify({"error": "bucket must be one of: day, week"}), 400
+    try:
+        end = datetime.strptime(request.args["to"], "%Y-%m-%d").date() if request.args.get("to") else date.today()
+        default_span = timedelta(days=30 if bucket == "day" else 365)
+        start = datetime.strptime(request.args["from"], "%Y-%m-%d").date() if request.args.get("from") else end - default_span
+    except ValueError:
+        return jsonify({"error": "from/to must be YYYY-MM-DD"}), 400
+    if start > end:
+        return jsonify({"error": "from must be on or before to"}), 400
+    state = request.args.get("state")
+    market = request.args.get("market")
+    
+    for db in get_db():
+        session: Session = db
+        series = query_price_history(session, commodity, bucket, start, end, state=state, market=market)
+        return jsonify({
+            "commodity": commodity,
+            "state": state,
+            "market": market,
+            "bucket": bucket,
+            "from": start.isoformat(),
+            "to": end.isoformat(),
+            "unit": "quintal",
+            "series": series
+        })
+
+
+@bp.get("/market-prices/forecast")
+def market_price_forecast():
+    """7/30-day price forecast for a commodity (optionally per state or state+market)"""
+    commodity = (request.args.get("commodity") or "").strip()
+    if not commodity:
+        return jsonify({"error": "commodity required"}), 400
+    try:
+        horizon = int(request.args.get("horizon", 7))
+    except ValueError:
+        return jsonify({"error": "horizon must be an integer"}), 400
+    if not 1 <= horizon <= MAX_HORIZON:
+        return jsonify({"error": f"horizon must be between 1 and {MAX_HORIZON}"}), 400
+    
+    price_forecaster.ensure_fresh()
+    data = price_forecaster.forecast(
+        commodity, state=request.args.get("state"), market=request.args.get("market"), horizon=horizon
+    )
+    if data is None:
+        return jsonify({"error": "no_price_history", "commodity": commodity}), 404
+    return jsonify(data)
+
+
+@bp.post("/market-prices/forecast/train")
+@role_required("admin")
+def train_market_price_forecast():
+    """Refit forecasting models from the latest price rollups"""
+    for db in get_db():
+        series = price_forecaster.train(db)
+        return jsonify({"series": series, "trained_at": price_forecaster.trained_at})
+
+
+def store_mandi_snapshot(records, gov_count):
+    """Hand fetched mandi rows to the price history writer; never blocks or fails the request"""
+    sourced = [(r, "government" if i < gov_count else "enam") for i, r in enumerate(records)]
+    snapshot_writer.submit(sourced)
+
+
 def get_hybrid_mandi_data(lat=None, lon=None):
     """Get mandi data from both data.gov.in and eNAM, with preference for official API"""
     
@@ -91,7 +173,7 @@ def get_hybrid_mandi_data(lat=None, lon=None):
             "limit": "100"
         }
         
-        with httpx.Client(timeout=15) as client:
+        with httpx.Client(timeout=15) as client, track_upstream("data_gov_in"):
             response = client.get(API_URL, params=params)
             if response.status_code == 200:
                 data = response.json()
@@ -154,53 +236,19 @@ def get_hybrid_mandi_data(lat=None, lon=None):
 
 def get_nearby_states_for_location(lat, lon):
     """Get nearby states for given coordinates"""
-    state_coordinates = {
-        'andhra pradesh': (15.9129, 79.7400),
-        'telangana': (17.1232, 79.2088),
-        'karnataka': (15.3173, 75.7139),
-        'kerala': (10.8505, 76.2711),
-        'tamil nadu': (11.1271, 78.6569),
-        'maharashtra': (19.7515, 75.7139),
-        'gujarat': (22.2587, 71.1924),
-        'rajasthan': (27.0238, 74.2179),
-        'madhya pradesh': (22.9734, 78.6569),
-        'uttar pradesh': (26.8467, 80.9462),
-        'bihar': (25.0961, 85.3131),
-        'west bengal': (22.9868, 87.8550),
-        'odisha': (20.9517, 85.0985),
-        'jharkhand': (23.6102, 85.2799),
-        'chhattisgarh': (21.2787, 81.8661),
-        'punjab': (31.1471, 75.3412),
-        'haryana': (29.0588, 76.0856),
-        'himachal pradesh': (31.1048, 77.1734),
-        'uttarakhand': (30.0668, 79.0193),
-        'delhi': (28.7041, 77.1025),
-        'assam': (26.2006, 92.9376),
-        'arunachal pradesh': (28.2180, 94.7278),
-        'manipur': (24.6637, 93.9063),
-        'meghalaya': (25.4670, 91.3662),
-        'mizoram': (23.1645, 92.9376),
-        'nagaland': (26.1584, 94.5624),
-        'sikkim': (27.5330, 88.5122),
-        'tripura': (23.9408, 91.9882),
-        'goa': (15.2993, 74.1240)
-    }
-    
-    import math
-    def calculate_distance(lat1, lon1, lat2, lon2):
-        dlat = abs(lat1 - lat2)
-        dlon = abs(lon1 - lon2)
-        return math.sqrt(dlat**2 + dlon**2) * 111
-    
-    nearby_states = []
-    for state, (state_lat, state_lon) in state_coordinates.items():
-        distance = calculate_distance(lat, lon, state_lat, state_lon)
-        if distance <= 500:  # 500km radius
-            nearby_states.append((state, distance))
-    
-    # Sort by distance and return state names
-    nearby_states.sort(key=lambda x: x[1])
-    return [state for state, _ in nearby_states[:5]]
+    nearby = nearby_locations(lat, lon, state_radius_km=500, state_limit=5)
+    return [state for state, _ in nearby["states"]]
+
+
+# The gazetteer lists only some districts per state, so the closest listed
+# district can be far from the user. Only trust it within this distance.
+DISTRICT_PREFERENCE_KM = 40
+
+
+def get_nearby_districts_for_location(lat, lon, radius_km=DISTRICT_PREFERENCE_KM):
+    """Get nearby (district, state) pairs for given coordinates, closest first"""
+    nearby = nearby_locations(lat, lon, district_radius_km=radius_km)
+    return [(district, state) for district, state, _ in nearby["districts"]]
 
 
 def categorize_mandi_data(records, lat=None, lon=None):
@@ -211,6 +259,8 @@ def categorize_mandi_data(records, lat=None, lon=None):
     # Filter records by location if coordinates provided
     filtered_records = records
     target_states = None
+    target_districts = None
+    preferred_keys = set()
     
     if lat and lon:
         try:
@@ -225,39 +275,26 @@ def categorize_mandi_data(records, lat=None, lon=None):
                 
                 # If no records found in nearby states, expand search radius
                 if not filtered_records:
-                    # Expand search by using a custom function for 1000km radius
-                    import math
-                    state_coordinates = {
-                        'andhra pradesh': (15.9129, 79.7400), 'telangana': (17.1232, 79.2088),
-                        'karnataka': (15.3173, 75.7139), 'kerala': (10.8505, 76.2711),
-                        'tamil nadu': (11.1271, 78.6569), 'maharashtra': (19.7515, 75.7139),
-                        'gujarat': (22.2587, 71.1924), 'rajasthan': (27.0238, 74.2179),
-                        'madhya pradesh': (22.9734, 78.6569), 'uttar pradesh': (26.8467, 80.9462),
-                        'bihar': (25.0961, 85.3131), 'west bengal': (22.9868, 87.8550),
-                        'odisha': (20.9517, 85.0985), 'jharkhand': (23.6102, 85.2799),
-                        'chhattisgarh': (21.2787, 81.8661), 'punjab': (31.1471, 75.3412),
-                        'haryana': (29.0588, 76.0856), 'himachal pradesh': (31.1048, 77.1734),
-                        'uttarakhand': (30.0668, 79.0193), 'delhi': (28.7041, 77.1025),
-                        'assam': (26.2006, 92.9376), 'arunachal pradesh': (28.2180, 94.7278),
-                        'manipur': (24.6637, 93.9063), 'meghalaya': (25.4670, 91.3662),
-                        'mizoram': (23.1645, 92.9376), 'nagaland': (26.1584, 94.5624),
-                        'sikkim': (27.5330, 88.5122), 'tripura': (23.9408, 91.9882),
-                        'goa': (15.2993, 74.1240)
-                    }
-                    
-                    def calc_dist(lat1, lon1, lat2, lon2):
-                        dlat, dlon = abs(lat1 - lat2), abs(lon1 - lon2)
-                        return math.sqrt(dlat**2 + dlon**2) * 111
-                    
-                    expanded_states = []
-                    for state, (s_lat, s_lon) in state_coordinates.items():
-                        if calc_dist(user_lat, user_lon, s_lat, s_lon) <= 1000:
-                            expanded_states.append(state)
-                    target_states = expanded_states[:5]
+                    expanded = nearby_locations(user_lat, user_lon, state_radius_km=1000, state_limit=5)
+                    target_states = [state for state, _ in expanded["states"]]
                     filtered_records = [
                         record for record in records 
                         if record.get('state', '').lower().strip() in target_states
                     ]
+            
+            # Markets in the user's own district rank first, ahead of the rest of the state
+            nearby_districts = get_nearby_districts_for_location(user_lat, user_lon)
+            if nearby_districts:
+                district_keys = set(nearby_districts)
+                district_records = [
+                    record for record in records
+                    if (record.get('district', '').lower().strip(), record.get('state', '').lower().strip()) in district_keys
+                ]
+                if district_records:
+                    target_districts = [district for district, _ in nearby_districts]
+                    seen = set(map(id, filtered_records))
+                    filtered_records = filtered_records + [r for r in district_records if id(r) not in seen]
+                    preferred_keys = district_keys
         except ValueError:
             pass  # Use all records if coordinates are invalid
     
@@ -311,7 +348,8 @@ def categorize_mandi_data(records, lat=None, lon=None):
                 'state': state,
                 'district': district,
                 'date': record.get('arrival_date', ''),
-                'grade': record.get('grade', '')
+                'grade': record.get('grade', ''),
+                'nearby': (district.lower().strip(), state.lower().strip()) in preferred_keys
             }
             
             # Categorize based on commodity name
@@ -359,9 +397,12 @@ def categorize_mandi_data(records, lat=None, lon=None):
             continue  # Skip malformed records
     
     # Sort by price and take top items from each category
-    vegetables = sorted(vegetables, key=lambda x: x['price'])[:12]
-    fruits = sorted(fruits, key=lambda x: x['price'])[:8]
-    grains = sorted(grains, key=lambda x: x['price'])[:10]
+    def rank(item):
+        return (not item['nearby'], item['price'])
+    
+    vegetables = sorted(vegetables, key=rank)[:12]
+    fruits = sorted(fruits, key=rank)[:8]
+    grains = sorted(grains, key=rank)[:10]
     
     result = {
         'vegetables': vegetables,
@@ -370,8 +411,9 @@ def categorize_mandi_data(records, lat=None, lon=None):
     }
     
     # Add location filtering information
-    if target_states:
-        result['filtered_states'] = target_states
+    if target_states or target_districts:
+        result['filtered_states'] = target_states or []
+        result['filtered_districts'] = target_districts or []
         result['location_filtered'] = True
         result['original_records'] = len(records)
         result['filtered_records'] = len(filtered_records)
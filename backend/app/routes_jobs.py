@@ -0,0 +1,86 @@
+import json
+import time
+
+from flask import Blueprint, Response, jsonify, stream_with_context
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+
+from .services.jobs import FINISHED, JobQueueFull, job_runner, job_to_dict
+
+bp = Blueprint("jobs", __name__, url_prefix="/api/v1/jobs")
+
+SSE_MAX_WAIT = 120  # seconds an /events stream stays open
+SSE_POLL = 1.0  # seconds between status checks
+
+
+def _current_user():
+    try:
+        verify_jwt_in_request(optional=True)
+        identity = get_jwt_identity()
+    except Exception:
+        return None
+    return str(identity) if identity is not None else None
+
+
+def submit_job(kind: str, blob: bytes, params: dict, user_id=None):
+    """Shared 202/429 response for routes that offload work to the job runner."""
+    try:
+        job = job_runner.submit(kind, blob, params, user_id=user_id)
+    except JobQueueFull:
+        resp = jsonify({"error": "too_many_jobs", "detail": "Server is busy. Please retry shortly."})
+        resp.headers["Retry-After"] = "5"
+        return resp, 429
+    resp = jsonify({"job_id": job.id, "status": job.status, "poll": f"/api/v1/jobs/{job.id}"})
+    resp.headers["Location"] = f"/api/v1/jobs/{job.id}"
+    return resp, 202
+
+
+def _visible_job(job_id: str):
+    job = job_runner.get(job_id)
+    # Jobs submitted by a signed-in user are only visible to that user
+    if job is None or (job.user_id and job.user_id != _current_user()):
+        return None
+    return job
+
+
+@bp.get("/<job_id>")
+def get_job(job_id: str):
+    job = _visible_job(job_id)
+    if job is None:
+        return jsonify({"error": "not_found"}), 404
+    return jsonify(job_to_dict(job))
+
+
+@bp.get("/<job_id>/events")
+def job_events(job_id: str):
+    """Server-Sent Events: a ``status`` event per change, ending with ``done`` once finished."""
+    job = _visible_job(job_id)
+    if job is None:
+        return jsonify({"error": "not_found"}), 404
+
+    def generate():
+        deadline = time.monotonic() + SSE_MAX_WAIT
+        current, last_status = job, None
+        while True:
+            if current.status != last_status:
+                last_status = current.status
+                event = "done" if current.status in FINISHED else "status"
+                yield f"event: {event}\ndata: {json.dumps(job_to_dict(current), ensure_ascii=False)}\n\n"
+                if event == "done":
+                    return
+            if time.monotonic() >= deadline:
+                yield "event: timeout\ndata: {}\n\n"
+                return
+            # Wakes immediately for jobs run by this process; other jobs are re-read every SSE_POLL
+            job_runner.wait(job_id, SSE_POLL)
+            current = job_runner.get(job_id) or current
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@bp.get("/stats")
+def stats():
+    return jsonify(job_runner.stats())
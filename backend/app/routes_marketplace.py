@@ -4,7 +4,7 @@ from sqlalchemy import and_, or_, func, desc, asc
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from datetime import datetime, timedelta
 
-from .db import get_db
+from .db import get_db, read_only
 from .models import (
     Product, User, ProductReview, FarmerReview, 
     Order, OrderItem, MarketPrice, PricingInsight
@@ -18,6 +18,7 @@ bp = Blueprint("marketplace", __name__, url_prefix="/api/v1/marketplace")
 
 
 @bp.get("/products")
+@read_only
 @jwt_required(optional=True)
 def list_products():
     """Advanced product search with filters"""
@@ -128,7 +129,7 @@ def list_products():
                     "seller_rating": round(seller_rating, 2),
                     "product_rating": round(avg_rating, 2),
                     "review_count": review_count,
-                    "created_at": p.created_at.isoformat(),
+                    "created_at": p.created_at,
                     "freshness_score": calculate_freshness_score(p.created_at),
                     "is_available": p.stock > 0 and p.status == "active"
                 })
@@ -417,7 +418,7 @@ def get_my_products():
                 "location": p.location,
                 "image_url": p.image_url,
                 "status": p.status,
-                "created_at": p.created_at.isoformat(),
+                "created_at": p.created_at,
                 "product_rating": round(avg_rating, 2),
                 "review_count": review_count,
                 "freshness_score": calculate_freshness_score(p.created_at),
@@ -436,6 +437,7 @@ def get_my_products():
 
 
 @bp.get("/products/<int:pid>")
+@read_only
 @jwt_required(optional=True)
 def get_product_details(pid: int):
     """Get detailed product information"""
@@ -626,6 +628,7 @@ def bulk_update_products():
 
 
 @bp.get("/categories")
+@read_only
 def get_categories():
     """Get all product categories"""
     for db in get_db():
@@ -644,6 +647,7 @@ def get_categories():
 
 
 @bp.get("/farmer/<int:farmer_id>")
+@read_only
 def get_farmer_profile(farmer_id: int):
     """Get farmer profile with products and ratings"""
     for db in get_db():
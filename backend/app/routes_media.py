@@ -1,9 +1,11 @@
 from flask import Blueprint, request, jsonify
-from flask_jwt_extended import jwt_required
+from flask_jwt_extended import get_jwt_identity, jwt_required
 
 from .auth import role_required
 from .services.cloudinary_service import CloudinaryService
 from .services.gemini_image import analyze_quality_and_price
+from .services.jobs import job_runner
+from .routes_jobs import submit_job
 import httpx
 
 bp = Blueprint("media", __name__, url_prefix="/api/v1/media")
@@ -59,10 +61,7 @@ def analyze_media():
             image_url = data.get("image_url")
             if not image_url:
                 return jsonify({"error": "image or image_url required"}), 400
-            with httpx.Client(timeout=20) as client:
-                r = client.get(image_url)
-                r.raise_for_status()
-                image_bytes = r.content
+            image_bytes = _fetch_image(image_url)
             mime = "image/jpeg"
             ctx = {
                 "title": data.get("title"),
@@ -75,3 +74,40 @@ def analyze_media():
         return jsonify({"ai": ai})
     except Exception as e:
         return jsonify({"error": str(e)}), 500
+
+
+def _fetch_image(image_url: str) -> bytes:
+    with httpx.Client(timeout=20) as client:
+        r = client.get(image_url)
+        r.raise_for_status()
+        return r.content
+
+
+def _run_analysis_job(image_bytes: bytes, params: dict) -> dict:
+    if not image_bytes:
+        image_bytes = _fetch_image(params["image_url"])
+    return {"ai": analyze_quality_and_price(image_bytes, params.get("mime_type") or "image/jpeg", params.get("context"))}
+
+
+job_runner.register("media", _run_analysis_job)
+
+
+@bp.post("/analyze/jobs")
+@jwt_required()
+@role_required("farmer", "equipmetal", "admin")
+def analyze_media_async():
+    """Queue an /analyze request (same inputs) and return a job id to poll at /api/v1/jobs/<id>.
+    With 'image_url', the image is downloaded by the worker, not in the request.
+    """
+    fields = ("title", "category", "unit", "location", "current_price")
+    if request.files.get("image"):
+        img = request.files["image"]
+        blob = img.read()
+        params = {"mime_type": img.mimetype or "image/jpeg", "context": {k: request.form.get(k) for k in fields}}
+    else:
+        data = request.get_json(silent=True) or {}
+        if not data.get("image_url"):
+            return jsonify({"error": "image or image_url required"}), 400
+        blob = b""
+        params = {"image_url": data["image_url"], "mime_type": "image/jpeg", "context": {k: data.get(k) for k in fields}}
+    return submit_job("media", blob, params, user_id=str(get_jwt_identity()))
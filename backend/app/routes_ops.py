@@ -0,0 +1,46 @@
+from flask import Blueprint, Response, jsonify, request, send_file
+
+from .auth import role_required
+from .services.profiling import list_profiles, make_token, profile_path, profile_text
+from .services.query_stats import query_stats
+
+bp = Blueprint("ops", __name__, url_prefix="/api/v1/ops")
+
+
+@bp.get("/db/queries")
+@role_required("admin")
+def db_queries():
+    """Statements and DB time per endpoint, and recent N+1 suspects, since process start."""
+    return jsonify(query_stats(limit=request.args.get("limit", 20, type=int)))
+
+
+@bp.post("/profiles/token")
+@role_required("admin")
+def profile_token():
+    """Signed X-Profile header value; requests sending it are profiled until it expires."""
+    ttl = min(max(request.args.get("ttl", 900, type=int), 60), 86400)
+    return jsonify(make_token(ttl))
+
+
+@bp.get("/profiles")
+@role_required("admin")
+def profiles():
+    """Stored request profiles, slowest first."""
+    limit = min(request.args.get("limit", 20, type=int), 200)
+    return jsonify({"profiles": list_profiles(limit=limit, endpoint=request.args.get("endpoint"))})
+
+
+@bp.get("/profiles/<profile_id>")
+@role_required("admin")
+def download_profile(profile_id: str):
+    """The raw .prof file, or a pstats text report with ?format=text."""
+    path = profile_path(profile_id)
+    if path is None:
+        return jsonify({"error": "not_found"}), 404
+    if request.args.get("format") == "text":
+        sort = request.args.get("sort", "cumulative")
+        if sort not in ("cumulative", "tottime", "calls"):
+            sort = "cumulative"
+        return Response(profile_text(path, sort=sort), mimetype="text/plain")
+    return send_file(path, mimetype="application/octet-stream", as_attachment=True,
+                     download_name=f"{profile_id}.prof")
@@ -1,5 +1,4 @@
 from flask import Blueprint, request, jsonify
-import razorpay
 import hmac
 import hashlib
 from datetime import datetime
@@ -16,17 +15,11 @@ from .models import (
 )
 from .auth import role_required
 from .config import settings
+from .services.metrics import track_upstream
+from .services.razorpay_service import get_client as get_razorpay_client
 
 bp = Blueprint("payments", __name__, url_prefix="/api/v1/payments")
 
-# Initialize Razorpay client only if enabled
-razorpay_client = None
-if settings.RAZORPAY_KEY_ID and settings.RAZORPAY_KEY_SECRET:
-    razorpay_client = razorpay.Client(auth=(
-        settings.RAZORPAY_KEY_ID,
-        settings.RAZORPAY_KEY_SECRET
-    ))
-
 
 @bp.post("/create-order")
 @jwt_required()
@@ -85,13 +78,15 @@ def create_marketplace_order(session: Session, user_id: int, data: dict):
             total_amount += order_data['subtotal'] + order_data['delivery_charges']
 
         # Create Razorpay order (skip in dev if keys missing)
-        if razorpay_client is not None and settings.RAZORPAY_ENABLED:
-            razorpay_order = razorpay_client.order.create({
-                'amount': int(total_amount * 100),  # Convert to paise
-                'currency': 'INR',
-                'receipt': f'order_rcptid_{datetime.now().strftime("%Y%m%d_%H%M%S")}',
-                'payment_capture': '1'
-            })
+        razorpay_client = get_razorpay_client() if settings.RAZORPAY_ENABLED else None
+        if razorpay_client is not None:
+            with track_upstream("razorpay"):
+                razorpay_order = razorpay_client.order.create({
+                    'amount': int(total_amount * 100),  # Convert to paise
+                    'currency': 'INR',
+                    'receipt': f'order_rcptid_{datetime.now().strftime("%Y%m%d_%H%M%S")}',
+                    'payment_capture': '1'
+                })
             order_id_value = razorpay_order['id']
         else:
             # Dev mode: no external payment, generate a fake order id
@@ -184,13 +179,15 @@ def create_equipment_order(session: Session, user_id: int, data: dict):
             total_amount = duration_hours * float(equipment.rate_per_hour or 0)
 
         # Create Razorpay order (or dev fake id)
-        if razorpay_client is not None and settings.RAZORPAY_ENABLED:
-            rp_order = razorpay_client.order.create({
-                'amount': int(total_amount * 100),
-                'currency': 'INR',
-                'receipt': f'eq_order_{datetime.now().strftime("%Y%m%d_%H%M%S")}',
-                'payment_capture': '1'
-            })
+        razorpay_client = get_razorpay_client() if settings.RAZORPAY_ENABLED else None
+        if razorpay_client is not None:
+            with track_upstream("razorpay"):
+                rp_order = razorpay_client.order.create({
+                    'amount': int(total_amount * 100),
+                    'currency': 'INR',
+                    'receipt': f'eq_order_{datetime.now().strftime("%Y%m%d_%H%M%S")}',
+                    'payment_capture': '1'
+                })
             rp_order_id = rp_order['id']
         else:
             rp_order_id = f"order_DEV_EQ_{datetime.now().strftime('%Y%m%d%H%M%S')}"
@@ -479,9 +476,9 @@ def get_user_orders():
             
             order_list.append({
                 "id": order.id,
-                "created_at": order.created_at.isoformat(),
-                "status": order.status.value,
-                "payment_status": order.payment_status.value,
+                "created_at": order.created_at,
+                "status": order.status,
+                "payment_status": order.payment_status,
                 "subtotal": order.subtotal,
                 "delivery_charges": order.delivery_charges,
                 "total_amount": order.total_amount,
@@ -537,9 +534,9 @@ def get_order_detail(order_id: int):
         return jsonify({
             "order": {
                 "id": order.id,
-                "created_at": order.created_at.isoformat(),
-                "status": order.status.value,
-                "payment_status": order.payment_status.value,
+                "created_at": order.created_at,
+                "status": order.status,
+                "payment_status": order.payment_status,
                 "subtotal": order.subtotal,
                 "delivery_charges": order.delivery_charges,
                 "total_amount": order.total_amount,
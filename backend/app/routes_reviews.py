@@ -4,7 +4,7 @@ from sqlalchemy import and_, or_, func, desc, asc
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
 
-from .db import get_db
+from .db import get_db, read_only
 from .models import (
     ProductReview, FarmerReview, Order, Product, User,
     OrderStatus, Conversation, Message
@@ -127,6 +127,7 @@ def create_farmer_review(farmer_id: int):
 
 
 @bp.get("/products/<int:product_id>")
+@read_only
 def get_product_reviews(product_id: int):
     """Get reviews for a specific product"""
     page = request.args.get("page", 1, type=int)
@@ -196,6 +197,7 @@ def get_product_reviews(product_id: int):
 
 
 @bp.get("/farmers/<int:farmer_id>")
+@read_only
 def get_farmer_reviews(farmer_id: int):
     """Get reviews for a specific farmer"""
     page = request.args.get("page", 1, type=int)
@@ -1,8 +1,9 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, current_app, request, jsonify
 from sqlalchemy.orm import Session
 from flask_jwt_extended import get_jwt_identity
 
 from .db import get_db
+from .services.ai_cache import cached_ai_response
 from .services.gemini_core import plan_from_inputs_strict, _fallback_plan as __fb
 
 bp = Blueprint("tracker", __name__, url_prefix="/api/v1/tracker")
@@ -26,10 +27,23 @@ def list_plans():
 @bp.post("/plan-ai")
 def plan_ai():
     payload = request.get_json(force=True) or {}
-    try:
-        data = plan_from_inputs_strict(payload)
-    except Exception:
-        crop = (payload.get("crop") or "crop")
-        season = payload.get("season")
-        data = __fb(crop, season)
+    for db in get_db():
+        session: Session = db
+        try:
+            data = cached_ai_response(
+                "plan", payload, payload.get("language"),
+                lambda: plan_from_inputs_strict(payload),
+                session=session,
+            )
+        except Exception:
+            # Only a failed generation falls back to the rule-based plan
+            crop = (payload.get("crop") or "crop")
+            season = payload.get("season")
+            return jsonify(__fb(crop, season))
+        # The log row is bookkeeping: losing it must not discard a generated plan
+        try:
+            session.commit()
+        except Exception:
+            session.rollback()
+            current_app.logger.warning("failed to log AI crop plan", exc_info=True)
     return jsonify(data)
@@ -1,6 +1,6 @@
 from flask import Blueprint, request, jsonify
-import httpx
 from .config import settings
+from .services.weather import WeatherError, get_current_weather, get_weather_batch, weather_stats
 
 bp = Blueprint("weather", __name__, url_prefix="/api/v1/weather")
 
@@ -10,12 +10,40 @@ def get_weather():
     lon = request.args.get("lon")
     if not (lat and lon):
         return jsonify({"error": "lat and lon required"}), 400
-    api = settings.OPENWEATHER_API_KEY
-    if not api:
-        return jsonify({"error": "OPENWEATHER_API_KEY not configured"}), 503
-    url = f"https://api.openweathermap.org/data/2.5/weather?lat={lat}&lon={lon}&appid={api}&units=metric"
     try:
-        r = httpx.get(url, timeout=10)
-        return jsonify(r.json())
-    except Exception as e:
-        return jsonify({"error": str(e)}), 502
+        lat_f, lon_f = float(lat), float(lon)
+    except ValueError:
+        return jsonify({"error": "lat and lon must be numbers"}), 400
+    try:
+        return jsonify(get_current_weather(lat_f, lon_f))
+    except WeatherError as e:
+        return jsonify(e.payload), e.status
+
+@bp.post("/batch")
+def get_weather_batch_route():
+    """Current weather and a 24 h forecast for many farm plots in one call.
+    Body: {"points": [{"lat": .., "lon": .., "id": optional}], "forecast": true}
+    """
+    payload = request.get_json(silent=True) or {}
+    points = payload.get("points")
+    if not isinstance(points, list) or not points:
+        return jsonify({"error": "points required"}), 400
+    if len(points) > settings.WEATHER_BATCH_MAX_POINTS:
+        return jsonify({"error": f"at most {settings.WEATHER_BATCH_MAX_POINTS} points per request"}), 400
+    if not settings.OPENWEATHER_API_KEY:
+        return jsonify({"error": "OPENWEATHER_API_KEY not configured"}), 503
+    coords = []
+    for p in points:
+        try:
+            coords.append((float(p["lat"]), float(p["lon"])))
+        except (KeyError, TypeError, ValueError):
+            return jsonify({"error": "each point needs numeric lat and lon"}), 400
+    results = get_weather_batch(coords, include_forecast=bool(payload.get("forecast", True)))
+    for p, r in zip(points, results):
+        if p.get("id") is not None:
+            r["id"] = p["id"]
+    return jsonify({"results": results, "tiles": len({tuple(r["tile"]) for r in results})})
+
+@bp.get("/stats")
+def get_weather_stats():
+    return jsonify(weather_stats())
@@ -39,3 +39,8 @@ class RecommendationCrop(BaseModel):
 class SoilRecommendationRequest(BaseModel):
     soil: Dict[str, Any]
     language: Optional[str] = None
+
+
+class SoilBatchRecommendationRequest(BaseModel):
+    items: List[Dict[str, Any]]
+    language: Optional[str] = None
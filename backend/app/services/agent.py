@@ -1,12 +1,15 @@
 from __future__ import annotations
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, Iterator, Optional, Tuple
 import re
 
+from .ai_cache import cached_ai_response
 from .gemini_core import recommend_from_soil
-from .gemini_rest import chat_from_message_rest
+from .gemini_rest import chat_from_message_rest, stream_chat_rest
 from .gemini import chat_from_message
+from .price_forecast import price_forecaster
+from .semantic_cache import chat_cache
+from .weather import get_current_weather
 from ..config import settings
-import httpx
 
 
 class AgentService:
@@ -37,8 +40,14 @@ class AgentService:
             if intent == "soil_reco":
                 data = self._tool_soil_reco(entities, language)
                 return self._compose_soil_reply(data, language)
-            # Fallback to Gemini general chat (REST client)
-            return chat_from_message_rest(msg, language)
+            # Fallback to Gemini general chat (REST client), reusing answers to near-identical questions
+            cached = chat_cache.lookup(msg, language)
+            if cached is not None:
+                return {**cached, "cached": True}
+            data = chat_from_message_rest(msg, language)
+            if data.get("model") not in (None, "none", "rules-fallback"):
+                chat_cache.store(msg, language, data)
+            return data
         except Exception:
             # On any exception, try Gemini chat as last resort
             try:
@@ -46,6 +55,36 @@ class AgentService:
             except Exception:
                 return {"reply": "I couldn't complete this request right now. Please try again later.", "model": "rules-fallback"}
 
+    def handle_stream(self, message: str, language: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Like ``handle`` but yields the reply incrementally: ``{"delta": text}`` events, then one
+        ``{"done": True, "reply": ..., "model": ...}``. Only general chat streams from Gemini;
+        tool answers and cached answers arrive as a single delta.
+        """
+        msg = (message or "").strip()
+        if not msg or self._classify(msg)[0] != "chat":
+            data = self.handle(msg, language)
+            yield {"delta": data.get("reply") or ""}
+            yield {"done": True, **data}
+            return
+        cached = chat_cache.lookup(msg, language)
+        if cached is not None:
+            yield {"delta": cached.get("reply") or ""}
+            yield {"done": True, **cached, "cached": True}
+            return
+        parts = []
+        model = "none"
+        for model, delta in stream_chat_rest(msg, language):
+            parts.append(delta)
+            yield {"delta": delta}
+        reply = "".join(parts).strip()
+        if not reply:
+            reply = "Sorry, I couldn't generate a reply."
+            yield {"delta": reply}
+        data = {"reply": reply, "model": model}
+        if model not in ("none", "rules-fallback") and parts:
+            chat_cache.store(msg, language, data)
+        yield {"done": True, **data}
+
     # --------- Intent classification ---------
     def _classify(self, msg: str) -> Tuple[str, Dict[str, Any]]:
         mlow = msg.lower()
@@ -94,18 +133,26 @@ class AgentService:
         lon = entities.get("lon")
         if not (lat and lon):
             return {"error": "Please provide your location as 'weather <lat>,<lon>' e.g., weather 21.15,79.08"}
-        api = settings.OPENWEATHER_API_KEY
-        if not api:
+        if not settings.OPENWEATHER_API_KEY:
             return {"error": "Weather API key not configured"}
-        url = f"https://api.openweathermap.org/data/2.5/weather?lat={lat}&lon={lon}&appid={api}&units=metric"
-        with httpx.Client(timeout=15) as client:
-            r = client.get(url)
-            r.raise_for_status()
-            return r.json()
+        return get_current_weather(float(lat), float(lon))
 
     def _tool_prices(self, entities: Dict[str, Any]) -> Dict[str, Any]:
-        # Stubbed price data; could call an external API here
         commodity = entities.get("commodity") or "wheat"
+        try:
+            price_forecaster.ensure_fresh()
+            fc = price_forecaster.forecast(commodity, horizon=7)
+        except Exception:
+            fc = None
+        if fc:
+            return {"prices": [{
+                "commodity": commodity,
+                "market": "Indian mandis (avg)",
+                "unit": fc["unit"],
+                "price": fc["current_price"],
+                "forecast_7d": fc["forecast"][-1]["price"],
+            }]}
+        # No ingested history yet; stubbed price data
         return {"prices": [{"commodity": commodity, "market": "Local Mandi", "unit": "kg", "price": 22.5}]}
 
     def _tool_soil_reco(self, entities: Dict[str, Any], language: Optional[str]) -> Dict[str, Any]:
@@ -114,7 +161,7 @@ class AgentService:
             "ph": entities.get("ph"),
             "season": entities.get("season")
         }
-        return recommend_from_soil(soil, language)
+        return cached_ai_response("soil", soil, language, lambda: recommend_from_soil(soil, language))
 
     # --------- Compose replies ---------
     def _compose_weather_reply(self, data: Dict[str, Any], language: Optional[str]) -> Dict[str, Any]:
@@ -156,6 +203,13 @@ class AgentService:
             reply = f"{p['market']} ରେ {p['commodity'].title()} ର ମାର୍କେଟ ଭାବ: ₹{p['price']}/{p['unit']}."
         else:
             reply = f"Market price for {p['commodity'].title()} in {p['market']}: ₹{p['price']}/{p['unit']}."
+        if p.get("forecast_7d") is not None:
+            if language == 'hi':
+                reply += f" अगले 7 दिनों का अनुमान: ₹{p['forecast_7d']}/{p['unit']}."
+            elif language == 'or':
+                reply += f" ଆଗାମୀ 7 ଦିନର ଆକଳନ: ₹{p['forecast_7d']}/{p['unit']}."
+            else:
+                reply += f" 7-day outlook: ₹{p['forecast_7d']}/{p['unit']}."
         return {"reply": reply, "model": "tool-prices"}
 
     def _compose_soil_reply(self, data: Dict[str, Any], language: Optional[str]) -> Dict[str, Any]:
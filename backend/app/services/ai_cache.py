@@ -0,0 +1,168 @@
+"""
+Content-addressed cache for deterministic AI answers (soil recommendations, crop plans).
+
+Inputs are normalized (case, whitespace, key order) and numeric soil readings are
+bucketed (pH to 0.25, N/P/K to 10 kg/ha, ...) so near-identical requests share an
+entry. The key is a SHA-256 of kind + normalized inputs + language + model.
+
+Two tiers: an in-process LRU (``TTLCache``) and ``SoilRecommendationLog`` rows
+carrying the same ``cache_key``, which survive restarts and are shared across
+workers. Rule-based fallback answers are never cached.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import math
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models import SoilRecommendationLog
+from .cache import TTLCache
+from .metrics import counter
+
+ai_response_cache = TTLCache("ai_responses", ttl_seconds=settings.AI_CACHE_TTL, maxsize=settings.AI_CACHE_MAXSIZE)
+lookups = counter("ai_response_cache_lookups_total", "AI answer cache lookups by kind and tier served", ["kind", "tier"])
+
+# Bucket width per numeric field; anything else numeric is rounded to 1 decimal
+NUMERIC_BUCKETS: Dict[str, float] = {
+    "ph": 0.25,
+    "n": 10.0, "nitrogen": 10.0,
+    "p": 5.0, "phosphorus": 5.0,
+    "k": 10.0, "potassium": 10.0,
+    "ec": 0.1,
+    "organic_carbon": 0.1, "oc": 0.1,
+    "moisture": 5.0,
+    "rainfall": 50.0,
+    "temperature": 1.0,
+    "area": 0.5,
+}
+# Request fields that don't change the answer
+IGNORED_FIELDS = {"id", "user_id", "request_id", "timestamp"}
+
+
+def _bucket(field: str, value: float) -> float:
+    if not math.isfinite(value):
+        return value  # "inf"/"nan" can't be rounded; keyed as-is
+    width = NUMERIC_BUCKETS.get(field)
+    if width is None:
+        return round(value, 1)
+    return round(round(value / width) * width, 4)
+
+
+def normalize(value: Any, field: str = "") -> Any:
+    """Canonical form of request inputs: lower-cased trimmed strings, bucketed numbers,
+    empty values dropped. Numeric strings ("6.8") are treated as numbers.
+    """
+    if isinstance(value, dict):
+        out = {}
+        for k, v in value.items():
+            key = str(k).strip().lower()
+            if key in IGNORED_FIELDS:
+                continue
+            nv = normalize(v, key)
+            if nv not in (None, "", [], {}):
+                out[key] = nv
+        return out
+    if isinstance(value, (list, tuple)):
+        return [normalize(v, field) for v in value]
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return _bucket(field, float(value))
+    if isinstance(value, str):
+        text = " ".join(value.split()).lower()
+        try:
+            return _bucket(field, float(text))
+        except ValueError:
+            return text
+    return value
+
+
+def cache_key(kind: str, inputs: Dict[str, Any], language: Optional[str]) -> str:
+    material = {
+        "kind": kind,
+        "inputs": normalize(inputs or {}),
+        "language": (language or "en").strip().lower(),
+        "model": settings.GEMINI_MODEL,
+    }
+    return hashlib.sha256(json.dumps(material, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def _cacheable(data: Any) -> bool:
+    return isinstance(data, dict) and data.get("model") not in (None, "rules-fallback")
+
+
+def _load_persisted(session: Session, key: str) -> Optional[Dict[str, Any]]:
+    cutoff = datetime.utcnow() - timedelta(seconds=settings.AI_CACHE_TTL)
+    row = session.execute(
+        select(SoilRecommendationLog.response)
+        .where(SoilRecommendationLog.cache_key == key, SoilRecommendationLog.created_at >= cutoff)
+        .order_by(SoilRecommendationLog.id.desc())
+        .limit(1)
+    ).first()
+    return row[0] if row else None
+
+
+def lookup_cached(kind: str, key: str, session: Optional[Session] = None) -> Optional[Dict[str, Any]]:
+    """Cached answer for a key from memory, then the log table; counts the lookup either way."""
+    data = ai_response_cache.get(key)
+    if data is not None:
+        lookups.inc(kind, "memory")
+        return data
+    if session is not None:
+        try:
+            data = _load_persisted(session, key)
+        except Exception:
+            data = None
+        if data is not None:
+            lookups.inc(kind, "db")
+            ai_response_cache.set(key, data)
+            return data
+    lookups.inc(kind, "miss")
+    return None
+
+
+def remember(key: str, data: Dict[str, Any], request: Dict[str, Any]) -> SoilRecommendationLog:
+    """Cache a freshly generated answer (unless it is a fallback) and build its log row."""
+    cacheable = _cacheable(data)
+    if cacheable:
+        ai_response_cache.set(key, data)
+    return SoilRecommendationLog(
+        request=request,
+        response=data,
+        model_name=data.get("model"),
+        cache_key=key if cacheable else None,
+    )
+
+
+def cached_ai_response(kind: str, inputs: Dict[str, Any], language: Optional[str],
+                       loader: Callable[[], Dict[str, Any]], session: Optional[Session] = None,
+                       log_request: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Serve ``loader()``'s answer for these inputs from memory, then the log table, else call it.
+    With a ``session``, every freshly generated answer is logged to ``SoilRecommendationLog``
+    (``log_request`` is stored as the request; defaults to the raw inputs) and cacheable ones
+    carry the key for later lookups. The caller commits.
+    """
+    key = cache_key(kind, inputs, language)
+    data = lookup_cached(kind, key, session)
+    if data is not None:
+        return data
+    data = loader()
+    log = remember(key, data, log_request if log_request is not None else {"kind": kind, "inputs": inputs, "language": language})
+    if session is not None:
+        session.add(log)
+    return data
+
+
+def ai_cache_stats() -> Dict[str, Any]:
+    tiers: Dict[str, Dict[str, float]] = {}
+    for (kind, tier), value in lookups.samples():
+        tiers.setdefault(kind, {})[tier] = value
+    for counts in tiers.values():
+        total = sum(counts.values())
+        counts["hit_ratio"] = round((total - counts.get("miss", 0)) / total, 4) if total else None
+    return {"memory": ai_response_cache.stats(), "by_kind": tiers}
@@ -1,18 +1,34 @@
 import os
-import cloudinary
-import cloudinary.uploader
-from cloudinary.exceptions import Error as CloudinaryError
+import threading
 from werkzeug.datastructures import FileStorage
 import uuid
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
+
+from .metrics import track_upstream
+
+_sdk: Any = None
+_sdk_lock = threading.Lock()
+
+
+def _cloudinary():
+    """The cloudinary package, configured on first use instead of at import time."""
+    global _sdk
+    if _sdk is None:
+        with _sdk_lock:
+            if _sdk is None:
+                import cloudinary
+                import cloudinary.exceptions
+                import cloudinary.uploader
+                import cloudinary.utils
+                cloudinary.config(
+                    cloud_name=os.getenv('CLOUDINARY_CLOUD_NAME'),
+                    api_key=os.getenv('CLOUDINARY_API_KEY'),
+                    api_secret=os.getenv('CLOUDINARY_API_SECRET'),
+                    secure=True
+                )
+                _sdk = cloudinary
+    return _sdk
 
-# Configure Cloudinary
-cloudinary.config(
-    cloud_name=os.getenv('CLOUDINARY_CLOUD_NAME'),
-    api_key=os.getenv('CLOUDINARY_API_KEY'),
-    api_secret=os.getenv('CLOUDINARY_API_SECRET'),
-    secure=True
-)
 
 class CloudinaryService:
     """Service for handling Cloudinary image uploads"""
@@ -29,6 +45,7 @@ class CloudinaryService:
         Returns:
             Dict with upload result or error
         """
+        cloudinary = _cloudinary()
         try:
             # Validate file
             if not file:
@@ -51,21 +68,22 @@ class CloudinaryService:
             unique_filename = f"{uuid.uuid4().hex}_{file.filename}"
             
             # Upload to Cloudinary
-            upload_result = cloudinary.uploader.upload(
-                file,
-                folder=folder,
-                public_id=unique_filename,
-                resource_type="image",
-                transformation=[
-                    {'width': 800, 'height': 600, 'crop': 'limit'},  # Limit max size
-                    {'quality': 'auto:good'},  # Auto optimize quality
-                    {'format': 'auto'}  # Auto format selection
-                ],
-                eager=[
-                    {'width': 200, 'height': 150, 'crop': 'thumb'},  # Thumbnail
-                    {'width': 400, 'height': 300, 'crop': 'fit'}    # Medium size
-                ]
-            )
+            with track_upstream("cloudinary"):
+                upload_result = cloudinary.uploader.upload(
+                    file,
+                    folder=folder,
+                    public_id=unique_filename,
+                    resource_type="image",
+                    transformation=[
+                        {'width': 800, 'height': 600, 'crop': 'limit'},  # Limit max size
+                        {'quality': 'auto:good'},  # Auto optimize quality
+                        {'format': 'auto'}  # Auto format selection
+                    ],
+                    eager=[
+                        {'width': 200, 'height': 150, 'crop': 'thumb'},  # Thumbnail
+                        {'width': 400, 'height': 300, 'crop': 'fit'}    # Medium size
+                    ]
+                )
             
             return {
                 "success": True,
@@ -75,7 +93,7 @@ class CloudinaryService:
                 "medium_url": upload_result.get('eager', [{}])[1].get('secure_url') if len(upload_result.get('eager', [])) > 1 else None
             }
             
-        except CloudinaryError as e:
+        except cloudinary.exceptions.Error as e:
             return {"success": False, "error": f"Cloudinary error: {str(e)}"}
         except Exception as e:
             return {"success": False, "error": f"Upload failed: {str(e)}"}
@@ -91,10 +109,12 @@ class CloudinaryService:
         Returns:
             Dict with deletion result
         """
+        cloudinary = _cloudinary()
         try:
-            result = cloudinary.uploader.destroy(public_id)
+            with track_upstream("cloudinary"):
+                result = cloudinary.uploader.destroy(public_id)
             return {"success": True, "result": result}
-        except CloudinaryError as e:
+        except cloudinary.exceptions.Error as e:
             return {"success": False, "error": f"Cloudinary error: {str(e)}"}
         except Exception as e:
             return {"success": False, "error": f"Deletion failed: {str(e)}"}
@@ -113,6 +133,7 @@ class CloudinaryService:
         Returns:
             Optimized image URL
         """
+        cloudinary = _cloudinary()
         try:
             transformation = []
             if width or height:
@@ -1,11 +1,7 @@
 import json
 from typing import Any, Dict, List
 from ..config import settings
-
-try:
-    import google.generativeai as genai
-except Exception:
-    genai = None  # type: ignore
+from .gemini_client import call_sdk, sdk
 
 
 def _fallback_rules(soil: Dict[str, Any], language: str | None = None) -> Dict[str, Any]:
@@ -39,8 +35,8 @@ def _fallback_rules(soil: Dict[str, Any], language: str | None = None) -> Dict[s
 
 
 def _gemini_generate(soil: Dict[str, Any], language: str | None) -> Dict[str, Any]:
+    genai = sdk()
     assert genai is not None and settings.GEMINI_API_KEY, "Gemini not configured"
-    genai.configure(api_key=settings.GEMINI_API_KEY)
     model = genai.GenerativeModel(settings.GEMINI_MODEL)
 
     system_prompt = (
@@ -73,7 +69,7 @@ def _gemini_generate(soil: Dict[str, Any], language: str | None) -> Dict[str, An
         "Respond with JSON ONLY."
     )
 
-    resp = model.generate_content(prompt)
+    resp = call_sdk(model.generate_content, prompt, request_options={"timeout": settings.GEMINI_CALL_BUDGET})
     txt = resp.text or "{}"
     try:
         data = json.loads(txt)
@@ -88,7 +84,7 @@ def _gemini_generate(soil: Dict[str, Any], language: str | None) -> Dict[str, An
 
 
 def recommend_from_soil(soil: Dict[str, Any], language: str | None = None) -> Dict[str, Any]:
-    if settings.GEMINI_API_KEY and genai is not None:
+    if settings.GEMINI_API_KEY and sdk() is not None:
         try:
             return _gemini_generate(soil, language)
         except Exception:
@@ -177,9 +173,9 @@ def plan_from_inputs(inputs: Dict[str, Any]) -> Dict[str, Any]:
     season = (inputs.get("season") or "").strip() or None
     language = inputs.get("language")
 
-    if settings.GEMINI_API_KEY and genai is not None:
+    genai = sdk() if settings.GEMINI_API_KEY else None
+    if genai is not None:
         try:
-            genai.configure(api_key=settings.GEMINI_API_KEY)
             model = genai.GenerativeModel(settings.GEMINI_MODEL)
 
             schema_hint = {
@@ -247,7 +243,7 @@ def plan_from_inputs(inputs: Dict[str, Any]) -> Dict[str, Any]:
                 f"USER INPUT\n{json.dumps(user_payload, ensure_ascii=False)}\n\n"
                 "Return JSON only."
             )
-            resp = model.generate_content(prompt)
+            resp = call_sdk(model.generate_content, prompt, request_options={"timeout": settings.GEMINI_CALL_BUDGET})
             txt = resp.text or "{}"
             try:
                 data = json.loads(txt)
@@ -275,9 +271,9 @@ def chat_from_message(message: str, language: str | None = None) -> Dict[str, An
     if not msg:
         return {"reply": "Please type your question.", "model": "none"}
 
-    if settings.GEMINI_API_KEY and genai is not None:
+    genai = sdk() if settings.GEMINI_API_KEY else None
+    if genai is not None:
         try:
-            genai.configure(api_key=settings.GEMINI_API_KEY)
             model = genai.GenerativeModel(settings.GEMINI_MODEL)
             
             # Language mapping for better prompts
@@ -294,7 +290,7 @@ def chat_from_message(message: str, language: str | None = None) -> Dict[str, An
                 f"{lang_instruction}"
             )
             prompt = f"SYSTEM\n{sys}\n\nLANGUAGE={language or 'en'}\n\nUSER\n{msg}"
-            resp = model.generate_content(prompt)
+            resp = call_sdk(model.generate_content, prompt, request_options={"timeout": settings.GEMINI_CALL_BUDGET})
             text = (resp.text or "").strip()
             return {"reply": text, "model": settings.GEMINI_MODEL}
         except Exception:
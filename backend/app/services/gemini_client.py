@@ -0,0 +1,242 @@
+"""
+Process-wide HTTP client for the Gemini REST API.
+
+One pooled, keep-alive ``httpx.Client`` (HTTP/2 when the ``h2`` package is
+available) is shared by every REST call in ``app/services`` and the AI health
+probe, so calls after the first skip the TLS handshake. Each call records
+latency per model slug and a request counter by status.
+"""
+from __future__ import annotations
+import json
+import threading
+import time
+from typing import Any, Dict, Iterator, Optional
+
+import httpx
+
+from ..config import settings
+from .metrics import counter, histogram
+from .resilience import Bulkhead, CircuitBreaker, RejectedError, call_guarded
+
+try:
+    import h2  # noqa: F401
+    _HTTP2_AVAILABLE = True
+except Exception:
+    _HTTP2_AVAILABLE = False
+
+gemini_latency = histogram(
+    "gemini_request_duration_seconds", "Gemini REST call latency by model slug", ["model"]
+)
+gemini_requests = counter(
+    "gemini_requests_total", "Gemini REST calls by model slug and HTTP status (or 'error')", ["model", "status"]
+)
+gemini_first_token = histogram(
+    "gemini_stream_first_token_seconds", "Time from request to first streamed chunk by model slug", ["model"]
+)
+
+# Shared by REST and SDK paths: fail fast while Gemini is down, cap in-flight calls
+gemini_breaker = CircuitBreaker(
+    "gemini",
+    failure_threshold=settings.GEMINI_BREAKER_FAILURES,
+    reset_timeout=settings.GEMINI_BREAKER_RESET_SECONDS,
+)
+gemini_bulkhead = Bulkhead(
+    "gemini", max_concurrent=settings.GEMINI_MAX_CONCURRENCY, queue_timeout=settings.GEMINI_QUEUE_TIMEOUT
+)
+
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+_sdk: Any = None
+_sdk_loaded = False
+
+
+def get_client() -> httpx.Client:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = httpx.Client(
+                    base_url=settings.GEMINI_BASE_URL,
+                    http2=settings.GEMINI_HTTP2 and _HTTP2_AVAILABLE,
+                    timeout=httpx.Timeout(settings.GEMINI_TIMEOUT, connect=10.0),
+                    limits=httpx.Limits(
+                        max_connections=settings.GEMINI_HTTP_MAX_CONNECTIONS,
+                        max_keepalive_connections=settings.GEMINI_HTTP_MAX_KEEPALIVE,
+                        keepalive_expiry=settings.GEMINI_HTTP_KEEPALIVE_EXPIRY,
+                    ),
+                )
+    return _client
+
+
+def sdk() -> Any:
+    """``google.generativeai``, configured with the API key, or None if it isn't installed.
+
+    Imported on first use rather than at module import: the SDK pulls in the
+    protobuf/gRPC stack, which dominated ``create_app`` import time.
+    """
+    global _sdk, _sdk_loaded
+    if not _sdk_loaded:
+        with _client_lock:
+            if not _sdk_loaded:
+                try:
+                    import google.generativeai as genai
+                    if settings.GEMINI_API_KEY:
+                        genai.configure(api_key=settings.GEMINI_API_KEY)
+                    _sdk = genai
+                except Exception:
+                    _sdk = None
+                _sdk_loaded = True
+    return _sdk
+
+
+def close_client() -> None:
+    global _client
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
+
+
+def _is_upstream_failure(r: httpx.Response) -> bool:
+    return r.status_code >= 500 or r.status_code == 429
+
+
+def _params() -> Dict[str, Any]:
+    return {"key": settings.GEMINI_API_KEY}
+
+
+def generate_content(model: str, payload: Dict[str, Any], timeout: Optional[float] = None,
+                     api_version: str = "v1") -> httpx.Response:
+    """POST ``models/{model}:generateContent`` and return the raw response.
+    Network errors propagate as ``httpx.HTTPError`` and a rejected call (circuit open,
+    too many in flight) as ``RejectedError``; HTTP status handling is left to the caller.
+    """
+    started = time.perf_counter()
+    status = "error"
+    try:
+        r = call_guarded(
+            gemini_breaker, gemini_bulkhead, get_client().post,
+            f"/{api_version}/models/{model}:generateContent",
+            params=_params(),
+            json=payload,
+            timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+            is_failure=_is_upstream_failure,
+        )
+        status = str(r.status_code)
+        return r
+    except RejectedError:
+        status = "rejected"
+        raise
+    finally:
+        if status != "rejected":
+            gemini_latency.observe(model, value=time.perf_counter() - started)
+        gemini_requests.inc(model, status)
+
+
+class GeminiHTTPError(RuntimeError):
+    def __init__(self, status_code: int) -> None:
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+
+
+def stream_generate_content(model: str, payload: Dict[str, Any], timeout: Optional[float] = None,
+                            api_version: str = "v1") -> Iterator[Dict[str, Any]]:
+    """POST ``models/{model}:streamGenerateContent?alt=sse`` and yield each response chunk.
+    Raises ``GeminiHTTPError`` for a non-200 status (before anything is yielded) and
+    ``RejectedError`` like ``generate_content``. The concurrency slot is held until the
+    stream is exhausted or the generator is closed.
+    """
+    gemini_breaker.before_call()
+    try:
+        gemini_bulkhead.acquire()
+    except RejectedError:
+        gemini_breaker.cancel_probe()
+        gemini_requests.inc(model, "rejected")
+        raise
+    started = time.perf_counter()
+    status = "error"
+    failed = True
+    try:
+        with get_client().stream(
+            "POST",
+            f"/{api_version}/models/{model}:streamGenerateContent",
+            params={**_params(), "alt": "sse"},
+            json=payload,
+            timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+        ) as r:
+            status = str(r.status_code)
+            if r.status_code != 200:
+                r.read()
+                failed = _is_upstream_failure(r)
+                raise GeminiHTTPError(r.status_code)
+            first = True
+            for line in r.iter_lines():
+                if not line.startswith("data:"):
+                    continue
+                try:
+                    chunk = json.loads(line[5:].strip())
+                except ValueError:
+                    continue
+                if first:
+                    gemini_first_token.observe(model, value=time.perf_counter() - started)
+                    first = False
+                yield chunk
+            failed = False
+    except GeneratorExit:
+        failed = False  # consumer went away (e.g. client disconnected)
+        raise
+    finally:
+        gemini_bulkhead.release()
+        if failed:
+            gemini_breaker.record_failure()
+        else:
+            gemini_breaker.record_success()
+        gemini_latency.observe(model, value=time.perf_counter() - started)
+        gemini_requests.inc(model, status)
+
+
+def _is_sdk_failure(exc: BaseException) -> bool:
+    """SDK errors that mean Gemini is unhealthy: 5xx, 429, timeouts and network errors.
+    A 400 or 404 (bad request, unknown model) is the caller's problem and leaves the breaker closed.
+    """
+    code = getattr(exc, "code", None)  # google.api_core errors carry the HTTP status
+    if isinstance(code, int):
+        return code >= 500 or code == 429
+    if isinstance(exc, (TimeoutError, ConnectionError, httpx.TransportError)):
+        return True
+    try:
+        from google.api_core.exceptions import RetryError
+    except ImportError:
+        return False
+    return isinstance(exc, RetryError)  # retries ran out of deadline
+
+
+def call_sdk(fn, *args: Any, **kwargs: Any) -> Any:
+    """Run a google-generativeai SDK call behind the same breaker and concurrency limit."""
+    return call_guarded(gemini_breaker, gemini_bulkhead, fn, *args, is_failure_exc=_is_sdk_failure, **kwargs)
+
+
+def list_models(api_version: str = "v1", timeout: Optional[float] = None) -> httpx.Response:
+    return get_client().get(
+        f"/{api_version}/models",
+        params=_params(),
+        timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT,
+    )
+
+
+def extract_text(data: Dict[str, Any], strip: bool = True) -> str:
+    """Concatenated text parts of all candidates; pass ``strip=False`` for stream chunks."""
+    text = ""
+    for cand in (data.get("candidates") or []):
+        for part in (cand.get("content", {}).get("parts") or []):
+            if "text" in part:
+                text += part["text"]
+    return text.strip() if strip else text
+
+
+def latency_summary() -> Dict[str, Any]:
+    return gemini_latency.summary()
+
+
+def guard_stats() -> Dict[str, Any]:
+    return {"circuit": gemini_breaker.stats(), "concurrency": gemini_bulkhead.stats()}
@@ -102,6 +102,64 @@ def recommend_from_soil(soil: Dict[str, Any], language: Optional[str] = None) ->
         return _fallback_rules(soil, language)
 
 
+def recommend_from_soil_batch(soils: List[Dict[str, Any]], language: Optional[str] = None) -> List[Optional[Dict[str, Any]]]:
+    """One Gemini call for several soil profiles. Returns one entry per input, in order;
+    None where the model left an item out. Raises RuntimeError if Gemini is unavailable.
+    """
+    if not settings.GEMINI_API_KEY:
+        raise RuntimeError("no_api_key")
+    lang_instructions = {
+        'hi': 'Write all text content in Hindi language. Use clear, simple Hindi that farmers can understand.',
+        'or': 'Write all text content in Odia language. Use clear, simple Odia that farmers can understand.',
+        'en': 'Write all text content in English language. Use clear, simple English that farmers can understand.'
+    }
+    lang_instruction = lang_instructions.get(language, lang_instructions['en']) if language else lang_instructions['en']
+    system_prompt = (
+        "You are an agricultural expert for India. For EACH numbered soil profile, respond with 2-3 suitable crops "
+        "along with fertilizer plans, planting steps, and ideal seasons. Treat profiles independently. "
+        f"{lang_instruction} "
+        "Return STRICT JSON only with all text fields translated appropriately."
+    )
+    schema_hint = {
+        "results": [
+            {
+                "index": 0,
+                "recommendations": [
+                    {
+                        "crop": "...",
+                        "ideal_season": "...",
+                        "seed_rate": "...",
+                        "spacing": "...",
+                        "irrigation": "...",
+                        "fertilizer": {"basal": "...", "top_dressing": "...", "micronutrients": "..."},
+                        "pest_disease_watch": "...",
+                        "steps": [{"step": "...", "when": "...", "details": "..."}]
+                    }
+                ],
+                "notes": "..."
+            }
+        ]
+    }
+    profiles = [{"index": i, "soil": soil} for i, soil in enumerate(soils)]
+    prompt = (
+        f"SYSTEM:\n{system_prompt}\n\n"
+        f"JSON schema hint (one result per profile, same index):\n{json.dumps(schema_hint)}\n\n"
+        f"SOIL PROFILES:\n{json.dumps(profiles, ensure_ascii=False)}\n\n"
+        "Respond with JSON ONLY. No prose."
+    )
+    data = _parse_json_strict(_gemini_rest_generate_text(prompt))
+    out: List[Optional[Dict[str, Any]]] = [None] * len(soils)
+    for item in data.get("results") or []:
+        idx = item.get("index") if isinstance(item, dict) else None
+        if isinstance(idx, int) and 0 <= idx < len(soils) and item.get("recommendations"):
+            out[idx] = {
+                "recommendations": item["recommendations"],
+                "notes": item.get("notes", ""),
+                "model": settings.GEMINI_MODEL,
+            }
+    return out
+
+
 def _fallback_plan(crop: str, season: Optional[str] = None) -> Dict[str, Any]:
     stages = [
         {"name": "Land Preparation", "start_day": 0, "end_day": 7,
@@ -2,33 +2,15 @@ import base64
 import json
 from typing import Dict, Any, Optional
 
-import httpx
-
+from .gemini_client import call_sdk, extract_text, sdk
+from .gemini_models import generate_with_fallbacks
 from .gemini_core import _parse_json_strict
+from .image_hash import diagnosis_index, image_hashes
+from .image_prep import prepare_for_vision
 from ..config import settings
 
-try:
-    import google.generativeai as genai
-except Exception:
-    genai = None  # type: ignore
-
 
 def _rest_generate_with_image(prompt: str, image_b64: str, mime_type: str) -> str:
-    # Try multiple model slugs
-    first = (settings.GEMINI_MODEL or "gemini-2.5-flash").strip()
-    if first.startswith("models/"):
-        first = first.split("/", 1)[1]
-    models = [
-        first,
-        f"{first}-latest",
-        "gemini-2.5-flash",
-        "gemini-2.5-pro",
-        "gemini-2.0-flash",
-        "gemini-2.0-flash-001",
-        "gemini-2.5-flash-lite",
-        "gemini-1.5-flash",
-        "gemini-1.5-pro",
-    ]
     payload = {
         "contents": [
             {
@@ -40,30 +22,8 @@ def _rest_generate_with_image(prompt: str, image_b64: str, mime_type: str) -> st
             }
         ]
     }
-    params = {"key": settings.GEMINI_API_KEY}
-    with httpx.Client(timeout=30) as client:
-        last_exc: Optional[Exception] = None
-        for m in models:
-            try:
-                url = f"https://generativelanguage.googleapis.com/v1/models/{m}:generateContent"
-                r = client.post(url, params=params, json=payload)
-                if r.status_code == 404:
-                    continue
-                r.raise_for_status()
-                data = r.json()
-                # Concatenate parts text
-                text = ""
-                for cand in (data.get("candidates") or []):
-                    for part in (cand.get("content", {}).get("parts") or []):
-                        if "text" in part:
-                            text += part["text"]
-                return text or "{}"
-            except Exception as e:
-                last_exc = e
-                continue
-        if last_exc:
-            raise last_exc
-        return "{}"
+    _, data = generate_with_fallbacks(payload, timeout=30)
+    return extract_text(data) or "{}"
 
 
 def analyze_quality_and_price(image_bytes: bytes, mime_type: str, context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
@@ -80,6 +40,10 @@ def analyze_quality_and_price(image_bytes: bytes, mime_type: str, context: Optio
     if not settings.GEMINI_API_KEY:
         raise RuntimeError("gemini_unavailable")
 
+    # Oriented, downscaled, metadata-free copy for both the SDK and REST paths
+    prepared = prepare_for_vision(image_bytes, mime_type)
+    image_bytes, mime_type = prepared.data, prepared.mime_type
+
     # Build prompt
     info = context or {}
     unit = (info.get("unit") or "unit").strip()
@@ -101,21 +65,21 @@ def analyze_quality_and_price(image_bytes: bytes, mime_type: str, context: Optio
     )
 
     # SDK path first
+    genai = sdk()
     if genai is not None:
         try:
-            genai.configure(api_key=settings.GEMINI_API_KEY)
             model = genai.GenerativeModel(settings.GEMINI_MODEL)
             parts = [system_prompt, user_prompt, {
                 "mime_type": mime_type,
                 "data": image_bytes,
             }]
-            resp = model.generate_content(parts)
+            resp = call_sdk(model.generate_content, parts, request_options={"timeout": settings.GEMINI_CALL_BUDGET})
             txt = resp.text or "{}"
             data = _parse_json_strict(txt)
             data["model"] = settings.GEMINI_MODEL
             return data
         except Exception:
-            pass
+            pass  # includes RejectedError: the REST path checks the breaker itself and may find a free slot
 
     # REST path (base64 inline)
     try:
@@ -142,6 +106,24 @@ def diagnose_disease(image_bytes: bytes, mime_type: str, crop: Optional[str] = N
     if not settings.GEMINI_API_KEY:
         raise RuntimeError("gemini_unavailable")
 
+    # Oriented, downscaled, metadata-free copy for both the SDK and REST paths
+    prepared = prepare_for_vision(image_bytes, mime_type)
+
+    # Re-uploads of the same (or a near-identical) photo reuse the earlier diagnosis
+    hashes = image_hashes(prepared.image) if prepared.processed else None
+    if hashes is not None:
+        cached = diagnosis_index.lookup(hashes, crop, language)
+        if cached is not None:
+            return {**cached, "cached": True}
+
+    data = _diagnose_with_gemini(prepared.data, prepared.mime_type, crop, language)
+    # An empty or safety-blocked reply parses to no diagnosis; don't serve that to every look-alike photo
+    if hashes is not None and str(data.get("disease") or "").strip():
+        diagnosis_index.store(hashes, crop, language, data)
+    return data
+
+
+def _diagnose_with_gemini(image_bytes: bytes, mime_type: str, crop: Optional[str], language: Optional[str]) -> Dict[str, Any]:
     # Language mapping for better prompts
     lang_instructions = {
         'hi': 'Write all text content in Hindi language. Use clear, simple Hindi that farmers can understand.',
@@ -163,21 +145,21 @@ def diagnose_disease(image_bytes: bytes, mime_type: str, crop: Optional[str] = N
     )
 
     # SDK path first
+    genai = sdk()
     if genai is not None:
         try:
-            genai.configure(api_key=settings.GEMINI_API_KEY)
             model = genai.GenerativeModel(settings.GEMINI_MODEL)
             parts = [system_prompt, user_prompt, {
                 "mime_type": mime_type,
                 "data": image_bytes,
             }]
-            resp = model.generate_content(parts)
+            resp = call_sdk(model.generate_content, parts, request_options={"timeout": settings.GEMINI_CALL_BUDGET})
             txt = resp.text or "{}"
             data = _parse_json_strict(txt)
             data["model"] = settings.GEMINI_MODEL
             return data
         except Exception:
-            pass
+            pass  # fall back to REST, as above
 
     # REST path (base64 inline image)
     try:
@@ -0,0 +1,203 @@
+"""
+Gemini model resolution shared by the text and image REST paths.
+
+Remembers which model slugs exist (positive and negative TTL caching, seeded
+from the ``models`` listing) and keeps a smoothed error rate per model, so a
+call goes straight to the first healthy model instead of re-walking slugs
+that returned 404 or keep failing.
+"""
+from __future__ import annotations
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from ..config import settings
+from .cache import TTLCache
+from .gemini_client import GeminiHTTPError, gemini_breaker, generate_content, list_models, stream_generate_content
+from .resilience import OPEN, RejectedError
+
+ERROR_RATE_DECAY = 0.8
+UNHEALTHY_ERROR_RATE = 0.5
+
+
+def candidate_models() -> List[str]:
+    """Configured model first, then common fallbacks (deduplicated, in order)."""
+    first = (settings.GEMINI_MODEL or "gemini-2.5-flash").strip()
+    if first.startswith("models/"):
+        first = first.split("/", 1)[1]
+    return list(dict.fromkeys([
+        first,
+        f"{first}-latest",
+        "gemini-2.5-flash",
+        "gemini-2.5-pro",
+        "gemini-2.0-flash",
+        "gemini-2.0-flash-001",
+        "gemini-2.5-flash-lite",
+        "gemini-1.5-flash",
+        "gemini-1.5-pro",
+    ]))
+
+
+class ModelResolver:
+    def __init__(self) -> None:
+        self._availability = TTLCache("gemini_models", ttl_seconds=settings.GEMINI_MODEL_TTL, maxsize=256)
+        self._error_rate: Dict[str, float] = {}
+        self._calls: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+        self._listed_at: Optional[float] = None
+        self._listing = threading.Lock()
+
+    # --- bookkeeping ---
+    def _record(self, model: str, outcome: str, failed: bool) -> None:
+        with self._lock:
+            rate = self._error_rate.get(model, 0.0)
+            self._error_rate[model] = ERROR_RATE_DECAY * rate + (1 - ERROR_RATE_DECAY) * (1.0 if failed else 0.0)
+            counts = self._calls.setdefault(model, {"ok": 0, "error": 0, "not_found": 0})
+            counts[outcome] += 1
+
+    def mark_success(self, model: str) -> None:
+        self._availability.set(model, True)
+        self._record(model, "ok", failed=False)
+
+    def mark_unavailable(self, model: str) -> None:
+        self._availability.set(model, False, ttl_seconds=settings.GEMINI_MODEL_NEGATIVE_TTL)
+        self._record(model, "not_found", failed=False)
+
+    def mark_failure(self, model: str) -> None:
+        self._record(model, "error", failed=True)
+
+    # --- probing ---
+    def _refresh_from_listing(self) -> None:
+        """Seed availability from the models listing, at most once per positive TTL."""
+        if not settings.GEMINI_API_KEY or gemini_breaker.state == OPEN:
+            return
+        if self._listed_at is not None and time.monotonic() - self._listed_at < settings.GEMINI_MODEL_TTL:
+            return
+        if not self._listing.acquire(blocking=False):
+            return
+        try:
+            self._listed_at = time.monotonic()
+            r = list_models("v1", timeout=5)
+            if r.status_code != 200:
+                return
+            listed = {str(m.get("name", "")).split("/", 1)[-1] for m in (r.json().get("models") or [])}
+            if not listed:
+                return
+            for model in candidate_models():
+                if model in listed:
+                    self._availability.set(model, True)
+                else:
+                    self._availability.set(model, False, ttl_seconds=settings.GEMINI_MODEL_NEGATIVE_TTL)
+        except Exception:
+            pass
+        finally:
+            self._listing.release()
+
+    # --- routing ---
+    def ordered(self) -> List[str]:
+        """Candidates to try, best first: known-available healthy models, then unknown ones,
+        then unhealthy ones. Models known to be missing are skipped unless nothing else is left.
+        """
+        self._refresh_from_listing()
+        candidates = candidate_models()
+        ranked: List[Tuple[int, int, str]] = []
+        for pos, model in enumerate(candidates):
+            known = self._availability.get(model)
+            if known is False:
+                continue
+            unhealthy = self._error_rate.get(model, 0.0) >= UNHEALTHY_ERROR_RATE
+            tier = 2 if unhealthy else (0 if known else 1)
+            ranked.append((tier, pos, model))
+        if not ranked:
+            return candidates
+        return [m for _, _, m in sorted(ranked)]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            per_model = {
+                m: {**counts, "error_rate": round(self._error_rate.get(m, 0.0), 3)}
+                for m, counts in self._calls.items()
+            }
+        return {"order": self.ordered(), "models": per_model}
+
+
+model_resolver = ModelResolver()
+
+
+class GeminiUnavailable(RuntimeError):
+    pass
+
+
+def generate_with_fallbacks(payload: Dict[str, Any], timeout: float,
+                            accept: Optional[Callable[[Dict[str, Any]], bool]] = None) -> Tuple[str, Dict[str, Any]]:
+    """Call generateContent on the best available model, falling through the resolver order.
+    Returns (model, response JSON). ``accept`` can reject an empty response to try the next model.
+    Raises GeminiUnavailable when every model fails, the call budget runs out, or the
+    circuit breaker / concurrency limit rejects the call.
+    """
+    last_err: Optional[Exception] = None
+    deadline = time.monotonic() + settings.GEMINI_CALL_BUDGET
+    for m in model_resolver.ordered():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            r = generate_content(m, payload, timeout=min(timeout, remaining))
+            if r.status_code == 404:
+                model_resolver.mark_unavailable(m)
+                continue
+            r.raise_for_status()
+            data = r.json()
+        except RejectedError as e:
+            # Circuit open or too many calls in flight: no point trying other models
+            raise GeminiUnavailable("gemini_unavailable") from e
+        except Exception as e:
+            model_resolver.mark_failure(m)
+            last_err = e
+            continue
+        model_resolver.mark_success(m)
+        if accept is None or accept(data):
+            return m, data
+    raise GeminiUnavailable("gemini_unavailable") from last_err
+
+
+def stream_with_fallbacks(payload: Dict[str, Any], timeout: float) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Stream generateContent chunks as (model, chunk) from the best available model.
+    Falls through the resolver order only until the first chunk arrives; after that a
+    failure propagates, since part of the answer has already been sent.
+    Raises GeminiUnavailable if no model starts streaming.
+    """
+    last_err: Optional[Exception] = None
+    deadline = time.monotonic() + settings.GEMINI_CALL_BUDGET
+    for m in model_resolver.ordered():
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        stream = stream_generate_content(m, payload, timeout=min(timeout, remaining))
+        try:
+            first = next(stream)
+        except StopIteration:
+            model_resolver.mark_failure(m)
+            continue
+        except GeminiHTTPError as e:
+            if e.status_code == 404:
+                model_resolver.mark_unavailable(m)
+            else:
+                model_resolver.mark_failure(m)
+            last_err = e
+            continue
+        except RejectedError as e:
+            raise GeminiUnavailable("gemini_unavailable") from e
+        except Exception as e:
+            model_resolver.mark_failure(m)
+            last_err = e
+            continue
+        model_resolver.mark_success(m)
+        yield m, first
+        try:
+            for chunk in stream:
+                yield m, chunk
+        finally:
+            stream.close()
+        return
+    raise GeminiUnavailable("gemini_unavailable") from last_err
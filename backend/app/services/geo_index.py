@@ -0,0 +1,90 @@
+"""
+State/district proximity index for location-filtered market prices.
+
+Centroids come from the offline gazetteer in ``app/data/india_gazetteer.json``
+and are loaded once per process. Distances are great-circle (haversine) and
+computed with NumPy over the whole table at once; lookups are memoized per
+rounded lat/lon tile so nearby users share the same ranking.
+"""
+from __future__ import annotations
+import json
+import os
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0088
+TILE_DECIMALS = 1  # ~11 km tiles
+
+_GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "india_gazetteer.json")
+
+
+def _haversine_km(lat: float, lon: float, lats: np.ndarray, lons: np.ndarray) -> np.ndarray:
+    """Distance in km from one point to many; all inputs in radians."""
+    dlat = lats - lat
+    dlon = lons - lon
+    a = np.sin(dlat / 2.0) ** 2 + np.cos(lat) * np.cos(lats) * np.sin(dlon / 2.0) ** 2
+    return 2.0 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+class GeoIndex:
+    """Precomputed centroid arrays for states and districts."""
+
+    def __init__(self, path: str = _GAZETTEER_PATH) -> None:
+        with open(path, encoding="utf-8") as fh:
+            data = json.load(fh)
+        states = data.get("states") or []
+        districts = data.get("districts") or []
+
+        self.state_names: List[str] = [s["name"] for s in states]
+        self.state_lat = np.radians(np.array([s["lat"] for s in states], dtype=np.float64))
+        self.state_lon = np.radians(np.array([s["lon"] for s in states], dtype=np.float64))
+
+        self.district_names: List[str] = [d["name"] for d in districts]
+        self.district_states: List[str] = [d["state"] for d in districts]
+        self.district_lat = np.radians(np.array([d["lat"] for d in districts], dtype=np.float64))
+        self.district_lon = np.radians(np.array([d["lon"] for d in districts], dtype=np.float64))
+
+    def nearby_states(self, lat: float, lon: float, radius_km: float = 500, limit: int = 5) -> List[Tuple[str, float]]:
+        dist = _haversine_km(np.radians(lat), np.radians(lon), self.state_lat, self.state_lon)
+        return self._rank(dist, radius_km, limit, lambda i: self.state_names[i])
+
+    def nearby_districts(self, lat: float, lon: float, radius_km: float = 150, limit: int = 10) -> List[Tuple[str, str, float]]:
+        dist = _haversine_km(np.radians(lat), np.radians(lon), self.district_lat, self.district_lon)
+        ranked = self._rank(dist, radius_km, limit, lambda i: i)
+        return [(self.district_names[i], self.district_states[i], km) for i, km in ranked]
+
+    @staticmethod
+    def _rank(dist: np.ndarray, radius_km: float, limit: int, label) -> List[Tuple[Any, float]]:
+        idx = np.flatnonzero(dist <= radius_km)
+        idx = idx[np.argsort(dist[idx], kind="stable")][:limit]
+        return [(label(int(i)), round(float(dist[i]), 1)) for i in idx]
+
+
+@lru_cache(maxsize=1)
+def get_geo_index() -> GeoIndex:
+    return GeoIndex()
+
+
+@lru_cache(maxsize=4096)
+def _nearby_for_tile(tile_lat: float, tile_lon: float, state_radius_km: float, state_limit: int,
+                     district_radius_km: float, district_limit: int) -> Dict[str, Any]:
+    index = get_geo_index()
+    return {
+        "states": tuple(index.nearby_states(tile_lat, tile_lon, state_radius_km, state_limit)),
+        "districts": tuple(index.nearby_districts(tile_lat, tile_lon, district_radius_km, district_limit)),
+    }
+
+
+def nearby_locations(lat: float, lon: float, state_radius_km: float = 500, state_limit: int = 5,
+                     district_radius_km: float = 150, district_limit: int = 10) -> Dict[str, Any]:
+    """Ranked nearby states and districts for a coordinate, cached per tile.
+
+    Returns ``{"states": ((state, km), ...), "districts": ((district, state, km), ...)}``
+    sorted by distance. The dict is shared across callers; do not mutate it.
+    """
+    tile_lat = round(float(lat), TILE_DECIMALS)
+    tile_lon = round(float(lon), TILE_DECIMALS)
+    return _nearby_for_tile(tile_lat, tile_lon, float(state_radius_km), int(state_limit),
+                            float(district_radius_km), int(district_limit))
@@ -0,0 +1,94 @@
+"""
+Request metrics and the scrape-time collectors behind ``GET /metrics``.
+
+Every request is counted by blueprint, endpoint, method and status and timed
+into a per-route latency histogram; an in-flight gauge tracks concurrency.
+Routes are labelled by Flask endpoint name, not URL, so label cardinality
+stays bounded. At scrape time the DB connection pools and the answer caches
+are read directly instead of being mirrored into metrics on every call.
+"""
+from __future__ import annotations
+import time
+from typing import Iterable
+
+from flask import Flask, Response, g, request
+
+from .. import db as db_module
+from .cache import cache_stats
+from .image_hash import diagnosis_index
+from .metrics import Family, counter, gauge, histogram, register_collector, render_prometheus
+from .semantic_cache import chat_cache
+
+http_requests = counter("http_requests_total", "HTTP requests by route and status",
+                        ["blueprint", "endpoint", "method", "status"])
+http_latency = histogram("http_request_duration_seconds", "HTTP request latency by route",
+                         ["blueprint", "endpoint", "method"])
+http_inflight = gauge("http_requests_in_flight", "HTTP requests currently being handled")
+
+
+def _route_labels():
+    return request.blueprint or "", request.endpoint or "unmatched", request.method
+
+
+def _start() -> None:
+    g._metrics_started = time.perf_counter()
+    g._metrics_inflight = True
+    http_inflight.inc()
+
+
+def _record(response):
+    started = g.pop("_metrics_started", None)
+    if started is not None:
+        labels = _route_labels()
+        http_latency.observe(*labels, value=time.perf_counter() - started)
+        http_requests.inc(*labels, str(response.status_code))
+    return response
+
+
+def _end(exc) -> None:
+    # Teardown runs even when a handler raised, so the gauge can't drift
+    if g.pop("_metrics_inflight", False):
+        http_inflight.dec()
+
+
+@register_collector
+def _db_pools() -> Iterable[Family]:
+    engines = [("primary", db_module._engine)] + [(f"replica{i}", r.engine) for i, r in enumerate(db_module._replicas)]
+    checked_out, size = [], []
+    for target, engine in engines:
+        pool = getattr(engine, "pool", None)
+        if pool is None or not hasattr(pool, "checkedout"):
+            continue
+        checked_out.append(({"target": target}, pool.checkedout()))
+        if hasattr(pool, "size"):
+            size.append(({"target": target}, pool.size()))
+    yield "db_pool_checked_out_connections", "gauge", "Connections currently checked out of the pool", checked_out
+    yield "db_pool_size", "gauge", "Configured persistent pool size", size
+
+
+@register_collector
+def _caches() -> Iterable[Family]:
+    lookups, entries, ratios = [], [], []
+    for name, s in cache_stats().items():
+        lookups += [({"cache": name, "result": "hit"}, s["hits"]), ({"cache": name, "result": "miss"}, s["misses"])]
+        entries.append(({"cache": name}, s["size"]))
+        ratios.append(({"cache": name}, s["hit_ratio"]))
+    for lang, s in chat_cache.stats()["languages"].items():
+        entries.append(({"cache": f"semantic_chat_{lang}"}, s["size"]))
+        ratios.append(({"cache": f"semantic_chat_{lang}"}, s.get("hit_ratio")))
+    d = diagnosis_index.stats()
+    entries.append(({"cache": "diagnosis_dedupe"}, d["entries"]))
+    ratios.append(({"cache": "diagnosis_dedupe"}, d["hit_ratio"]))
+    yield "cache_lookups_total", "counter", "TTL cache lookups by cache and result", lookups
+    yield "cache_entries", "gauge", "Entries currently held by each cache", entries
+    yield "cache_hit_ratio", "gauge", "Hit ratio since process start", ratios
+
+
+def metrics_response() -> Response:
+    return Response(render_prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+def init_app(app: Flask) -> None:
+    app.before_request(_start)
+    app.after_request(_record)
+    app.teardown_request(_end)
@@ -0,0 +1,129 @@
+"""
+Perceptual hashes and a near-duplicate index for disease diagnoses.
+
+Farmers often re-upload the same leaf photo (or a re-shot, re-compressed
+copy). Each preprocessed image gets a 64-bit pHash (DCT of a 32x32 grey
+thumbnail) and a 64-bit dHash (horizontal gradients of a 9x8 thumbnail);
+a stored diagnosis is reused when both are within a small Hamming distance
+of the new image and the crop and language match.
+"""
+from __future__ import annotations
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+
+from ..config import settings
+from .metrics import counter
+
+try:
+    from PIL import Image
+except Exception:
+    Image = None  # type: ignore
+
+lookups = counter("diagnosis_dedupe_lookups_total", "Disease diagnosis near-duplicate lookups", ["result"])
+
+
+def _dct_matrix(n: int) -> np.ndarray:
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    m = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2.0 / n)
+    m[0] /= np.sqrt(2.0)
+    return m
+
+
+_DCT32 = _dct_matrix(32)
+
+
+def _bits_to_int(bits: np.ndarray) -> int:
+    return int("".join("1" if b else "0" for b in bits.ravel()), 2)
+
+
+def phash(img: "Image.Image") -> int:
+    grey = np.asarray(img.convert("L").resize((32, 32), Image.LANCZOS), dtype=np.float64)
+    coeffs = (_DCT32 @ grey @ _DCT32.T)[:8, :8]
+    low = coeffs.ravel()[1:]  # skip DC, it only encodes overall brightness
+    return _bits_to_int(coeffs > np.median(low))
+
+
+def dhash(img: "Image.Image") -> int:
+    grey = np.asarray(img.convert("L").resize((9, 8), Image.LANCZOS), dtype=np.int16)
+    return _bits_to_int(grey[:, 1:] > grey[:, :-1])
+
+
+def image_hashes(img: "Image.Image") -> Tuple[int, int]:
+    return phash(img), dhash(img)
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+class DiagnosisIndex:
+    """Recent diagnoses per (crop, language), bounded LRU with a TTL."""
+
+    def __init__(self, max_per_key: int, ttl_seconds: float, max_distance: int) -> None:
+        self.max_per_key = max_per_key
+        self.ttl_seconds = ttl_seconds
+        self.max_distance = max_distance
+        # (crop, language) -> {entry id: (expires_at, phash, dhash, result)}
+        self._buckets: Dict[Tuple[str, str], "OrderedDict[int, tuple]"] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(crop: Optional[str], language: Optional[str]) -> Tuple[str, str]:
+        return ((crop or "").strip().lower(), (language or "en").strip().lower())
+
+    def lookup(self, hashes: Tuple[int, int], crop: Optional[str], language: Optional[str]) -> Optional[Dict[str, Any]]:
+        ph, dh = hashes
+        now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(self._key(crop, language))
+            best: Optional[Tuple[int, int]] = None
+            if bucket:
+                for entry_id, (expires_at, eph, edh, _) in list(bucket.items()):
+                    if expires_at <= now:
+                        del bucket[entry_id]
+                        continue
+                    dp, dd = hamming(ph, eph), hamming(dh, edh)
+                    if dp <= self.max_distance and dd <= self.max_distance and (best is None or dp + dd < best[0]):
+                        best = (dp + dd, entry_id)
+            if best is None:
+                lookups.inc("miss")
+                return None
+            bucket.move_to_end(best[1])
+            lookups.inc("hit")
+            return bucket[best[1]][3]
+
+    def store(self, hashes: Tuple[int, int], crop: Optional[str], language: Optional[str], result: Dict[str, Any]) -> None:
+        with self._lock:
+            bucket = self._buckets.setdefault(self._key(crop, language), OrderedDict())
+            self._next_id += 1
+            bucket[self._next_id] = (time.monotonic() + self.ttl_seconds, hashes[0], hashes[1], result)
+            while len(bucket) > self.max_per_key:
+                bucket.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        counts = {result: value for (result,), value in lookups.samples()}
+        total = counts.get("hit", 0) + counts.get("miss", 0)
+        with self._lock:
+            size = sum(len(b) for b in self._buckets.values())
+            keys = len(self._buckets)
+        return {
+            "entries": size,
+            "crop_language_keys": keys,
+            "max_distance": self.max_distance,
+            "hits": counts.get("hit", 0),
+            "misses": counts.get("miss", 0),
+            "hit_ratio": round(counts.get("hit", 0) / total, 4) if total else None,
+        }
+
+
+diagnosis_index = DiagnosisIndex(
+    max_per_key=settings.DIAGNOSIS_CACHE_SIZE,
+    ttl_seconds=settings.DIAGNOSIS_CACHE_TTL,
+    max_distance=settings.DIAGNOSIS_HASH_MAX_DISTANCE,
+)
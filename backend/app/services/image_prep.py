@@ -0,0 +1,89 @@
+"""
+Image preprocessing before Gemini vision calls.
+
+Phone photos arrive at 12+ MP with EXIF (including GPS). The vision model
+downsamples anyway, so uploads are EXIF-oriented, shrunk to
+``VISION_MAX_EDGE`` pixels on the long edge and re-encoded without metadata
+before being sent, which cuts the (base64-inflated) request body by one to
+two orders of magnitude. Without Pillow, or for bytes it can't decode, the
+original image is passed through unchanged.
+"""
+from __future__ import annotations
+import io
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from ..config import settings
+from .metrics import counter, histogram
+
+try:
+    from PIL import Image, ImageOps
+except Exception:
+    Image = None  # type: ignore
+    ImageOps = None  # type: ignore
+
+_FORMATS = {"JPEG": "image/jpeg", "WEBP": "image/webp"}
+
+image_bytes_total = counter("vision_image_bytes_total", "Vision image bytes before and after preprocessing", ["stage"])
+prep_duration = histogram("vision_image_prep_seconds", "Time spent decoding/resizing/encoding vision images")
+
+
+@dataclass(frozen=True)
+class PreparedImage:
+    data: bytes
+    mime_type: str
+    original_bytes: int
+    width: Optional[int] = None
+    height: Optional[int] = None
+    image: Optional["Image.Image"] = None  # decoded, oriented and resized; None when passed through
+
+    @property
+    def processed(self) -> bool:
+        return self.image is not None
+
+
+def _to_rgb(img: "Image.Image") -> "Image.Image":
+    if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
+        rgba = img.convert("RGBA")
+        background = Image.new("RGB", rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        return background
+    return img.convert("RGB") if img.mode != "RGB" else img
+
+
+def prepare_for_vision(image_bytes: bytes, mime_type: str, max_edge: Optional[int] = None,
+                       quality: Optional[int] = None, fmt: Optional[str] = None) -> PreparedImage:
+    """Orient, downscale and re-encode an upload for a vision model; never raises."""
+    max_edge = max_edge or settings.VISION_MAX_EDGE
+    quality = quality or settings.VISION_IMAGE_QUALITY
+    fmt = (fmt or settings.VISION_IMAGE_FORMAT).upper()
+    if fmt not in _FORMATS:
+        fmt = "JPEG"
+    original = len(image_bytes)
+    image_bytes_total.inc("original", amount=original)
+    if Image is None or not image_bytes:
+        image_bytes_total.inc("sent", amount=original)
+        return PreparedImage(image_bytes, mime_type, original)
+
+    started = time.perf_counter()
+    try:
+        img = Image.open(io.BytesIO(image_bytes))
+        # JPEG only: let the decoder skip detail we'd throw away (DCT scaling)
+        img.draft("RGB", (max_edge, max_edge))
+        img = ImageOps.exif_transpose(img)
+        img = _to_rgb(img)
+        if max(img.size) > max_edge:
+            img.thumbnail((max_edge, max_edge), Image.LANCZOS)
+        out = io.BytesIO()
+        # No exif/icc passed on save, so metadata is dropped
+        img.save(out, format=fmt, quality=quality, optimize=True)
+        data = out.getvalue()
+    except Exception:
+        image_bytes_total.inc("sent", amount=original)
+        return PreparedImage(image_bytes, mime_type, original)
+    finally:
+        prep_duration.observe(value=time.perf_counter() - started)
+
+    image_bytes_total.inc("sent", amount=len(data))
+    return PreparedImage(data, _FORMATS[fmt], original, img.width, img.height, img)
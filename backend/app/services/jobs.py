@@ -0,0 +1,211 @@
+"""
+Background job runner for slow inference (vision diagnosis, listing analysis).
+
+Routes submit a job and answer 202 with its id; a fixed pool of worker
+threads runs it and records status, result and timing in ``inference_jobs``
+so any worker process can serve ``GET /api/v1/jobs/<id>``. The queue is
+bounded: when it is full ``submit`` raises ``JobQueueFull`` and the route
+answers 429 instead of piling up work it can't finish.
+
+Uploaded bytes are held in memory only, so a job still unfinished after
+``JOB_STALE_SECONDS`` (e.g. lost to a restart) is reported as failed.
+"""
+from __future__ import annotations
+import logging
+import queue
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from sqlalchemy import update
+
+from ..config import settings
+from ..db import new_session
+from ..models import InferenceJob
+from .metrics import counter, gauge, histogram
+
+log = logging.getLogger(__name__)
+
+Handler = Callable[[bytes, Dict[str, Any]], Dict[str, Any]]
+
+job_events = counter("inference_jobs_total", "Background inference jobs by kind and outcome", ["kind", "outcome"])
+queue_depth = gauge("inference_job_queue_depth", "Jobs waiting for a worker")
+job_wait = histogram("inference_job_queue_seconds", "Time jobs spend queued", ["kind"])
+job_run = histogram("inference_job_run_seconds", "Time jobs spend running", ["kind"])
+
+FINISHED = ("succeeded", "failed")
+
+
+class JobQueueFull(RuntimeError):
+    pass
+
+
+class JobFailed(RuntimeError):
+    """Raised by handlers to fail a job with a result payload (e.g. a rules-based fallback)."""
+
+    def __init__(self, error: str, result: Optional[Dict[str, Any]] = None) -> None:
+        super().__init__(error)
+        self.result = result
+
+
+def job_to_dict(job: InferenceJob) -> Dict[str, Any]:
+    return {
+        "id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "result": job.result,
+        "error": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "finished_at": job.finished_at.isoformat() if job.finished_at else None,
+        "queue_seconds": job.queue_seconds,
+        "run_seconds": job.run_seconds,
+    }
+
+
+class JobRunner:
+    def __init__(self, workers: int, max_queue: int) -> None:
+        self.workers = workers
+        self.max_queue = max_queue
+        self._queue: "queue.Queue[Tuple[str, str, bytes, Dict[str, Any], float]]" = queue.Queue(maxsize=max_queue)
+        self._handlers: Dict[str, Handler] = {}
+        self._threads: list = []
+        self._started = False
+        self._lock = threading.Lock()
+        self._done: Dict[str, threading.Event] = {}
+
+    def register(self, kind: str, handler: Handler) -> None:
+        self._handlers[kind] = handler
+
+    def _ensure_started(self) -> None:
+        if self._started:
+            return
+        with self._lock:
+            if self._started:
+                return
+            for i in range(self.workers):
+                t = threading.Thread(target=self._work, name=f"inference-job-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
+            self._started = True
+
+    def submit(self, kind: str, blob: bytes, params: Dict[str, Any], user_id: Optional[str] = None) -> InferenceJob:
+        """Persist a queued job and hand it to the pool. Raises JobQueueFull when at capacity."""
+        if kind not in self._handlers:
+            raise KeyError(kind)
+        self._ensure_started()
+        if self._queue.full():
+            job_events.inc(kind, "rejected")
+            raise JobQueueFull(kind)
+        job = InferenceJob(id=uuid.uuid4().hex, kind=kind, status="queued", user_id=user_id, params=params,
+                           created_at=datetime.utcnow())
+        with new_session() as db:
+            db.add(job)
+            db.commit()
+            db.refresh(job)
+            db.expunge(job)
+        self._done[job.id] = threading.Event()
+        try:
+            self._queue.put_nowait((job.id, kind, blob, params, time.monotonic()))
+        except queue.Full:
+            self._finish(job.id, kind, "failed", error="queue_full")
+            job_events.inc(kind, "rejected")
+            raise JobQueueFull(kind)
+        queue_depth.set(value=self._queue.qsize())
+        job_events.inc(kind, "submitted")
+        return job
+
+    def _finish(self, job_id: str, kind: str, status: str, result: Optional[Dict[str, Any]] = None,
+                error: Optional[str] = None, **timing: Any) -> None:
+        # Conditional: get() may already have reported the job as interrupted, and that answer stands
+        with new_session() as db:
+            updated = db.execute(
+                update(InferenceJob)
+                .where(InferenceJob.id == job_id, InferenceJob.status.notin_(FINISHED))
+                .values(status=status, result=result, error=error, finished_at=datetime.utcnow(), **timing)
+            ).rowcount
+            db.commit()
+        if updated:
+            job_events.inc(kind, status)
+        else:
+            log.warning("%s job %s finished as %s after it was already marked finished; result dropped",
+                        kind, job_id, status)
+        event = self._done.pop(job_id, None)
+        if event is not None:
+            event.set()
+
+    def _work(self) -> None:
+        while True:
+            job_id, kind, blob, params, enqueued = self._queue.get()
+            queue_depth.set(value=self._queue.qsize())
+            waited = time.monotonic() - enqueued
+            job_wait.observe(kind, value=waited)
+            try:
+                with new_session() as db:
+                    claimed = db.execute(
+                        update(InferenceJob).where(InferenceJob.id == job_id, InferenceJob.status == "queued")
+                        .values(status="running", started_at=datetime.utcnow(), queue_seconds=round(waited, 3))
+                    ).rowcount
+                    db.commit()
+                if not claimed:
+                    log.warning("%s job %s was marked finished while queued; skipping it", kind, job_id)
+                    event = self._done.pop(job_id, None)
+                    if event is not None:
+                        event.set()
+                    continue
+                started = time.monotonic()
+                status, result, error = "succeeded", None, None
+                try:
+                    result = self._handlers[kind](blob, params)
+                except JobFailed as e:
+                    status, result, error = "failed", e.result, str(e)[:255]
+                except Exception as e:
+                    status, error = "failed", (str(e) or type(e).__name__)[:255]
+                ran = time.monotonic() - started
+                job_run.observe(kind, value=ran)
+                self._finish(job_id, kind, status, result=result, error=error, run_seconds=round(ran, 3))
+            except Exception:
+                # Bookkeeping failed (e.g. DB down); don't let the worker thread die
+                self._done.pop(job_id, None)
+            finally:
+                self._queue.task_done()
+
+    def get(self, job_id: str) -> Optional[InferenceJob]:
+        # Own short-lived session so repeated polls from one request see fresh rows
+        with new_session() as db:
+            job = db.get(InferenceJob, job_id)
+            if job is None:
+                return None
+            if job.status not in FINISHED and \
+                    (datetime.utcnow() - job.created_at).total_seconds() > settings.JOB_STALE_SECONDS:
+                job.status, job.error, job.finished_at = "failed", "interrupted", datetime.utcnow()
+                db.commit()
+                db.refresh(job)
+            db.expunge(job)
+            return job
+
+    def wait(self, job_id: str, timeout: float) -> bool:
+        """Block until a job submitted by this process finishes, or for ``timeout`` seconds.
+
+        Returns False on timeout. A job this process doesn't hold (run by another worker,
+        or submitted before a restart) has no event to wait on, so this just sleeps for
+        ``timeout``; callers polling the DB in a loop then poll at that interval.
+        """
+        event = self._done.get(job_id)
+        if event is None:
+            time.sleep(timeout)
+            return False
+        return event.wait(timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.workers,
+            "queue_depth": self._queue.qsize(),
+            "queue_max": self.max_queue,
+            "workers_alive": sum(1 for t in self._threads if t.is_alive()),
+        }
+
+
+job_runner = JobRunner(workers=settings.JOB_WORKERS, max_queue=settings.JOB_QUEUE_MAX)
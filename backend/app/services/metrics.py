@@ -0,0 +1,215 @@
+"""
+Minimal in-process metrics: labeled counters, gauges and histograms.
+
+Metrics register themselves by name on creation; calling ``counter``/``gauge``/``histogram``
+again with the same name returns the existing metric, so modules can declare
+what they record at import time without coordinating. Values that already
+live elsewhere (cache hit counts, pool sizes) are read at scrape time by
+collectors. ``render_prometheus`` writes everything in the Prometheus text
+exposition format.
+"""
+from __future__ import annotations
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0)
+
+_REGISTRY: Dict[str, "_Metric"] = {}
+_registry_lock = threading.Lock()
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()) -> None:
+        self.name = name
+        self.help = help_text
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Sequence[str]) -> Tuple[str, ...]:
+        if len(labels) != len(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}")
+        return tuple(str(v) for v in labels)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> List[Tuple[Tuple[str, ...], float]]:
+        with self._lock:
+            return list(self._values.items())
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def set(self, *labels: str, value: float) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        super().__init__(name, help_text, label_names)
+        self.buckets = tuple(sorted(buckets))
+        # per label set: [bucket counts..., +Inf count], sum
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+
+    def observe(self, *labels: str, value: float) -> None:
+        key = self._key(labels)
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = ([0] * (len(self.buckets) + 1), [0.0])
+                self._series[key] = series
+            series[0][idx] += 1
+            series[1][0] += value
+
+    def samples(self) -> List[Tuple[Tuple[str, ...], Dict[str, object]]]:
+        """Per label set: cumulative bucket counts keyed by upper bound, count and sum."""
+        out = []
+        with self._lock:
+            for key, (counts, total) in self._series.items():
+                cumulative, running = [], 0
+                for bound, c in zip(self.buckets + (float("inf"),), counts):
+                    running += c
+                    cumulative.append((bound, running))
+                out.append((key, {"buckets": cumulative, "count": running, "sum": total[0]}))
+        return out
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Compact JSON-friendly view: count, mean and approximate p50/p95 per label set.
+
+        A quantile past the last bucket is reported as the string ``">{last bound}"``;
+        ``inf`` has no JSON spelling.
+        """
+        result = {}
+        overflow = f">{self.buckets[-1]}"
+        for key, data in self.samples():
+            count = data["count"]
+            entry: Dict[str, Any] = {"count": count, "mean": round(data["sum"] / count, 4) if count else None}
+            for q in (0.5, 0.95):
+                target = q * count
+                bound = next((b for b, c in data["buckets"] if c >= target), None) if count else None
+                entry[f"p{int(q * 100)}"] = overflow if bound == float("inf") else bound
+            result["|".join(key) or "all"] = entry
+        return result
+
+
+def _get_or_create(cls, name: str, *args, **kwargs):
+    with _registry_lock:
+        metric = _REGISTRY.get(name)
+        if metric is None:
+            metric = cls(name, *args, **kwargs)
+            _REGISTRY[name] = metric
+        return metric
+
+
+def counter(name: str, help_text: str, label_names: Sequence[str] = ()) -> Counter:
+    return _get_or_create(Counter, name, help_text, label_names)
+
+
+def gauge(name: str, help_text: str, label_names: Sequence[str] = ()) -> Gauge:
+    return _get_or_create(Gauge, name, help_text, label_names)
+
+
+def histogram(name: str, help_text: str, label_names: Sequence[str] = (),
+              buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+    return _get_or_create(Histogram, name, help_text, label_names, buckets=buckets)
+
+
+def all_metrics() -> List[_Metric]:
+    with _registry_lock:
+        return list(_REGISTRY.values())
+
+
+# (name, type, help, [(labels, value), ...]) families produced at scrape time
+Family = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+_COLLECTORS: List[Callable[[], Iterable[Family]]] = []
+
+
+def register_collector(fn: Callable[[], Iterable[Family]]) -> Callable[[], Iterable[Family]]:
+    _COLLECTORS.append(fn)
+    return fn
+
+
+upstream_latency = histogram("upstream_request_duration_seconds", "Outbound API call latency by upstream and outcome",
+                             ["upstream", "outcome"])
+
+
+@contextmanager
+def track_upstream(upstream: str) -> Iterator[None]:
+    """Time an outbound call; raising inside the block records it as an error."""
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        upstream_latency.observe(upstream, outcome, value=time.perf_counter() - started)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(pairs: Iterable[Tuple[str, str]]) -> str:
+    body = ",".join(f'{k}="{_escape(str(v))}"' for k, v in pairs)
+    return "{" + body + "}" if body else ""
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def render_prometheus() -> str:
+    lines: List[str] = []
+
+    def header(name: str, kind: str, help_text: str) -> None:
+        lines.append(f"# HELP {name} " + help_text.replace("\\", "\\\\").replace("\n", "\\n"))
+        lines.append(f"# TYPE {name} {kind}")
+
+    for metric in sorted(all_metrics(), key=lambda m: m.name):
+        header(metric.name, metric.kind, metric.help)
+        if isinstance(metric, Histogram):
+            for key, data in metric.samples():
+                pairs = list(zip(metric.label_names, key))
+                for bound, count in data["buckets"]:
+                    lines.append(f"{metric.name}_bucket{_labels(pairs + [('le', _number(bound))])} {count}")
+                lines.append(f"{metric.name}_sum{_labels(pairs)} {_number(data['sum'])}")
+                lines.append(f"{metric.name}_count{_labels(pairs)} {data['count']}")
+        else:
+            for key, value in metric.samples():
+                lines.append(f"{metric.name}{_labels(zip(metric.label_names, key))} {_number(value)}")
+
+    for collect in _COLLECTORS:
+        for name, kind, help_text, samples in collect():
+            header(name, kind, help_text)
+            for labels, value in samples:
+                if value is not None:
+                    lines.append(f"{name}{_labels(labels.items())} {_number(value)}")
+    return "\n".join(lines) + "\n"
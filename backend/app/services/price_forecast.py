@@ -0,0 +1,246 @@
+"""
+CPU-only mandi price forecasting.
+
+Daily modal prices from ``market_price_rollups`` are arranged as a
+(series x days) matrix at three granularities (market, state, all-India per
+commodity). A damped-trend Holt model is fitted to every series at once by
+grid search over smoothing parameters, and a 30-day forecast path is stored
+per series, so serving a forecast is a dictionary lookup.
+"""
+from __future__ import annotations
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from ..models import MarketPriceRollup
+
+log = logging.getLogger(__name__)
+
+MAX_HORIZON = 30
+HISTORY_DAYS = 180
+RETRAIN_AFTER_SECONDS = 6 * 3600
+
+PHI = 0.9
+_ALPHAS = np.array([0.1, 0.2, 0.3, 0.5, 0.7, 0.9])
+_BETAS = np.array([0.0, 0.05, 0.1, 0.2])
+_GRID_ALPHA, _GRID_BETA = (g.ravel() for g in np.meshgrid(_ALPHAS, _BETAS, indexing="ij"))
+_PHI_CUMSUM = np.cumsum(PHI ** np.arange(1, MAX_HORIZON + 1))
+_SQRT_H = np.sqrt(np.arange(1, MAX_HORIZON + 1))
+
+SeriesKey = Tuple[str, str, str]  # (commodity, state, market); "" = aggregated
+
+
+@dataclass(frozen=True)
+class SeriesFit:
+    last_observed: date
+    last_value: float
+    alpha: float
+    beta: float
+    sigma: float
+    observations: int
+    path: Tuple[float, ...]  # MAX_HORIZON point forecasts
+
+
+def _norm(value: Optional[str]) -> str:
+    return (value or "").strip().lower()
+
+
+def _forward_fill(y: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Fill NaN gaps row-wise with the last observation; leading gaps take the first one.
+    Returns the filled matrix and a mask of cells at or after each series' first observation.
+    """
+    observed = ~np.isnan(y)
+    cols = np.arange(y.shape[1])
+    last_idx = np.maximum.accumulate(np.where(observed, cols, -1), axis=1)
+    first_idx = np.argmax(observed, axis=1)
+    started = cols[None, :] >= first_idx[:, None]
+    fill_idx = np.where(last_idx >= 0, last_idx, first_idx[:, None])
+    return np.take_along_axis(y, fill_idx, axis=1), started
+
+
+def fit_damped_holt(y: np.ndarray) -> Dict[str, np.ndarray]:
+    """Fit damped Holt smoothing to each row of ``y`` (series x time, NaN = missing).
+    All series and all grid points are updated together per time step.
+    """
+    filled, started = _forward_fill(y)
+    observed = ~np.isnan(y)
+    n_series, n_steps = filled.shape
+    n_grid = _GRID_ALPHA.size
+
+    level = np.repeat(filled[:, :1], n_grid, axis=1)
+    trend = np.zeros((n_series, n_grid))
+    sse = np.zeros((n_series, n_grid))
+    for t in range(1, n_steps):
+        pred = level + PHI * trend
+        err = filled[:, t:t + 1] - pred
+        sse += np.where(observed[:, t:t + 1] & started[:, t:t + 1], err * err, 0.0)
+        level = pred + _GRID_ALPHA * err
+        trend = PHI * trend + _GRID_ALPHA * _GRID_BETA * err
+
+    best = np.argmin(sse, axis=1)
+    rows = np.arange(n_series)
+    n_obs = observed.sum(axis=1)
+    return {
+        "alpha": _GRID_ALPHA[best],
+        "beta": _GRID_BETA[best],
+        "level": level[rows, best],
+        "trend": trend[rows, best],
+        "sigma": np.sqrt(sse[rows, best] / np.maximum(n_obs - 1, 1)),
+        "observations": n_obs,
+        "last_value": filled[:, -1],
+    }
+
+
+class PriceForecaster:
+    """Holds fitted parameters for every commodity series; retrains in batch when stale."""
+
+    def __init__(self) -> None:
+        self._fits: Dict[SeriesKey, SeriesFit] = {}
+        self._trained_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def trained_at(self) -> Optional[float]:
+        return self._trained_at
+
+    def is_stale(self) -> bool:
+        return self._trained_at is None or time.time() - self._trained_at > RETRAIN_AFTER_SECONDS
+
+    def train(self, session: Session, history_days: int = HISTORY_DAYS, today: Optional[date] = None,
+              wait: bool = False) -> int:
+        """Refit all series from daily rollups. Returns the number of fitted series.
+
+        If another thread is already training, returns at once with the current fits,
+        or with ``wait=True`` blocks until that run finishes and returns its result.
+        """
+        if not self._lock.acquire(blocking=wait):
+            return len(self._fits)  # another thread is already training
+        if wait and not self.is_stale():
+            self._lock.release()  # the run we waited for produced fresh fits
+            return len(self._fits)
+        try:
+            end = today or date.today()
+            start = end - timedelta(days=history_days - 1)
+            rows = session.query(
+                MarketPriceRollup.commodity, MarketPriceRollup.state, MarketPriceRollup.market,
+                MarketPriceRollup.bucket_start, MarketPriceRollup.modal_sum, MarketPriceRollup.samples,
+            ).filter(
+                MarketPriceRollup.bucket == "day",
+                MarketPriceRollup.bucket_start >= start,
+                MarketPriceRollup.bucket_start <= end,
+            ).all()
+
+            sums: Dict[SeriesKey, Dict[int, List[float]]] = {}
+            for commodity, state, market, day, modal_sum, samples in rows:
+                if not samples:
+                    continue
+                col = (day - start).days
+                for key in ((commodity, state, _norm(market)), (commodity, state, ""), (commodity, "", "")):
+                    acc = sums.setdefault(key, {}).setdefault(col, [0.0, 0])
+                    acc[0] += modal_sum
+                    acc[1] += samples
+
+            fits: Dict[SeriesKey, SeriesFit] = {}
+            if sums:
+                keys = list(sums)
+                y = np.full((len(keys), history_days), np.nan)
+                for i, key in enumerate(keys):
+                    for col, (total, count) in sums[key].items():
+                        y[i, col] = total / count
+                last_col = np.where(~np.isnan(y), np.arange(history_days), -1).max(axis=1)
+                params = fit_damped_holt(y)
+                paths = params["level"][:, None] + params["trend"][:, None] * _PHI_CUMSUM[None, :]
+                for i, key in enumerate(keys):
+                    fits[key] = SeriesFit(
+                        last_observed=start + timedelta(days=int(last_col[i])),
+                        last_value=float(params["last_value"][i]),
+                        alpha=float(params["alpha"][i]),
+                        beta=float(params["beta"][i]),
+                        sigma=float(params["sigma"][i]),
+                        observations=int(params["observations"][i]),
+                        path=tuple(float(v) for v in paths[i]),
+                    )
+            if fits:
+                # An empty result (no rollups yet) keeps the model stale so the next call retries
+                self._fits = fits
+                self._trained_at = time.time()
+            return len(fits)
+        finally:
+            self._lock.release()
+
+    def ensure_fresh(self) -> None:
+        """Keep serving the current fits while a background thread refits stale ones.
+
+        A process with no fits yet trains inline; concurrent first callers wait for
+        that run instead of seeing an empty model.
+        """
+        if not self.is_stale():
+            return
+        if self._trained_at is None:
+            self._train_with_own_session(wait=True)
+        elif not self._lock.locked():
+            threading.Thread(target=self._train_with_own_session, name="price-forecast-train", daemon=True).start()
+
+    def _train_with_own_session(self, wait: bool = False) -> None:
+        from ..db import new_session
+        session = new_session()
+        try:
+            self.train(session, wait=wait)
+        except Exception:
+            log.exception("price forecast training failed")
+        finally:
+            session.close()
+
+    def forecast(self, commodity: str, state: Optional[str] = None, market: Optional[str] = None,
+                 horizon: int = 7) -> Optional[Dict[str, Any]]:
+        """Forecast for the most specific series available, or None if there is no history.
+
+        Falls back from the market to its state and then to all-India; ``level`` in the
+        result says which series answered.
+        """
+        horizon = max(1, min(int(horizon), MAX_HORIZON))
+        commodity, state, market = _norm(commodity), _norm(state), _norm(market)
+        candidates = [("all_india", "", "")]
+        if state:
+            candidates.insert(0, ("state", state, ""))
+            if market:
+                candidates.insert(0, ("market", state, market))
+        for level, key_state, key_market in candidates:
+            fit = self._fits.get((commodity, key_state, key_market))
+            if fit is not None:
+                break
+        else:
+            return None
+        band = 1.96 * fit.sigma * _SQRT_H[:horizon]
+        points = []
+        for h in range(horizon):
+            price = max(fit.path[h], 0.0)
+            points.append({
+                "date": (fit.last_observed + timedelta(days=h + 1)).isoformat(),
+                "price": round(price, 2),
+                "lower": round(max(price - band[h], 0.0), 2),
+                "upper": round(price + band[h], 2),
+            })
+        return {
+            "commodity": commodity,
+            "state": key_state or None,
+            "market": key_market or None,
+            "level": level,
+            "unit": "quintal",
+            "method": "damped_holt",
+            "params": {"alpha": fit.alpha, "beta": fit.beta, "phi": PHI},
+            "observations": fit.observations,
+            "last_observed": fit.last_observed.isoformat(),
+            "current_price": round(fit.last_value, 2),
+            "horizon_days": horizon,
+            "forecast": points,
+        }
+
+
+price_forecaster = PriceForecaster()
@@ -0,0 +1,310 @@
+"""
+Mandi price history: snapshot ingestion and day/week rollups.
+
+Every fetch of the live mandi feed is recorded into ``market_prices`` (deduped
+per commodity/market/day/source) and folded into ``market_price_rollups`` so
+history queries only ever touch one row per bucket and market.
+
+Requests hand their rows to ``snapshot_writer``, which drops rows this process
+has already recorded and writes the rest on a background thread. Rollups are
+merged with an upsert, so concurrent writers never race on
+``uq_market_price_rollup``.
+"""
+from __future__ import annotations
+import logging
+import queue
+import threading
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..models import MarketPrice, MarketPriceRollup
+
+log = logging.getLogger(__name__)
+
+BUCKETS = ("day", "week")
+ROLLUP_KEY = ("bucket", "commodity", "state", "market", "bucket_start")
+UPSERT_CHUNK = 500
+
+_DATE_FORMATS = ("%d/%m/%Y", "%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%d-%m-%Y")
+
+
+def parse_arrival_date(value: Any) -> Optional[date]:
+    raw = str(value or "").strip()
+    if not raw:
+        return None
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(raw, fmt).date()
+        except ValueError:
+            continue
+    try:
+        return datetime.fromisoformat(raw.replace("Z", "+00:00")).date()
+    except ValueError:
+        return None
+
+
+def bucket_start(day: date, bucket: str) -> date:
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    return day
+
+
+def _norm(value: Any) -> str:
+    return str(value or "").strip().lower()
+
+
+def _snapshot_rows(records: Iterable[Tuple[Dict[str, Any], str]]) -> List[MarketPrice]:
+    rows: Dict[Tuple, MarketPrice] = {}
+    today = date.today()
+    for record, source in records:
+        commodity = (record.get("commodity") or "").strip()
+        try:
+            modal = float(record.get("modal_price") or 0)
+            low = float(record.get("min_price") or 0) or modal
+            high = float(record.get("max_price") or 0) or modal
+        except (TypeError, ValueError):
+            continue
+        if not commodity or modal <= 0:
+            continue
+        day = parse_arrival_date(record.get("arrival_date")) or today
+        state = (record.get("state") or "").strip()
+        market = (record.get("market") or "").strip()
+        key = (_norm(commodity), _norm(state), _norm(market), day, source)
+        if key in rows:
+            continue
+        rows[key] = MarketPrice(
+            commodity=commodity,
+            category="mandi",
+            region=", ".join(p for p in [market, state] if p)[:100] or "unknown",
+            min_price=low,
+            max_price=high,
+            avg_price=modal,
+            source=source,
+            state=state or None,
+            district=(record.get("district") or "").strip() or None,
+            market=market or None,
+            arrival_date=day,
+        )
+    return list(rows.values())
+
+
+def _row_key(row: MarketPrice) -> Tuple:
+    return (_norm(row.commodity), _norm(row.state), _norm(row.market), row.arrival_date, row.source)
+
+
+def _rollup_deltas(rows: List[MarketPrice]) -> Dict[Tuple, List[float]]:
+    """Per rollup key: [min, max, modal_sum, samples] contributed by ``rows``."""
+    deltas: Dict[Tuple, List[float]] = {}
+    for bucket in BUCKETS:
+        for r in rows:
+            key = (bucket, _norm(r.commodity), _norm(r.state), _norm(r.market), bucket_start(r.arrival_date, bucket))
+            delta = deltas.get(key)
+            if delta is None:
+                deltas[key] = [r.min_price, r.max_price, r.avg_price, 1]
+            else:
+                delta[0] = min(delta[0], r.min_price)
+                delta[1] = max(delta[1], r.max_price)
+                delta[2] += r.avg_price
+                delta[3] += 1
+    return deltas
+
+
+def _upsert_statement(dialect: str, values: List[Dict[str, Any]]):
+    table = MarketPriceRollup.__table__
+    now = datetime.utcnow()
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+        stmt = insert(table).values(values)
+        new = stmt.inserted
+        return stmt.on_duplicate_key_update(
+            min_price=func.least(table.c.min_price, new.min_price),
+            max_price=func.greatest(table.c.max_price, new.max_price),
+            modal_sum=table.c.modal_sum + new.modal_sum,
+            samples=table.c.samples + new.samples,
+            updated_at=now,
+        )
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+        least, greatest = func.least, func.greatest
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+        least, greatest = func.min, func.max  # SQLite's two-argument min()/max() are scalar
+    stmt = insert(table).values(values)
+    new = stmt.excluded
+    return stmt.on_conflict_do_update(
+        index_elements=list(ROLLUP_KEY),
+        set_={
+            "min_price": least(table.c.min_price, new.min_price),
+            "max_price": greatest(table.c.max_price, new.max_price),
+            "modal_sum": table.c.modal_sum + new.modal_sum,
+            "samples": table.c.samples + new.samples,
+            "updated_at": now,
+        },
+    )
+
+
+def _fold_into_rollups(session: Session, rows: List[MarketPrice]) -> None:
+    """Add new snapshot rows to their day/week rollups with one upsert per chunk."""
+    if not rows:
+        return
+    dialect = session.get_bind().dialect.name
+    now = datetime.utcnow()
+    values = [
+        dict(zip(ROLLUP_KEY, key), min_price=low, max_price=high, modal_sum=modal_sum, samples=samples,
+             updated_at=now)
+        for key, (low, high, modal_sum, samples) in _rollup_deltas(rows).items()
+    ]
+    for i in range(0, len(values), UPSERT_CHUNK):
+        session.execute(_upsert_statement(dialect, values[i:i + UPSERT_CHUNK]))
+
+
+def record_market_snapshot(session: Session, records: Iterable[Tuple[Dict[str, Any], str]]) -> int:
+    """Store (record, source) pairs from the mandi feed and update rollups.
+    Rows already recorded for the same commodity/market/day/source are skipped.
+    Returns the number of new rows.
+    """
+    return _record_rows(session, _snapshot_rows(records))
+
+
+def _record_rows(session: Session, rows: List[MarketPrice]) -> int:
+    if not rows:
+        return 0
+    days = {r.arrival_date for r in rows}
+    sources = {r.source for r in rows}
+    seen = {
+        (_norm(c), _norm(s), _norm(m), d, src)
+        for c, s, m, d, src in session.query(
+            MarketPrice.commodity, MarketPrice.state, MarketPrice.market,
+            MarketPrice.arrival_date, MarketPrice.source,
+        ).filter(MarketPrice.arrival_date.in_(days), MarketPrice.source.in_(sources))
+    }
+    fresh = [r for r in rows if _row_key(r) not in seen]
+    if not fresh:
+        return 0
+    session.add_all(fresh)
+    _fold_into_rollups(session, fresh)
+    session.commit()
+    return len(fresh)
+
+
+class SnapshotWriter:
+    """Records mandi feed rows off the request thread.
+
+    The feed returns the same rows all day, so ``submit`` first drops every row
+    this process has already handed over and returns at once when nothing is
+    new. The rest go to one background thread with its own session. A failed
+    write is logged and its rows are forgotten, so a later request retries them.
+    """
+
+    MAX_REMEMBERED = 200_000  # row keys; cleared wholesale when exceeded
+    MAX_PENDING = 16  # batches; further batches are dropped until the writer catches up
+
+    def __init__(self) -> None:
+        self._recorded: Set[Tuple] = set()
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[List[MarketPrice]]" = queue.Queue(maxsize=self.MAX_PENDING)
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, records: Iterable[Tuple[Dict[str, Any], str]]) -> int:
+        """Queue rows not seen before; returns how many were queued."""
+        rows = _snapshot_rows(records)
+        with self._lock:
+            if len(self._recorded) > self.MAX_REMEMBERED:
+                self._recorded.clear()
+            rows = [r for r in rows if _row_key(r) not in self._recorded]
+            if not rows:
+                return 0
+            try:
+                self._queue.put_nowait(rows)
+            except queue.Full:
+                log.warning("price history writer is behind; dropped %d mandi rows", len(rows))
+                return 0
+            self._recorded.update(_row_key(r) for r in rows)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="price-history-writer", daemon=True)
+                self._thread.start()
+        return len(rows)
+
+    def flush(self) -> None:
+        """Block until every queued batch has been written (scripts and checks)."""
+        self._queue.join()
+
+    def _run(self) -> None:
+        from ..db import new_session
+        while True:
+            rows = self._queue.get()
+            try:
+                with new_session() as session:
+                    try:
+                        added = _record_rows(session, rows)
+                    except Exception:
+                        session.rollback()
+                        raise
+                if added:
+                    log.info("stored %d new mandi price rows", added)
+            except Exception:
+                log.exception("failed to store %d mandi price rows", len(rows))
+                with self._lock:
+                    self._recorded.difference_update(_row_key(r) for r in rows)
+            finally:
+                self._queue.task_done()
+
+
+snapshot_writer = SnapshotWriter()
+
+
+def rebuild_rollups(session: Session, batch_size: int = 5000) -> int:
+    """Recompute all rollups from raw ``market_prices`` rows (backfill/repair)."""
+    session.query(MarketPriceRollup).delete(synchronize_session=False)
+    session.flush()
+    total = 0
+    last_id = 0
+    while True:
+        batch = session.query(MarketPrice).filter(
+            MarketPrice.arrival_date.isnot(None), MarketPrice.id > last_id
+        ).order_by(MarketPrice.id).limit(batch_size).all()
+        if not batch:
+            break
+        _fold_into_rollups(session, batch)
+        session.flush()
+        last_id = batch[-1].id
+        total += len(batch)
+    session.commit()
+    return total
+
+
+def query_price_history(session: Session, commodity: str, bucket: str, start: date, end: date,
+                        state: Optional[str] = None, market: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Time series for a commodity from rollups, aggregated across matching markets."""
+    q = session.query(
+        MarketPriceRollup.bucket_start,
+        func.min(MarketPriceRollup.min_price),
+        func.max(MarketPriceRollup.max_price),
+        func.sum(MarketPriceRollup.modal_sum),
+        func.sum(MarketPriceRollup.samples),
+        func.count(MarketPriceRollup.id),
+    ).filter(
+        MarketPriceRollup.bucket == bucket,
+        MarketPriceRollup.commodity == _norm(commodity),
+        MarketPriceRollup.bucket_start >= bucket_start(start, bucket),
+        MarketPriceRollup.bucket_start <= end,
+    )
+    if state:
+        q = q.filter(MarketPriceRollup.state == _norm(state))
+    if market:
+        q = q.filter(func.lower(MarketPriceRollup.market) == _norm(market))
+    rows = q.group_by(MarketPriceRollup.bucket_start).order_by(MarketPriceRollup.bucket_start).all()
+    return [
+        {
+            "date": start_day.isoformat(),
+            "min_price": round(float(low), 2),
+            "max_price": round(float(high), 2),
+            "modal_price": round(float(modal_sum) / samples, 2) if samples else None,
+            "samples": int(samples or 0),
+            "markets": int(markets),
+        }
+        for start_day, low, high, modal_sum, samples, markets in rows
+    ]
@@ -0,0 +1,159 @@
+"""
+Opt-in cProfile sampling of production requests.
+
+A request is profiled when it wins the ``PROFILE_SAMPLE_RATE`` draw or
+carries a valid ``X-Profile`` header, an expiring HMAC token that admins
+mint via ``POST /api/v1/ops/profiles/token``. Only one request per process
+is profiled at a time; others run untouched. Each profile is written to
+``PROFILE_DIR`` as ``<id>.prof`` (pstats format, for snakeviz or
+``python -m pstats``) with a ``<id>.json`` sidecar holding route and timing,
+and the directory is pruned to ``PROFILE_KEEP`` files, keeping the slowest.
+"""
+from __future__ import annotations
+import cProfile
+import hashlib
+import hmac
+import io
+import json
+import os
+import pstats
+import random
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from flask import Flask, current_app, g, request
+
+from ..config import settings
+from .metrics import counter
+
+profiles_taken = counter("request_profiles_total", "Requests profiled by trigger", ["trigger"])
+
+HEADER = "X-Profile"
+_busy = threading.Lock()
+
+
+def _sign(expires: int) -> str:
+    key = current_app.config["SECRET_KEY"].encode()
+    return hmac.new(key, f"profile:{expires}".encode(), hashlib.sha256).hexdigest()
+
+
+def make_token(ttl_seconds: int) -> Dict[str, Any]:
+    expires = int(time.time()) + ttl_seconds
+    return {"header": HEADER, "value": f"{expires}.{_sign(expires)}", "expires_at": expires}
+
+
+def _valid_token(value: str) -> bool:
+    expires, _, signature = value.partition(".")
+    if not expires.isdigit() or int(expires) < time.time():
+        return False
+    return hmac.compare_digest(signature, _sign(int(expires)))
+
+
+def _trigger() -> Optional[str]:
+    value = request.headers.get(HEADER)
+    if value and _valid_token(value):
+        return "header"
+    if settings.PROFILE_SAMPLE_RATE > 0 and random.random() < settings.PROFILE_SAMPLE_RATE:
+        return "sampled"
+    return None
+
+
+def _start() -> None:
+    trigger = _trigger()
+    if trigger is None or not _busy.acquire(blocking=False):
+        return
+    profiler = cProfile.Profile()
+    g._profile = (profiler, trigger, time.perf_counter())
+    profiler.enable()
+
+
+def _finish(exc) -> None:
+    state = g.pop("_profile", None)
+    if state is None:
+        return
+    profiler, trigger, started = state
+    try:
+        profiler.disable()
+        elapsed = time.perf_counter() - started
+        profiles_taken.inc(trigger)
+        _save(profiler, {
+            "endpoint": request.endpoint or "unmatched",
+            "method": request.method,
+            "path": request.path,
+            "trigger": trigger,
+            "duration_ms": round(elapsed * 1000, 2),
+            "error": type(exc).__name__ if exc is not None else None,
+            "created_at": datetime.utcnow().isoformat(),
+        })
+    except Exception:
+        current_app.logger.exception("failed to store request profile")
+    finally:
+        _busy.release()
+
+
+def _save(profiler: cProfile.Profile, meta: Dict[str, Any]) -> None:
+    os.makedirs(settings.PROFILE_DIR, exist_ok=True)
+    meta["id"] = f"{int(time.time())}-{uuid.uuid4().hex[:8]}"
+    stats = pstats.Stats(profiler)
+    meta["function_calls"] = stats.total_calls
+    stats.dump_stats(os.path.join(settings.PROFILE_DIR, f"{meta['id']}.prof"))
+    with open(os.path.join(settings.PROFILE_DIR, f"{meta['id']}.json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    _prune()
+
+
+def _read_meta() -> List[Dict[str, Any]]:
+    try:
+        names = os.listdir(settings.PROFILE_DIR)
+    except FileNotFoundError:
+        return []
+    out = []
+    for name in names:
+        if not name.endswith(".json"):
+            continue
+        try:
+            with open(os.path.join(settings.PROFILE_DIR, name), encoding="utf-8") as f:
+                out.append(json.load(f))
+        except (OSError, ValueError):
+            continue
+    return out
+
+
+def _prune() -> None:
+    metas = sorted(_read_meta(), key=lambda m: m.get("duration_ms", 0), reverse=True)
+    for meta in metas[settings.PROFILE_KEEP:]:
+        for ext in (".json", ".prof"):
+            try:
+                os.remove(os.path.join(settings.PROFILE_DIR, meta["id"] + ext))
+            except OSError:
+                pass
+
+
+def list_profiles(limit: int = 20, endpoint: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Stored profiles, slowest first."""
+    metas = [m for m in _read_meta() if endpoint is None or m.get("endpoint") == endpoint]
+    metas.sort(key=lambda m: m.get("duration_ms", 0), reverse=True)
+    return metas[:limit]
+
+
+def profile_path(profile_id: str) -> Optional[str]:
+    # ids are generated by _save; reject anything else so the name can't escape PROFILE_DIR
+    stamp, _, suffix = profile_id.partition("-")
+    if not (stamp.isdigit() and len(suffix) == 8 and all(c in "0123456789abcdef" for c in suffix)):
+        return None
+    path = os.path.join(settings.PROFILE_DIR, f"{profile_id}.prof")
+    return path if os.path.exists(path) else None
+
+
+def profile_text(path: str, sort: str = "cumulative", limit: int = 50) -> str:
+    out = io.StringIO()
+    pstats.Stats(path, stream=out).strip_dirs().sort_stats(sort).print_stats(limit)
+    return out.getvalue()
+
+
+def init_app(app: Flask) -> None:
+    app.before_request(_start)
+    app.teardown_request(_finish)
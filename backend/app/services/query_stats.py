@@ -0,0 +1,150 @@
+"""
+Per-request SQL instrumentation.
+
+Engine-level SQLAlchemy hooks (primary and replicas alike) count the
+statements each request runs and the time spent in the database. Queries
+slower than ``DB_SLOW_QUERY_MS`` are logged with their endpoint, and a
+request that runs the same statement shape ``DB_N_PLUS_ONE_THRESHOLD`` or
+more times (the per-row lazy loads of an N+1 loop) is logged as an N+1
+suspect. Totals feed per-endpoint histograms; in development the counts are
+also returned as ``X-DB-*`` response headers.
+"""
+from __future__ import annotations
+import logging
+import re
+import threading
+import time
+from collections import Counter as ShapeCounter, OrderedDict
+from typing import Any, Dict, Optional
+
+from flask import Flask, g, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from ..config import settings
+from .metrics import counter, histogram
+
+log = logging.getLogger(__name__)
+
+statements_per_request = histogram("db_statements_per_request", "SQL statements run per request", ["endpoint"],
+                                   buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500, 1000))
+db_time_per_request = histogram("db_time_per_request_seconds", "Time spent in SQL per request", ["endpoint"])
+slow_queries = counter("db_slow_queries_total", "Statements slower than DB_SLOW_QUERY_MS", ["endpoint"])
+n_plus_one = counter("db_n_plus_one_suspects_total", "Requests repeating one statement shape", ["endpoint"])
+
+_SUSPECTS_MAX = 100
+_suspects: "OrderedDict[tuple, Dict[str, Any]]" = OrderedDict()
+_suspects_lock = threading.Lock()
+
+_PLACEHOLDER_LIST = re.compile(r"\(\s*(?:\?|%s|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%s|%\(\w+\)s|:\w+))*\s*\)")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_SPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """SQL with literals and IN-lists collapsed, so per-row variants of one query compare equal."""
+    shape = _LITERAL.sub("?", statement)
+    shape = _PLACEHOLDER_LIST.sub("(?)", shape)
+    return _SPACE.sub(" ", shape).strip()
+
+
+def _endpoint() -> str:
+    if not has_request_context():
+        return "background"
+    return request.endpoint or "unmatched"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    if elapsed * 1000 >= settings.DB_SLOW_QUERY_MS:
+        endpoint = _endpoint()
+        slow_queries.inc(endpoint)
+        log.warning("slow query %.0f ms on %s: %s", elapsed * 1000, endpoint, _SPACE.sub(" ", statement)[:500])
+    if not has_request_context():
+        return
+    stats = g.get("_query_stats")
+    if stats is None:
+        return
+    stats["count"] += 1
+    stats["seconds"] += elapsed
+    stats["shapes"][statement_shape(statement)] += 1
+
+
+def _start_request() -> None:
+    g._query_stats = {"count": 0, "seconds": 0.0, "shapes": ShapeCounter()}
+
+
+def _finish_request(response):
+    stats = g.pop("_query_stats", None)
+    if stats is None:
+        return response
+    endpoint = _endpoint()
+    statements_per_request.observe(endpoint, value=stats["count"])
+    db_time_per_request.observe(endpoint, value=stats["seconds"])
+
+    repeated = [(shape, n) for shape, n in stats["shapes"].most_common(3) if n >= settings.DB_N_PLUS_ONE_THRESHOLD]
+    if repeated:
+        n_plus_one.inc(endpoint)
+        for shape, n in repeated:
+            log.warning("possible N+1 on %s: %d x %s", endpoint, n, shape[:300])
+            _remember_suspect(endpoint, shape, n)
+
+    if settings.DB_QUERY_HEADERS:
+        response.headers["X-DB-Statements"] = str(stats["count"])
+        response.headers["X-DB-Time-ms"] = f"{stats['seconds'] * 1000:.1f}"
+        if repeated:
+            response.headers["X-DB-N-Plus-One"] = str(repeated[0][1])
+    return response
+
+
+def _remember_suspect(endpoint: str, shape: str, count: int) -> None:
+    with _suspects_lock:
+        key = (endpoint, shape)
+        entry = _suspects.pop(key, None) or {"endpoint": endpoint, "statement": shape[:500], "max_repeats": 0, "requests": 0}
+        entry["requests"] += 1
+        entry["max_repeats"] = max(entry["max_repeats"], count)
+        entry["last_seen"] = time.time()
+        _suspects[key] = entry
+        while len(_suspects) > _SUSPECTS_MAX:
+            _suspects.popitem(last=False)
+
+
+def query_stats(limit: Optional[int] = 20) -> Dict[str, Any]:
+    """Per-endpoint statement counts and DB time, slowest endpoints first, plus recent N+1 suspects."""
+    db_time = db_time_per_request.summary()
+    endpoints = []
+    for endpoint, stmts in statements_per_request.summary().items():
+        t = db_time.get(endpoint, {})
+        endpoints.append({
+            "endpoint": endpoint,
+            "requests": stmts["count"],
+            "statements_mean": stmts["mean"],
+            "statements_p95": stmts["p95"],
+            "db_seconds_mean": t.get("mean"),
+            "db_seconds_p95": t.get("p95"),
+        })
+    endpoints.sort(key=lambda e: (e["db_seconds_mean"] or 0) * e["requests"], reverse=True)
+    with _suspects_lock:
+        suspects = sorted(_suspects.values(), key=lambda e: e["max_repeats"], reverse=True)
+    return {
+        "endpoints": endpoints[:limit],
+        "n_plus_one_suspects": suspects[:limit],
+        "slow_queries": {"|".join(k) or "all": v for k, v in slow_queries.samples()},
+        "thresholds": {"slow_query_ms": settings.DB_SLOW_QUERY_MS,
+                       "n_plus_one_repeats": settings.DB_N_PLUS_ONE_THRESHOLD},
+    }
+
+
+def init_app(app: Flask) -> None:
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
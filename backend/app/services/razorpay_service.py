@@ -1,18 +1,33 @@
 import hmac
 import hashlib
+import threading
 from typing import Any, Dict, Optional
 
-import razorpay  # type: ignore
-
 from ..config import settings
+from .metrics import track_upstream
+
+_client: Any = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> Any:
+    """Shared ``razorpay.Client``, or None when keys aren't set.
+
+    The SDK is imported on the first payment call, not when the payments
+    blueprint is imported, so workers that never take a payment skip it.
+    """
+    global _client
+    if _client is None and settings.RAZORPAY_KEY_ID and settings.RAZORPAY_KEY_SECRET:
+        with _client_lock:
+            if _client is None:
+                import razorpay  # type: ignore
+                _client = razorpay.Client(auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET))
+    return _client
 
 
 class RazorpayService:
     def __init__(self) -> None:
-        if not (settings.RAZORPAY_KEY_ID and settings.RAZORPAY_KEY_SECRET):
-            self.client = None
-        else:
-            self.client = razorpay.Client(auth=(settings.RAZORPAY_KEY_ID, settings.RAZORPAY_KEY_SECRET))
+        self.client = get_client()
 
     def is_configured(self) -> bool:
         return self.client is not None
@@ -26,7 +41,8 @@ class RazorpayService:
             "receipt": receipt or "receipt",
             "payment_capture": 1,
         }
-        return self.client.order.create(data=payload)
+        with track_upstream("razorpay"):
+            return self.client.order.create(data=payload)
 
     @staticmethod
     def verify_webhook_signature(body: bytes, signature: str) -> bool:
@@ -0,0 +1,164 @@
+"""
+Circuit breaker and bulkhead (bounded concurrency) for upstream dependencies.
+
+Both reject immediately instead of blocking a worker thread on a dependency
+that is down or saturated; callers catch ``RejectedError`` and use their
+rule-based fallbacks.
+"""
+from __future__ import annotations
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from .metrics import counter, gauge
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+_STATE_VALUE = {CLOSED: 0, OPEN: 1, HALF_OPEN: 2}
+
+breaker_state = gauge("circuit_breaker_state", "Circuit state (0 closed, 1 open, 2 half-open)", ["name"])
+rejections = counter("upstream_rejections_total", "Calls rejected before reaching an upstream", ["name", "reason"])
+inflight = gauge("upstream_inflight", "Calls currently in flight to an upstream", ["name"])
+
+
+class RejectedError(RuntimeError):
+    pass
+
+
+class CircuitOpenError(RejectedError):
+    pass
+
+
+class BulkheadFullError(RejectedError):
+    pass
+
+
+class CircuitBreaker:
+    """Opens after ``failure_threshold`` consecutive failures; after ``reset_timeout``
+    seconds lets ``half_open_probes`` calls through and closes on their success.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 half_open_probes: int = 1) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_probes = half_open_probes
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._lock = threading.Lock()
+        breaker_state.set(name, value=0)
+
+    def _set_state(self, state: str) -> None:
+        self._state = state
+        breaker_state.set(self.name, value=_STATE_VALUE[state])
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and time.monotonic() - self._opened_at >= self.reset_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless the call may proceed."""
+        with self._lock:
+            if self._state == OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    rejections.inc(self.name, "circuit_open")
+                    raise CircuitOpenError(f"{self.name} circuit open")
+                self._set_state(HALF_OPEN)
+                self._probes = 0
+            if self._state == HALF_OPEN:
+                if self._probes >= self.half_open_probes:
+                    rejections.inc(self.name, "circuit_half_open")
+                    raise CircuitOpenError(f"{self.name} circuit half-open")
+                self._probes += 1
+
+    def cancel_probe(self) -> None:
+        """Give back a half-open probe slot for a call that never reached the upstream."""
+        with self._lock:
+            if self._state == HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            if self._state != CLOSED:
+                self._set_state(CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._set_state(OPEN)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"state": self.state, "consecutive_failures": self._failures}
+
+
+class Bulkhead:
+    """Caps concurrent calls; waits up to ``queue_timeout`` seconds for a slot."""
+
+    def __init__(self, name: str, max_concurrent: int, queue_timeout: float = 0.0) -> None:
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.queue_timeout = queue_timeout
+        self._sem = threading.BoundedSemaphore(max_concurrent)
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        if self.queue_timeout > 0:
+            acquired = self._sem.acquire(timeout=self.queue_timeout)
+        else:
+            acquired = self._sem.acquire(blocking=False)
+        if not acquired:
+            rejections.inc(self.name, "bulkhead_full")
+            raise BulkheadFullError(f"{self.name} concurrency limit reached")
+        with self._lock:
+            self._active += 1
+        inflight.inc(self.name)
+
+    def release(self) -> None:
+        with self._lock:
+            self._active -= 1
+        inflight.dec(self.name)
+        self._sem.release()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"active": self._active, "max_concurrent": self.max_concurrent}
+
+
+def call_guarded(breaker: CircuitBreaker, bulkhead: Optional[Bulkhead], fn: Callable[..., Any],
+                 *args: Any, is_failure: Optional[Callable[[Any], bool]] = None,
+                 is_failure_exc: Optional[Callable[[BaseException], bool]] = None, **kwargs: Any) -> Any:
+    """Run ``fn`` behind the breaker and bulkhead. Results for which ``is_failure`` returns
+    True (e.g. HTTP 5xx responses) count as failures. Exceptions do too, unless
+    ``is_failure_exc`` says otherwise (e.g. a 400 raised by an SDK: the upstream is up).
+    """
+    breaker.before_call()
+    if bulkhead is not None:
+        try:
+            bulkhead.acquire()
+        except BulkheadFullError:
+            breaker.cancel_probe()
+            raise
+    try:
+        result = fn(*args, **kwargs)
+    except BaseException as exc:
+        if is_failure_exc is None or is_failure_exc(exc):
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        raise
+    finally:
+        if bulkhead is not None:
+            bulkhead.release()
+    if is_failure is not None and is_failure(result):
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+    return result
@@ -0,0 +1,228 @@
+"""
+Semantic cache for free-form agent chat answers.
+
+Questions are embedded on the CPU as hashed TF-IDF vectors over character
+n-grams and words (works for Hindi/Odia script as well as English, no model
+download). Each language keeps its own fixed-size NumPy index; a question is
+answered from cache when its cosine similarity to a stored question clears
+that language's threshold. Entries expire after a TTL and the least recently
+used one is evicted when an index is full.
+
+Similarity alone can't tell "2 acres" from "20 acres" or "should I spray" from
+"should I not spray", so a hit also requires the same numbers and the same
+negation (``guard_terms``) as the stored question.
+"""
+from __future__ import annotations
+import re
+import threading
+import time
+import unicodedata
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from ..config import settings
+from .metrics import counter
+
+DIM = 2048
+NGRAM_SIZES = (3, 4, 5)
+DEFAULT_THRESHOLD = 0.9
+
+lookups = counter("semantic_cache_lookups_total", "Agent chat semantic cache lookups", ["language", "result"])
+
+_PUNCT = re.compile(r"[^\w\s]+", re.UNICODE)
+_NUMBER = re.compile(r"\d+(?:[.,]\d+)*")
+_EDGE_PUNCT = "?!.,;:\"'()[]।॥"
+# English, romanized Hindi, Hindi and Odia negators; "n't" contractions are matched separately
+_NEGATIONS = {
+    "not", "no", "never", "without", "cannot", "dont", "doesnt", "didnt", "isnt", "shouldnt", "cant",
+    "nahi", "nahin", "mat", "नहीं", "नही", "मत", "न", "ନାହିଁ", "ନା", "ନୁହେଁ",
+}
+
+GuardKey = Tuple[Tuple[str, ...], bool]
+
+
+def _normalize(text: str) -> str:
+    return " ".join(_PUNCT.sub(" ", (text or "").lower()).split())
+
+
+def _features(text: str) -> List[str]:
+    words = text.split()
+    feats = [f"w:{w}" for w in words]
+    padded = f" {text} "
+    for n in NGRAM_SIZES:
+        feats += [padded[i:i + n] for i in range(len(padded) - n + 1)]
+    return feats
+
+
+def guard_terms(text: str) -> GuardKey:
+    """(sorted numbers, negated?) of a question; cached answers are only shared when these match."""
+    lowered = (text or "").lower().replace("’", "'")
+    numbers = tuple(sorted(
+        "".join(str(unicodedata.decimal(c, c)) for c in n).replace(",", "")
+        for n in _NUMBER.findall(lowered)
+    ))
+    tokens = [t.strip(_EDGE_PUNCT) for t in lowered.split()]
+    negated = any(t in _NEGATIONS or t.endswith("n't") for t in tokens)
+    return numbers, negated
+
+
+def embed_tf(text: str) -> np.ndarray:
+    """Sublinear term frequencies over hashed features (crc32 keeps buckets stable across processes)."""
+    vec = np.zeros(DIM, dtype=np.float32)
+    for feat in _features(text):
+        vec[zlib.crc32(feat.encode("utf-8")) % DIM] += 1.0
+    nz = vec > 0
+    vec[nz] = 1.0 + np.log(vec[nz])
+    return vec
+
+
+def parse_thresholds(spec: str) -> Dict[str, float]:
+    """``"en:0.9,hi:0.85"`` -> {"en": 0.9, "hi": 0.85}; malformed items are ignored."""
+    out: Dict[str, float] = {}
+    for item in (spec or "").split(","):
+        lang, _, value = item.partition(":")
+        try:
+            out[lang.strip().lower()] = float(value)
+        except ValueError:
+            continue
+    return out
+
+
+class _LanguageIndex:
+    """Fixed-capacity matrix of TF rows plus document frequencies for IDF weighting."""
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = capacity
+        self.tf = np.zeros((capacity, DIM), dtype=np.float32)
+        self.df = np.zeros(DIM, dtype=np.float32)
+        self.answers: List[Optional[Dict[str, Any]]] = [None] * capacity
+        self.guards: List[Optional[GuardKey]] = [None] * capacity
+        self.expires = np.zeros(capacity, dtype=np.float64)
+        self.lru: "OrderedDict[int, None]" = OrderedDict()  # live slots, oldest first
+        self._weighted: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+
+    def _idf(self) -> np.ndarray:
+        n = len(self.lru)
+        return np.log((1.0 + n) / (1.0 + self.df)) + 1.0
+
+    def _free(self, slot: int) -> None:
+        self.df -= self.tf[slot] > 0
+        self.tf[slot] = 0.0
+        self.answers[slot] = None
+        self.guards[slot] = None
+        self.lru.pop(slot, None)
+        self._weighted = None
+
+    def _matrix(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(live slots, L2-normalized TF-IDF rows, idf), rebuilt only after the index changes."""
+        if self._weighted is None:
+            slots = np.fromiter(self.lru.keys(), dtype=np.int64, count=len(self.lru))
+            idf = self._idf()
+            rows = self.tf[slots] * idf
+            norms = np.linalg.norm(rows, axis=1, keepdims=True)
+            self._weighted = (slots, rows / np.maximum(norms, 1e-12), idf)
+        return self._weighted
+
+    def search(self, tf: np.ndarray, guard: GuardKey, now: float) -> Tuple[Optional[int], float]:
+        expired = [s for s in self.lru if self.expires[s] <= now]
+        for slot in expired:
+            self._free(slot)
+        if not self.lru:
+            return None, 0.0
+        slots, rows, idf = self._matrix()
+        q = tf * idf
+        qn = float(np.linalg.norm(q))
+        if qn == 0.0:
+            return None, 0.0
+        sims = rows @ (q / qn)
+        sims[[self.guards[s] != guard for s in slots]] = -1.0
+        best = int(np.argmax(sims))
+        return int(slots[best]), float(sims[best])
+
+    def insert(self, tf: np.ndarray, guard: GuardKey, answer: Dict[str, Any], expires_at: float) -> None:
+        if len(self.lru) >= self.capacity:
+            self._free(next(iter(self.lru)))
+        slot = next(i for i, a in enumerate(self.answers) if a is None)
+        self.tf[slot] = tf
+        self.df += tf > 0
+        self.answers[slot] = answer
+        self.guards[slot] = guard
+        self.expires[slot] = expires_at
+        self.lru[slot] = None
+        self._weighted = None
+
+
+class SemanticCache:
+    def __init__(self, capacity_per_language: int, ttl_seconds: float,
+                 thresholds: Optional[Dict[str, float]] = None) -> None:
+        self.capacity = capacity_per_language
+        self.ttl_seconds = ttl_seconds
+        self.thresholds = thresholds or {}
+        self._indexes: Dict[str, _LanguageIndex] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _lang(language: Optional[str]) -> str:
+        return (language or "en").strip().lower()
+
+    def threshold(self, language: Optional[str]) -> float:
+        return self.thresholds.get(self._lang(language), DEFAULT_THRESHOLD)
+
+    def lookup(self, question: str, language: Optional[str]) -> Optional[Dict[str, Any]]:
+        """Cached answer for a question close enough to one seen before, else None."""
+        lang = self._lang(language)
+        tf = embed_tf(_normalize(question))
+        guard = guard_terms(question)
+        with self._lock:
+            index = self._indexes.get(lang)
+            slot, score = index.search(tf, guard, time.monotonic()) if index is not None else (None, 0.0)
+            if slot is None or score < self.threshold(lang):
+                lookups.inc(lang, "miss")
+                return None
+            index.lru.move_to_end(slot)
+            lookups.inc(lang, "hit")
+            return index.answers[slot]
+
+    def store(self, question: str, language: Optional[str], answer: Dict[str, Any]) -> None:
+        lang = self._lang(language)
+        tf = embed_tf(_normalize(question))
+        if not tf.any():
+            return
+        with self._lock:
+            index = self._indexes.get(lang)
+            if index is None:
+                index = self._indexes[lang] = _LanguageIndex(self.capacity)
+            index.insert(tf, guard_terms(question), answer, time.monotonic() + self.ttl_seconds)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._indexes.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        counts: Dict[str, Dict[str, float]] = {}
+        for (lang, result), value in lookups.samples():
+            counts.setdefault(lang, {})[result] = value
+        with self._lock:
+            sizes = {lang: len(index.lru) for lang, index in self._indexes.items()}
+        out = {}
+        for lang in sorted(set(counts) | set(sizes)):
+            c = counts.get(lang, {})
+            total = c.get("hit", 0) + c.get("miss", 0)
+            out[lang] = {
+                "size": sizes.get(lang, 0),
+                "threshold": self.threshold(lang),
+                "hits": c.get("hit", 0),
+                "misses": c.get("miss", 0),
+                "hit_ratio": round(c.get("hit", 0) / total, 4) if total else None,
+            }
+        return {"capacity_per_language": self.capacity, "ttl_seconds": self.ttl_seconds, "languages": out}
+
+
+chat_cache = SemanticCache(
+    capacity_per_language=settings.SEMANTIC_CACHE_SIZE,
+    ttl_seconds=settings.SEMANTIC_CACHE_TTL,
+    thresholds=parse_thresholds(settings.SEMANTIC_CACHE_THRESHOLDS),
+)
@@ -0,0 +1,78 @@
+"""
+Batch soil recommendations for whole villages (soil health card uploads).
+
+Profiles are grouped by their answer-cache key, so identical and
+near-identical cards (same soil type, pH/NPK in the same buckets) share one
+answer. Groups already in the cache are served from it; the rest are sent
+to Gemini several profiles per prompt, with a bounded number of prompts in
+flight. Every card gets a result in input order, and the generated answers'
+log rows are returned for the caller to insert in one transaction.
+"""
+from __future__ import annotations
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..config import settings
+from ..models import SoilRecommendationLog
+from .ai_cache import cache_key, lookup_cached, remember
+from .gemini_core import _fallback_rules, recommend_from_soil_batch
+from .metrics import counter
+
+batch_prompts = counter("soil_batch_prompts_total", "Multi-profile soil prompts by outcome", ["outcome"])
+
+
+def _generate_chunk(soils: List[Dict[str, Any]], language: Optional[str]) -> List[Dict[str, Any]]:
+    try:
+        answers = recommend_from_soil_batch(soils, language)
+        batch_prompts.inc("ok")
+    except Exception:
+        answers = [None] * len(soils)
+        batch_prompts.inc("error")
+    return [a if a is not None else _fallback_rules(soil, language) for soil, a in zip(soils, answers)]
+
+
+def recommend_batch(soils: List[Dict[str, Any]], language: Optional[str],
+                    session: Optional[Session] = None) -> Tuple[List[Dict[str, Any]], List[SoilRecommendationLog], Dict[str, int]]:
+    """Returns (one answer per input, log rows for newly generated answers, summary counts)."""
+    groups: Dict[str, List[int]] = {}
+    for i, soil in enumerate(soils):
+        groups.setdefault(cache_key("soil", soil, language), []).append(i)
+
+    answers: Dict[str, Dict[str, Any]] = {}
+    cached_keys = set()
+    pending: List[str] = []
+    for key in groups:
+        data = lookup_cached("soil", key, session)
+        if data is not None:
+            answers[key] = data
+            cached_keys.add(key)
+        else:
+            pending.append(key)
+
+    size = max(1, settings.SOIL_BATCH_PROMPT_SIZE)
+    chunks = [pending[i:i + size] for i in range(0, len(pending), size)]
+    logs: List[SoilRecommendationLog] = []
+    if chunks:
+        workers = max(1, min(settings.SOIL_BATCH_CONCURRENCY, len(chunks)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            # The first card of each group stands in for the whole group
+            results = pool.map(lambda keys: _generate_chunk([soils[groups[k][0]] for k in keys], language), chunks)
+            for keys, generated in zip(chunks, results):
+                for key, data in zip(keys, generated):
+                    answers[key] = data
+                    logs.append(remember(key, data, {"soil": soils[groups[key][0]], "language": language,
+                                                     "batch_size": len(groups[key])}))
+
+    out: List[Dict[str, Any]] = [{}] * len(soils)
+    for key, members in groups.items():
+        for i in members:
+            out[i] = {**answers[key], "cached": key in cached_keys}
+    summary = {
+        "items": len(soils),
+        "groups": len(groups),
+        "cached_groups": len(cached_keys),
+        "gemini_prompts": len(chunks),
+    }
+    return out, logs, summary
@@ -0,0 +1,145 @@
+"""
+OpenWeather access shared by the weather routes and the agent.
+
+Coordinates are snapped to a tile grid (``WEATHER_TILE_DEGREES``) and
+responses are cached per tile for ``WEATHER_CACHE_TTL`` seconds, so every
+farmer in the same ~5 km tile is served by one upstream call. Concurrent
+misses for a tile are coalesced and all calls reuse one pooled client.
+"""
+from __future__ import annotations
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from ..config import settings
+from .cache import TTLCache
+from .metrics import track_upstream
+
+weather_cache = TTLCache("weather", ttl_seconds=settings.WEATHER_CACHE_TTL, maxsize=20000)
+forecast_cache = TTLCache("weather_forecast", ttl_seconds=settings.WEATHER_FORECAST_CACHE_TTL, maxsize=20000)
+
+FORECAST_STEPS = 8  # 3-hourly steps -> next 24 h
+
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+
+
+class WeatherError(Exception):
+    def __init__(self, message: str, status: int = 502, payload: Optional[Dict[str, Any]] = None) -> None:
+        super().__init__(message)
+        self.status = status
+        self.payload = payload or {"error": message}
+
+
+def get_client() -> httpx.Client:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = httpx.Client(
+                    base_url=settings.OPENWEATHER_BASE_URL,
+                    timeout=httpx.Timeout(10.0, connect=5.0),
+                    limits=httpx.Limits(
+                        max_connections=settings.WEATHER_HTTP_MAX_CONNECTIONS,
+                        max_keepalive_connections=settings.WEATHER_HTTP_MAX_CONNECTIONS,
+                    ),
+                )
+    return _client
+
+
+def tile_for(lat: float, lon: float) -> Tuple[float, float]:
+    """Snap a coordinate to the centre of its weather tile."""
+    size = settings.WEATHER_TILE_DEGREES
+    return (round(round(float(lat) / size) * size, 4), round(round(float(lon) / size) * size, 4))
+
+
+def _fetch(endpoint: str, tile: Tuple[float, float], **extra: Any) -> Dict[str, Any]:
+    api = settings.OPENWEATHER_API_KEY
+    if not api:
+        raise WeatherError("OPENWEATHER_API_KEY not configured", status=503)
+    params = {"lat": tile[0], "lon": tile[1], "appid": api, "units": "metric", **extra}
+    try:
+        with track_upstream("openweather"):
+            r = get_client().get(f"/{endpoint}", params=params)
+    except httpx.HTTPError as e:
+        raise WeatherError(str(e)) from e
+    try:
+        data = r.json()
+    except ValueError:
+        data = {"error": r.text[:300]}
+    if r.status_code != 200:
+        # Never pass OpenWeather's status through: its 401 (bad key) would read as our client's auth error
+        message = f"weather upstream HTTP {r.status_code}"
+        raise WeatherError(message, status=503 if r.status_code == 429 else 502,
+                           payload={"error": message, "upstream_status": r.status_code, "upstream": data})
+    return data
+
+
+def get_current_weather(lat: float, lon: float) -> Dict[str, Any]:
+    """Current conditions for the tile containing (lat, lon). Raises WeatherError."""
+    tile = tile_for(lat, lon)
+    return weather_cache.get_or_load(("weather", tile), lambda: _fetch("weather", tile))
+
+
+def _compact_forecast(data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    steps = []
+    for item in (data.get("list") or [])[:FORECAST_STEPS]:
+        main = item.get("main") or {}
+        wx = (item.get("weather") or [{}])[0]
+        steps.append({
+            "dt": item.get("dt"),
+            "temp": main.get("temp"),
+            "humidity": main.get("humidity"),
+            "description": wx.get("description"),
+            "icon": wx.get("icon"),
+            "pop": item.get("pop"),
+            "wind_speed": (item.get("wind") or {}).get("speed"),
+        })
+    return steps
+
+
+def get_short_forecast(lat: float, lon: float) -> List[Dict[str, Any]]:
+    """Next ~24 h in 3-hour steps for the tile containing (lat, lon). Raises WeatherError."""
+    tile = tile_for(lat, lon)
+    return forecast_cache.get_or_load(
+        ("forecast", tile), lambda: _compact_forecast(_fetch("forecast", tile, cnt=FORECAST_STEPS))
+    )
+
+
+def _tile_weather(tile: Tuple[float, float], include_forecast: bool) -> Dict[str, Any]:
+    out: Dict[str, Any] = {}
+    try:
+        out["current"] = get_current_weather(*tile)
+    except WeatherError as e:
+        out["error"] = e.payload.get("error") or str(e)
+    if include_forecast:
+        try:
+            out["forecast"] = get_short_forecast(*tile)
+        except WeatherError as e:
+            out.setdefault("error", e.payload.get("error") or str(e))
+    return out
+
+
+def get_weather_batch(points: List[Tuple[float, float]], include_forecast: bool = True) -> List[Dict[str, Any]]:
+    """Weather for many points: dedupe to tiles, load missing tiles on a bounded pool.
+    Returns one entry per input point, in order; per-point failures are reported inline.
+    """
+    tiles = list(dict.fromkeys(tile_for(lat, lon) for lat, lon in points))
+    workers = max(1, min(settings.WEATHER_BATCH_CONCURRENCY, len(tiles)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        by_tile = dict(zip(tiles, pool.map(lambda t: _tile_weather(t, include_forecast), tiles)))
+    results = []
+    for lat, lon in points:
+        tile = tile_for(lat, lon)
+        results.append({"lat": lat, "lon": lon, "tile": list(tile), **by_tile[tile]})
+    return results
+
+
+def weather_stats() -> Dict[str, Any]:
+    return {
+        "tile_degrees": settings.WEATHER_TILE_DEGREES,
+        "current": weather_cache.stats(),
+        "forecast": forecast_cache.stats(),
+    }
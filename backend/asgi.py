@@ -0,0 +1,17 @@
+"""
+ASGI entry point: the Flask app behind the a2wsgi adapter.
+
+    uvicorn asgi:app --workers 4        # or: SERVER_MODE=asgi python serve.py
+
+Needs ``pip install uvicorn a2wsgi``. The event loop handles sockets and
+keep-alive connections. Each request runs the Flask view, and iterates its
+response, on one of SERVER_THREADS adapter threads. A server-sent-event stream
+therefore holds a thread until it ends, just as under waitress. A process runs at
+most SERVER_THREADS requests, and so uses at most that many DB connections.
+"""
+from a2wsgi import WSGIMiddleware
+
+from app import create_app
+from app.config import settings
+
+app = WSGIMiddleware(create_app(), workers=settings.SERVER_THREADS)
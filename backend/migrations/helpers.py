@@ -0,0 +1,118 @@
+"""
+Helpers for migrations that must run against a live production database.
+
+- Every helper checks the current schema first, so a revision can be
+  re-run, or applied to a database that an older ad-hoc script or
+  ``create_all`` already changed.
+- DDL on MySQL asks for online algorithms (``LOCK=NONE``), so a change
+  that would block reads or writes fails instead of locking.
+- Data backfills run in primary-key batches, each in its own
+  transaction, so nothing holds long row locks or a huge undo log on
+  ``orders``, ``market_prices`` and similar tables.
+
+In offline mode (``alembic upgrade head --sql``) there is no connection to
+inspect. The guards are skipped and the plain DDL is emitted for review.
+"""
+from __future__ import annotations
+from typing import Iterable, List, Optional
+
+import sqlalchemy as sa
+from alembic import op
+
+
+def offline() -> bool:
+    return op.get_context().as_sql
+
+
+def dialect() -> str:
+    return op.get_context().dialect.name
+
+
+def _inspector():
+    return sa.inspect(op.get_bind())
+
+
+def has_table(table: str) -> bool:
+    return False if offline() else _inspector().has_table(table)
+
+
+def columns(table: str) -> dict:
+    return {} if offline() else {c["name"]: c for c in _inspector().get_columns(table)}
+
+
+def has_column(table: str, column: str) -> bool:
+    return column in columns(table)
+
+
+def has_index(table: str, name: str) -> bool:
+    return False if offline() else any(ix["name"] == name for ix in _inspector().get_indexes(table))
+
+
+def add_column(table: str, column: sa.Column) -> None:
+    """ADD COLUMN unless present. Use nullable columns or a server_default on big tables."""
+    if has_column(table, column.name):
+        return
+    if dialect() == "mysql":
+        ddl = sa.schema.CreateColumn(column).compile(dialect=op.get_context().dialect)
+        op.execute(f"ALTER TABLE {table} ADD COLUMN {ddl}, LOCK=NONE")
+    else:
+        op.add_column(table, column)
+
+
+def create_index(name: str, table: str, cols: List[str], unique: bool = False) -> None:
+    """Build an index without blocking writes: INPLACE/LOCK=NONE on MySQL, CONCURRENTLY on PostgreSQL."""
+    if has_index(table, name):
+        return
+    if dialect() == "mysql":
+        kind = "UNIQUE INDEX" if unique else "INDEX"
+        op.execute(f"ALTER TABLE {table} ADD {kind} {name} ({', '.join(cols)}), ALGORITHM=INPLACE, LOCK=NONE")
+    elif dialect() == "postgresql":
+        # CONCURRENTLY can't run inside the migration transaction
+        with op.get_context().autocommit_block():
+            op.create_index(name, table, cols, unique=unique, postgresql_concurrently=True)
+    else:
+        op.create_index(name, table, cols, unique=unique)
+
+
+def drop_index(name: str, table: str) -> None:
+    if not offline() and not has_index(table, name):
+        return
+    if dialect() == "mysql":
+        op.execute(f"ALTER TABLE {table} DROP INDEX {name}, ALGORITHM=INPLACE, LOCK=NONE")
+    elif dialect() == "postgresql":
+        with op.get_context().autocommit_block():
+            op.drop_index(name, table_name=table, postgresql_concurrently=True)
+    else:
+        op.drop_index(name, table_name=table)
+
+
+def batched_update(table: str, assignments: str, where: Optional[str] = None, key: str = "id",
+                   batch_size: int = 5000) -> None:
+    """``UPDATE table SET assignments [WHERE where]`` over primary-key ranges, committing each batch.
+
+    ``assignments``/``where`` are SQL fragments written against ``table`` (correlated
+    subqueries are fine). Each batch locks at most ``batch_size`` rows briefly.
+    """
+    condition = f" AND ({where})" if where else ""
+    if offline():
+        op.execute(f"UPDATE {table} SET {assignments}{' WHERE ' + where if where else ''}")
+        return
+    lo, hi = op.get_bind().execute(sa.text(f"SELECT MIN({key}), MAX({key}) FROM {table}")).one()
+    if lo is None:
+        return
+    # Each statement commits on its own instead of inside the migration transaction
+    with op.get_context().autocommit_block():
+        conn = op.get_bind()
+        for start in range(lo, hi + 1, batch_size):
+            conn.execute(sa.text(
+                f"UPDATE {table} SET {assignments} WHERE {key} >= :lo AND {key} < :hi{condition}"
+            ), {"lo": start, "hi": start + batch_size})
+
+
+def redefine_enum(table: str, column: str, values: Iterable[str], default: Optional[str] = None) -> None:
+    """MySQL: redefine an ENUM column's value list (appending values is an online, metadata-only change)."""
+    if dialect() != "mysql":
+        return
+    quoted = ",".join(f"'{v}'" for v in values)
+    default_sql = f" DEFAULT '{default}'" if default else ""
+    op.execute(f"ALTER TABLE {table} MODIFY COLUMN {column} ENUM({quoted}){default_sql}")
@@ -0,0 +1,448 @@
+"""baseline schema, replacing create_all and the ad-hoc scripts
+
+Revision ID: 0000
+Revises:
+Create Date: 2026-10-19 11:00:00
+
+Brings any database to the schema the app had before revision 0001. There
+are three cases:
+
+- On an empty database, it creates every table.
+- On a database that create_all built on boot, it finds everything
+  present and only records the revision.
+- On an older database, it adds the changes once applied by hand with
+  scripts/add_seller_id_column.py, fix_price_column.py, fix_enum_values.py,
+  sync_orders_table.py, sync_all_tables.py and migrate_*.py. Those
+  scripts are gone.
+
+So ``alembic upgrade head`` is the only command to run, whatever state a
+database is in. No separate ``alembic stamp`` is needed.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import (
+    add_column, batched_update, columns, create_index, dialect, has_column, has_table, offline, redefine_enum,
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0000"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+ORDER_STATUSES = ("CREATED", "CONFIRMED", "PROCESSING", "SHIPPED", "DELIVERED", "CANCELLED", "REFUNDED")
+PAYMENT_STATUSES = ("PENDING", "AUTHORIZED", "CAPTURED", "FAILED", "REFUNDED")
+
+
+def upgrade() -> None:
+    _create_missing_tables()
+    if not offline():
+        _bring_legacy_tables_current()
+
+
+def _create_missing_tables() -> None:
+    if not has_table("cold_storages"):
+        op.create_table('cold_storages',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('location', sa.String(length=255), nullable=False),
+        sa.Column('latitude', sa.Float(), nullable=True),
+        sa.Column('longitude', sa.Float(), nullable=True),
+        sa.Column('capacity', sa.Float(), nullable=False),
+        sa.Column('available_capacity', sa.Float(), nullable=False),
+        sa.Column('temperature_range_min', sa.Float(), nullable=False),
+        sa.Column('temperature_range_max', sa.Float(), nullable=False),
+        sa.Column('rate_per_ton_per_day', sa.Float(), nullable=False),
+        sa.Column('contact_phone', sa.String(length=20), nullable=True),
+        sa.Column('contact_email', sa.String(length=255), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+    if not has_table("inference_jobs"):
+        op.create_table('inference_jobs',
+        sa.Column('id', sa.String(length=32), nullable=False),
+        sa.Column('kind', sa.String(length=32), nullable=False),
+        sa.Column('status', sa.String(length=16), nullable=False),
+        sa.Column('user_id', sa.String(length=64), nullable=True),
+        sa.Column('params', sa.JSON(), nullable=True),
+        sa.Column('result', sa.JSON(), nullable=True),
+        sa.Column('error', sa.String(length=255), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('queue_seconds', sa.Float(), nullable=True),
+        sa.Column('run_seconds', sa.Float(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_inference_jobs_created_at'), 'inference_jobs', ['created_at'], unique=False)
+        op.create_index(op.f('ix_inference_jobs_status'), 'inference_jobs', ['status'], unique=False)
+    if not has_table("market_price_rollups"):
+        op.create_table('market_price_rollups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('bucket', sa.String(length=8), nullable=False),
+        sa.Column('bucket_start', sa.Date(), nullable=False),
+        sa.Column('commodity', sa.String(length=100), nullable=False),
+        sa.Column('state', sa.String(length=100), nullable=False),
+        sa.Column('market', sa.String(length=255), nullable=False),
+        sa.Column('min_price', sa.Float(), nullable=False),
+        sa.Column('max_price', sa.Float(), nullable=False),
+        sa.Column('modal_sum', sa.Float(), nullable=False),
+        sa.Column('samples', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('bucket', 'commodity', 'state', 'market', 'bucket_start', name='uq_market_price_rollup')
+        )
+        op.create_index('ix_market_price_rollup_lookup', 'market_price_rollups', ['bucket', 'commodity', 'state', 'bucket_start'], unique=False)
+    if not has_table("market_prices"):
+        op.create_table('market_prices',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('commodity', sa.String(length=100), nullable=False),
+        sa.Column('category', sa.String(length=50), nullable=False),
+        sa.Column('region', sa.String(length=100), nullable=False),
+        sa.Column('min_price', sa.Float(), nullable=False),
+        sa.Column('max_price', sa.Float(), nullable=False),
+        sa.Column('avg_price', sa.Float(), nullable=False),
+        sa.Column('source', sa.String(length=100), nullable=False),
+        sa.Column('state', sa.String(length=100), nullable=True),
+        sa.Column('district', sa.String(length=100), nullable=True),
+        sa.Column('market', sa.String(length=255), nullable=True),
+        sa.Column('arrival_date', sa.Date(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_market_prices_arrival_date'), 'market_prices', ['arrival_date'], unique=False)
+        op.create_index(op.f('ix_market_prices_state'), 'market_prices', ['state'], unique=False)
+    if not has_table("soil_recommendation_logs"):
+        op.create_table('soil_recommendation_logs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('user_id', sa.String(length=64), nullable=True),
+        sa.Column('request', sa.JSON(), nullable=False),
+        sa.Column('response', sa.JSON(), nullable=False),
+        sa.Column('model_name', sa.String(length=255), nullable=True),
+        sa.Column('cache_key', sa.String(length=64), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_soil_recommendation_logs_cache_key'), 'soil_recommendation_logs', ['cache_key'], unique=False)
+        op.create_index(op.f('ix_soil_recommendation_logs_id'), 'soil_recommendation_logs', ['id'], unique=False)
+    if not has_table("users"):
+        op.create_table('users',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('email', sa.String(length=255), nullable=True),
+        sa.Column('phone', sa.String(length=20), nullable=True),
+        sa.Column('name', sa.String(length=255), nullable=True),
+        sa.Column('role', sa.String(length=32), nullable=False),
+        sa.Column('password_hash', sa.String(length=255), nullable=False),
+        sa.Column('locale', sa.String(length=10), nullable=True),
+        sa.Column('aadhaar_number', sa.String(length=20), nullable=True),
+        sa.Column('pan_number', sa.String(length=20), nullable=True),
+        sa.Column('is_approved', sa.Boolean(), nullable=True),
+        sa.Column('company_name', sa.String(length=255), nullable=True),
+        sa.Column('gst_number', sa.String(length=64), nullable=True),
+        sa.Column('service_categories', sa.JSON(), nullable=True),
+        sa.Column('verification_status', sa.String(length=32), nullable=False),
+        sa.Column('address', sa.Text(), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_users_email'), 'users', ['email'], unique=True)
+        op.create_index(op.f('ix_users_phone'), 'users', ['phone'], unique=True)
+    if not has_table("cold_storage_bookings"):
+        op.create_table('cold_storage_bookings',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('farmer_id', sa.Integer(), nullable=False),
+        sa.Column('cold_storage_id', sa.Integer(), nullable=False),
+        sa.Column('commodity', sa.String(length=100), nullable=False),
+        sa.Column('quantity', sa.Float(), nullable=False),
+        sa.Column('start_date', sa.DateTime(), nullable=False),
+        sa.Column('end_date', sa.DateTime(), nullable=False),
+        sa.Column('status', sa.Enum('PENDING', 'CONFIRMED', 'ACTIVE', 'COMPLETED', 'CANCELLED', name='bookingstatus'), nullable=True),
+        sa.Column('rate_per_ton_per_day', sa.Float(), nullable=False),
+        sa.Column('total_amount', sa.Float(), nullable=False),
+        sa.Column('payment_status', sa.Enum('PENDING', 'AUTHORIZED', 'CAPTURED', 'FAILED', 'REFUNDED', name='paymentstatus'), nullable=True),
+        sa.Column('razorpay_order_id', sa.String(length=64), nullable=True),
+        sa.ForeignKeyConstraint(['cold_storage_id'], ['cold_storages.id'], ),
+        sa.ForeignKeyConstraint(['farmer_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+    if not has_table("equipments"):
+        op.create_table('equipments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('owner_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(length=255), nullable=False),
+        sa.Column('category', sa.String(length=100), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('location', sa.String(length=255), nullable=False),
+        sa.Column('latitude', sa.Float(), nullable=True),
+        sa.Column('longitude', sa.Float(), nullable=True),
+        sa.Column('rate_per_hour', sa.Float(), nullable=True),
+        sa.Column('rate_per_day', sa.Float(), nullable=True),
+        sa.Column('availability', sa.Boolean(), nullable=True),
+        sa.Column('images', sa.JSON(), nullable=True),
+        sa.Column('contact_phone', sa.String(length=20), nullable=True),
+        sa.ForeignKeyConstraint(['owner_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+    if not has_table("orders"):
+        op.create_table('orders',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('buyer_id', sa.Integer(), nullable=False),
+        sa.Column('seller_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.Enum('CREATED', 'CONFIRMED', 'PROCESSING', 'SHIPPED', 'DELIVERED', 'CANCELLED', 'REFUNDED', name='orderstatus'), nullable=True),
+        sa.Column('payment_status', sa.Enum('PENDING', 'AUTHORIZED', 'CAPTURED', 'FAILED', 'REFUNDED', name='paymentstatus'), nullable=True),
+        sa.Column('subtotal', sa.Float(), nullable=False),
+        sa.Column('delivery_charges', sa.Float(), nullable=True),
+        sa.Column('total_amount', sa.Float(), nullable=False),
+        sa.Column('delivery_address', sa.Text(), nullable=True),
+        sa.Column('delivery_phone', sa.String(length=20), nullable=True),
+        sa.Column('delivery_scheduled_at', sa.DateTime(), nullable=True),
+        sa.Column('delivered_at', sa.DateTime(), nullable=True),
+        sa.Column('razorpay_order_id', sa.String(length=64), nullable=True),
+        sa.Column('razorpay_payment_id', sa.String(length=64), nullable=True),
+        sa.ForeignKeyConstraint(['buyer_id'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['seller_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_orders_razorpay_order_id'), 'orders', ['razorpay_order_id'], unique=False)
+    if not has_table("payment_sessions"):
+        op.create_table('payment_sessions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('buyer_id', sa.Integer(), nullable=False),
+        sa.Column('razorpay_order_id', sa.String(length=64), nullable=False),
+        sa.Column('currency', sa.String(length=8), nullable=False),
+        sa.Column('amount', sa.Float(), nullable=False),
+        sa.Column('cart_snapshot', sa.JSON(), nullable=True),
+        sa.ForeignKeyConstraint(['buyer_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index(op.f('ix_payment_sessions_razorpay_order_id'), 'payment_sessions', ['razorpay_order_id'], unique=True)
+    if not has_table("products"):
+        op.create_table('products',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('seller_id', sa.Integer(), nullable=False),
+        sa.Column('title', sa.String(length=255), nullable=False),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('category', sa.String(length=100), nullable=True),
+        sa.Column('price', sa.Float(), nullable=False),
+        sa.Column('unit', sa.String(length=50), nullable=True),
+        sa.Column('stock', sa.Float(), nullable=False),
+        sa.Column('location', sa.String(length=255), nullable=True),
+        sa.Column('image_url', sa.String(length=512), nullable=True),
+        sa.Column('status', sa.String(length=50), nullable=True),
+        sa.ForeignKeyConstraint(['seller_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+    if not has_table("cart_items"):
+        op.create_table('cart_items',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+    if not has_table("conversations"):
+        op.create_table('conversations',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('farmer_id', sa.Integer(), nullable=False),
+        sa.Column('customer_id', sa.Integer(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.ForeignKeyConstraint(['customer_id'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['farmer_id'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+    if not has_table("equipment_bookings"):
+        op.create_table('equipment_bookings',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('farmer_id', sa.Integer(), nullable=False),
+        sa.Column('equipment_id', sa.Integer(), nullable=False),
+        sa.Column('start_datetime', sa.DateTime(), nullable=False),
+        sa.Column('end_datetime', sa.DateTime(), nullable=False),
+        sa.Column('status', sa.Enum('PENDING', 'CONFIRMED', 'ACTIVE', 'COMPLETED', 'CANCELLED', name='bookingstatus'), nullable=True),
+        sa.Column('total_hours', sa.Float(), nullable=False),
+        sa.Column('rate_per_hour', sa.Float(), nullable=False),
+        sa.Column('total_amount', sa.Float(), nullable=False),
+        sa.Column('payment_status', sa.Enum('PENDING', 'AUTHORIZED', 'CAPTURED', 'FAILED', 'REFUNDED', name='paymentstatus'), nullable=True),
+        sa.Column('razorpay_order_id', sa.String(length=64), nullable=True),
+        sa.ForeignKeyConstraint(['equipment_id'], ['equipments.id'], ),
+        sa.ForeignKeyConstraint(['farmer_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+    if not has_table("equipmetal_equipments"):
+        op.create_table('equipmetal_equipments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('provider_id', sa.Integer(), nullable=False),
+        sa.Column('equipment_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['equipment_id'], ['equipments.id'], ),
+        sa.ForeignKeyConstraint(['provider_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('equipment_id')
+        )
+    if not has_table("farmer_reviews"):
+        op.create_table('farmer_reviews',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('farmer_id', sa.Integer(), nullable=False),
+        sa.Column('buyer_id', sa.Integer(), nullable=False),
+        sa.Column('order_id', sa.Integer(), nullable=False),
+        sa.Column('rating', sa.Integer(), nullable=False),
+        sa.Column('review_text', sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(['buyer_id'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['farmer_id'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['order_id'], ['orders.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+    if not has_table("order_items"):
+        op.create_table('order_items',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('order_id', sa.Integer(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('quantity', sa.Float(), nullable=False),
+        sa.Column('price_per_unit', sa.Float(), nullable=False),
+        sa.Column('total_price', sa.Float(), nullable=False),
+        sa.ForeignKeyConstraint(['order_id'], ['orders.id'], ),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+    if not has_table("pricing_insights"):
+        op.create_table('pricing_insights',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('farmer_id', sa.Integer(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=True),
+        sa.Column('commodity', sa.String(length=100), nullable=False),
+        sa.Column('current_market_price', sa.Float(), nullable=False),
+        sa.Column('suggested_price', sa.Float(), nullable=False),
+        sa.Column('confidence_score', sa.Float(), nullable=False),
+        sa.Column('reasoning', sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(['farmer_id'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+    if not has_table("product_reviews"):
+        op.create_table('product_reviews',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('buyer_id', sa.Integer(), nullable=False),
+        sa.Column('order_id', sa.Integer(), nullable=False),
+        sa.Column('rating', sa.Integer(), nullable=False),
+        sa.Column('review_text', sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(['buyer_id'], ['users.id'], ),
+        sa.ForeignKeyConstraint(['order_id'], ['orders.id'], ),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+    if not has_table("messages"):
+        op.create_table('messages',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('conversation_id', sa.Integer(), nullable=False),
+        sa.Column('sender_id', sa.Integer(), nullable=False),
+        sa.Column('message_text', sa.Text(), nullable=False),
+        sa.Column('is_read', sa.Boolean(), nullable=True),
+        sa.ForeignKeyConstraint(['conversation_id'], ['conversations.id'], ),
+        sa.ForeignKeyConstraint(['sender_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+
+
+def _bring_legacy_tables_current() -> None:
+    # users: approval and provider columns (migrate_add_user_approval_columns, migrate_add_provider_fields)
+    add_column("users", sa.Column("aadhaar_number", sa.String(length=20), nullable=True))
+    add_column("users", sa.Column("pan_number", sa.String(length=20), nullable=True))
+    add_column("users", sa.Column("is_approved", sa.Boolean(), nullable=True, server_default=sa.true()))
+    add_column("users", sa.Column("company_name", sa.String(length=255), nullable=True))
+    add_column("users", sa.Column("gst_number", sa.String(length=64), nullable=True))
+    add_column("users", sa.Column("service_categories", sa.JSON(), nullable=True))
+    add_column("users", sa.Column("verification_status", sa.String(length=32), nullable=False,
+                                  server_default="unverified"))
+    add_column("users", sa.Column("address", sa.Text(), nullable=True))
+
+    # market_prices: history columns (migrate_add_market_price_history)
+    add_column("market_prices", sa.Column("state", sa.String(length=100), nullable=True))
+    add_column("market_prices", sa.Column("district", sa.String(length=100), nullable=True))
+    add_column("market_prices", sa.Column("market", sa.String(length=255), nullable=True))
+    add_column("market_prices", sa.Column("arrival_date", sa.Date(), nullable=True))
+    create_index("ix_market_prices_state", "market_prices", ["state"])
+    create_index("ix_market_prices_arrival_date", "market_prices", ["arrival_date"])
+
+    # soil_recommendation_logs: answer cache key (migrate_add_ai_cache_key)
+    add_column("soil_recommendation_logs", sa.Column("cache_key", sa.String(length=64), nullable=True))
+    create_index("ix_soil_recommendation_logs_cache_key", "soil_recommendation_logs", ["cache_key"])
+
+    # order_items: the old `price` column became price_per_unit (fix_price_column)
+    item_columns = columns("order_items")
+    if "price" in item_columns:
+        if "price_per_unit" in item_columns:
+            op.drop_column("order_items", "price")
+        else:
+            op.alter_column("order_items", "price", new_column_name="price_per_unit",
+                            existing_type=sa.Float(), existing_nullable=False)
+
+    # orders: seller_id (add_seller_id_column, sync_orders_table). Expand, backfill in
+    # batches from the order's first item, then enforce NOT NULL and the foreign key.
+    if not has_column("orders", "seller_id"):
+        add_column("orders", sa.Column("seller_id", sa.Integer(), nullable=True))
+        batched_update(
+            "orders",
+            "seller_id = (SELECT p.seller_id FROM order_items oi JOIN products p ON p.id = oi.product_id "
+            "WHERE oi.order_id = orders.id ORDER BY oi.id LIMIT 1)",
+            where="seller_id IS NULL",
+        )
+        with op.batch_alter_table("orders") as batch:
+            batch.alter_column("seller_id", existing_type=sa.Integer(), nullable=False)
+            batch.create_foreign_key("fk_orders_seller_id", "users", ["seller_id"], ["id"])
+    add_column("orders", sa.Column("payment_status", sa.Enum(*PAYMENT_STATUSES, name="paymentstatus"),
+                                   nullable=True, server_default="PENDING"))
+
+    # orders: lowercase MySQL ENUM values from before the enums were uppercased (fix_enum_values).
+    # Redefining the value list rebuilds the table; it only runs on databases that still need it.
+    if dialect() == "mysql":
+        order_columns = columns("orders")
+        for column, values, default in (("status", ORDER_STATUSES, "CREATED"),
+                                        ("payment_status", PAYMENT_STATUSES, "PENDING")):
+            enums = getattr(order_columns[column]["type"], "enums", None) or []
+            if any(v != v.upper() for v in enums):
+                redefine_enum("orders", column, values, default=default)
+
+
+def downgrade() -> None:
+    op.drop_table("messages")
+    op.drop_table("product_reviews")
+    op.drop_table("pricing_insights")
+    op.drop_table("order_items")
+    op.drop_table("farmer_reviews")
+    op.drop_table("equipmetal_equipments")
+    op.drop_table("equipment_bookings")
+    op.drop_table("conversations")
+    op.drop_table("cart_items")
+    op.drop_table("products")
+    op.drop_table("payment_sessions")
+    op.drop_table("orders")
+    op.drop_table("equipments")
+    op.drop_table("cold_storage_bookings")
+    op.drop_table("users")
+    op.drop_table("soil_recommendation_logs")
+    op.drop_table("market_prices")
+    op.drop_table("market_price_rollups")
+    op.drop_table("inference_jobs")
+    op.drop_table("cold_storages")
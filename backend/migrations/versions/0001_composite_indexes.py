@@ -0,0 +1,64 @@
+"""composite indexes for marketplace, order, review and messaging queries
+
+Revision ID: 0001
+Revises: 0000
+Create Date: 2026-10-19 09:30:00
+
+Chosen from the query shapes in the route modules:
+
+- products: active listing sorted by age, category counts of active
+  listings, and a seller's own listings.
+- orders: seller and buyer order lists and dashboards, which filter by
+  party and created_at; admin and market reports, which filter by status
+  and a created_at range.
+- order_items: order.items loads, and product -> order_items -> orders
+  joins in the sales reports.
+- reviews: per-product and per-farmer lists, newest first, and their
+  averages.
+- messages and conversations: inbox and thread pages.
+- cart_items: cart loads and the "already in cart" check.
+- equipment_bookings: availability checks by equipment, status and end
+  time.
+
+Indexes that already exist are skipped. This covers databases created
+by ``create_all`` from models that declare them. The build is online:
+ALGORITHM=INPLACE, LOCK=NONE on MySQL, CONCURRENTLY on PostgreSQL.
+"""
+from typing import Sequence, Union
+
+from migrations.helpers import create_index, drop_index
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = "0000"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_products_status_created", "products", ["status", "created_at"]),
+    ("ix_products_status_category", "products", ["status", "category"]),
+    ("ix_products_seller_status", "products", ["seller_id", "status"]),
+    ("ix_cart_items_user_product", "cart_items", ["user_id", "product_id"]),
+    ("ix_orders_seller_created", "orders", ["seller_id", "created_at"]),
+    ("ix_orders_buyer_created", "orders", ["buyer_id", "created_at"]),
+    ("ix_orders_status_created", "orders", ["status", "created_at"]),
+    ("ix_order_items_order", "order_items", ["order_id"]),
+    ("ix_order_items_product_order", "order_items", ["product_id", "order_id"]),
+    ("ix_product_reviews_product_created", "product_reviews", ["product_id", "created_at"]),
+    ("ix_farmer_reviews_farmer_created", "farmer_reviews", ["farmer_id", "created_at"]),
+    ("ix_equipment_bookings_equipment_status_end", "equipment_bookings", ["equipment_id", "status", "end_datetime"]),
+    ("ix_conversations_farmer_updated", "conversations", ["farmer_id", "updated_at"]),
+    ("ix_conversations_customer_updated", "conversations", ["customer_id", "updated_at"]),
+    ("ix_messages_conversation_created", "messages", ["conversation_id", "created_at"]),
+]
+
+
+def upgrade() -> None:
+    for name, table, columns in INDEXES:
+        create_index(name, table, columns)
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        drop_index(name, table)
@@ -1,9 +1,10 @@
 #!/usr/bin/env python3
 """
-Simple Flask application runner for testing APIs
+Simple Flask application runner for testing APIs (dev server; use serve.py in production)
 """
 
 from app import create_app
+from app.config import settings
 
 if __name__ == "__main__":
     app = create_app()
@@ -11,4 +12,4 @@ if __name__ == "__main__":
     print("Server will be available at: http://localhost:5000")
     print("API Base URL: http://localhost:5000/api/v1/")
     print("Health Check: http://localhost:5000/health")
-    app.run(debug=True, host="0.0.0.0", port=5000)
\ No newline at end of file
+    app.run(debug=settings.ENV == "development", host="0.0.0.0", port=5000)
\ No newline at end of file
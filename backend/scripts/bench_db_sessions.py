@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Concurrent load against the app under waitress, reporting throughput, latency
+and database connection checkouts per request.
+
+Usage:
+    python scripts/bench_db_sessions.py [--clients 32] [--threads 16] [--seconds 10] [--legacy]
+    DATABASE_URL=mysql+pymysql://... python scripts/bench_db_sessions.py --path /api/v1/marketplace/categories
+
+Without DATABASE_URL a temporary SQLite database seeded with products is used.
+``--legacy`` restores the old behaviour of a fresh session per ``get_db()`` loop
+for comparison with the request-scoped session.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+if not os.getenv("DATABASE_URL"):
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+
+from sqlalchemy import event
+from waitress.server import create_server
+
+from app import create_app
+from app import db as db_module
+from app.db import Base
+from app.models import Product, User
+
+DEFAULT_PATHS = ["/api/v1/marketplace/products?limit=20", "/api/v1/marketplace/categories"]
+
+
+def seed(count=200):
+    session = db_module.new_session()
+    try:
+        if session.query(Product).count():
+            return
+        seller = User(email="bench-seller@example.com", name="Bench Seller", role="farmer", password_hash="x")
+        session.add(seller)
+        session.flush()
+        for i in range(count):
+            session.add(Product(seller_id=seller.id, title=f"Produce {i}", category=["grains", "vegetables", "fruits"][i % 3],
+                                price=10 + i % 50, unit="kg", stock=100, location="Nagpur", status="active"))
+        session.commit()
+    finally:
+        session.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Request-scoped DB session load test")
+    parser.add_argument("--clients", type=int, default=32, help="concurrent client connections")
+    parser.add_argument("--threads", type=int, default=16, help="waitress worker threads")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=8799)
+    parser.add_argument("--path", action="append", help="endpoint(s) to hit, round-robin")
+    parser.add_argument("--legacy", action="store_true", help="one session per get_db() loop, as before")
+    args = parser.parse_args()
+
+    app = create_app()
+    Base.metadata.create_all(db_module._engine)
+    seed()
+    if args.legacy:
+        db_module.has_app_context = lambda: False
+
+    checkouts = [0]
+    lock = threading.Lock()
+
+    def on_checkout(*_):
+        with lock:
+            checkouts[0] += 1
+
+    event.listen(db_module._engine, "checkout", on_checkout)
+
+    server = create_server(app, host="127.0.0.1", port=args.port, threads=args.threads)
+    threading.Thread(target=server.run, daemon=True).start()
+    time.sleep(0.3)
+
+    paths = args.path or DEFAULT_PATHS
+    base = f"http://127.0.0.1:{args.port}"
+    deadline = time.monotonic() + args.seconds
+    latencies, errors = [], [0]
+
+    def client_loop(n):
+        with httpx.Client(base_url=base, timeout=30) as client:
+            i = n
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                try:
+                    r = client.get(paths[i % len(paths)])
+                    ok = r.status_code < 500
+                except httpx.HTTPError:
+                    ok = False
+                elapsed = time.perf_counter() - started
+                with lock:
+                    latencies.append(elapsed)
+                    if not ok:
+                        errors[0] += 1
+                i += 1
+
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=args.clients) as pool:
+        list(pool.map(client_loop, range(args.clients)))
+    wall = time.monotonic() - started
+    server.close()
+
+    latencies.sort()
+    n = len(latencies)
+    pick = lambda q: latencies[min(n - 1, int(q * n))] * 1000 if n else 0.0
+    mode = "legacy per-call sessions" if args.legacy else "request-scoped session"
+    print(f"{mode}: {n} requests in {wall:.1f}s with {args.clients} clients / {args.threads} waitress threads")
+    print(f"  throughput   {n / wall:8.1f} req/s   errors {errors[0]}")
+    print(f"  latency ms   p50 {pick(0.5):.1f}  p95 {pick(0.95):.1f}  p99 {pick(0.99):.1f}")
+    print(f"  connection checkouts per request {checkouts[0] / max(n, 1):.2f}")
+    print(f"  pool: {db_module._engine.pool.status()}")
+
+
+if __name__ == "__main__":
+    main()
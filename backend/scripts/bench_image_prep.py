@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Bytes sent and latency for Gemini vision requests with and without image preprocessing.
+
+Usage:
+    python scripts/bench_image_prep.py [photo.jpg ...] [--uplink-mbps 5] [--live]
+
+Without paths, a synthetic 12 MP phone-style JPEG (with an EXIF orientation
+tag) is generated. For each image it reports the raw upload size, the
+base64 inline request body sent to Gemini before and after
+``prepare_for_vision``, the preprocessing time, and end-to-end latency:
+estimated from body size at ``--uplink-mbps`` by default, or measured
+against the real API with ``--live`` (needs GEMINI_API_KEY).
+"""
+import argparse
+import base64
+import io
+import json
+import os
+import sys
+import time
+
+import numpy as np
+from PIL import Image
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from app.services.image_prep import prepare_for_vision
+from app.services.gemini_image import _rest_generate_with_image
+
+PROMPT = "Identify the most likely crop disease in this photo. Respond with JSON only."
+
+
+def synthetic_photo(width=4000, height=3000):
+    """Smooth leaf-like gradients plus sensor noise, saved like a phone camera would."""
+    y, x = np.mgrid[0:height, 0:width].astype(np.float32)
+    r = 60 + 40 * np.sin(x / 370.0) + 20 * np.cos(y / 210.0)
+    g = 120 + 60 * np.sin((x + y) / 520.0)
+    b = 40 + 30 * np.cos(x / 150.0)
+    rgb = np.stack([r, g, b], axis=-1) + np.random.default_rng(0).normal(0, 6, (height, width, 3))
+    img = Image.fromarray(np.clip(rgb, 0, 255).astype(np.uint8), "RGB")
+    exif = Image.Exif()
+    exif[0x0112] = 6  # rotated 90 degrees, as portrait phone shots usually are
+    out = io.BytesIO()
+    img.save(out, format="JPEG", quality=92, exif=exif.tobytes())
+    return out.getvalue()
+
+
+def body_bytes(image_bytes, mime_type):
+    payload = {"contents": [{"role": "user", "parts": [
+        {"text": PROMPT},
+        {"inline_data": {"mime_type": mime_type, "data": base64.b64encode(image_bytes).decode("ascii")}},
+    ]}]}
+    return len(json.dumps(payload).encode("utf-8"))
+
+
+def live_latency(image_bytes, mime_type):
+    started = time.perf_counter()
+    _rest_generate_with_image(PROMPT, base64.b64encode(image_bytes).decode("ascii"), mime_type)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vision image preprocessing benchmark")
+    parser.add_argument("paths", nargs="*")
+    parser.add_argument("--uplink-mbps", type=float, default=5.0, help="assumed upstream bandwidth")
+    parser.add_argument("--repeat", type=int, default=5, help="preprocessing runs per image")
+    parser.add_argument("--live", action="store_true", help="call Gemini for real (needs GEMINI_API_KEY)")
+    args = parser.parse_args()
+
+    images = [(p, open(p, "rb").read()) for p in args.paths] or [("synthetic-12MP.jpg", synthetic_photo())]
+    bytes_per_s = args.uplink_mbps * 1e6 / 8
+    for name, raw in images:
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            prepared = prepare_for_vision(raw, "image/jpeg")
+            timings.append(time.perf_counter() - started)
+        prep_s = sorted(timings)[len(timings) // 2]
+        before = body_bytes(raw, "image/jpeg")
+        after = body_bytes(prepared.data, prepared.mime_type)
+
+        print(f"\n{name}")
+        print(f"  upload            {len(raw) / 1e6:8.2f} MB")
+        print(f"  sent as-is        {before / 1e6:8.2f} MB request body")
+        print(f"  preprocessed      {after / 1e6:8.2f} MB request body "
+              f"({prepared.width}x{prepared.height}, {before / max(after, 1):.0f}x smaller)")
+        print(f"  preprocessing     {prep_s * 1000:8.1f} ms (median of {args.repeat})")
+        if args.live:
+            t_before = live_latency(raw, "image/jpeg")
+            t_after = live_latency(prepared.data, prepared.mime_type) + prep_s
+            print(f"  end-to-end (live) {t_before:8.2f} s -> {t_after:.2f} s")
+        else:
+            t_before = before / bytes_per_s
+            t_after = after / bytes_per_s + prep_s
+            print(f"  upload time @ {args.uplink_mbps:g} Mbps {t_before:6.2f} s -> {t_after:.2f} s (incl. preprocessing)")
+
+
+if __name__ == "__main__":
+    main()
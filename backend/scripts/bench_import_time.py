@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Cold-start cost of ``create_app`` as a fresh worker process pays it.
+
+Usage:
+    python scripts/bench_import_time.py [--runs 5] [--budget-ms 2000] [--top 15]
+    python scripts/bench_import_time.py --baseline-ref origin/main [--max-regression 0.25]
+
+Each run starts a new interpreter with ``python -X importtime``, imports the
+app and calls ``create_app()``, the same work a waitress or gunicorn worker
+does before it can serve. The script parses the ``-X importtime`` report on
+stderr and prints:
+- the median cumulative import time of ``app``;
+- the median wall time of the whole process;
+- the slowest top-level imports.
+
+The script exits 1 if any of these is true:
+- the median import time is over ``--budget-ms``;
+- with ``--baseline-ref``, the median is more than ``--max-regression``
+  slower than the given git ref. That ref is checked out into a temporary
+  worktree and measured in alternating runs on the same machine;
+- one of the SDKs that should load lazily (``LAZY``) is imported at
+  startup.
+
+Absolute timings move a lot with machine load: the same tree measured
+between 480 and 1200 ms on one machine. The default budget is therefore only
+a coarse ceiling. For CI, prefer ``--baseline-ref``, which compares against
+another ref on the same machine in the same minute.
+"""
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+BACKEND = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+SNIPPET = "from app import create_app; create_app()"
+# Only needed by specific routes; each is imported on first use
+LAZY = ("google.generativeai", "razorpay", "cloudinary", "requests")
+
+
+def parse_importtime(stderr):
+    """{module: (self_us, cumulative_us, depth)} from ``-X importtime`` output."""
+    out = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        out.setdefault(name.strip(), (int(self_us), int(cumulative), depth))
+    return out
+
+
+def run_once(cwd=BACKEND):
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite://")
+    started = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", SNIPPET],
+                          cwd=cwd, env=env, capture_output=True, text=True)
+    wall = time.perf_counter() - started
+    if proc.returncode != 0:
+        sys.exit(proc.stderr[-2000:])
+    return wall, parse_importtime(proc.stderr)
+
+
+def baseline_worktree(ref):
+    """Temporary checkout of ``ref``; returns (backend dir, cleanup)."""
+    path = tempfile.mkdtemp(prefix="importtime-")
+    shutil.rmtree(path)
+    subprocess.run(["git", "worktree", "add", "--detach", "-q", path, ref], cwd=BACKEND, check=True)
+
+    def cleanup():
+        subprocess.run(["git", "worktree", "remove", "--force", path], cwd=BACKEND, check=False)
+    return os.path.join(path, "backend"), cleanup
+
+
+def main():
+    parser = argparse.ArgumentParser(description="create_app cold-start import time")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=2000.0,
+                        help="fail above this median app import time (coarse; see --baseline-ref)")
+    parser.add_argument("--baseline-ref", help="git ref to measure alongside this tree, e.g. origin/main")
+    parser.add_argument("--max-regression", type=float, default=0.25,
+                        help="with --baseline-ref, fail if slower than the baseline by more than this fraction")
+    parser.add_argument("--top", type=int, default=15, help="slowest top-level imports to list")
+    args = parser.parse_args()
+
+    baseline_dir, cleanup = baseline_worktree(args.baseline_ref) if args.baseline_ref else (None, None)
+    walls, app_ms, per_module = [], [], defaultdict(list)
+    baseline_ms = []
+    modules = {}
+    try:
+        for _ in range(args.runs):
+            if baseline_dir:
+                # Alternate with the current tree so both see the same machine load
+                baseline_ms.append(run_once(baseline_dir)[1]["app"][1] / 1000)
+            wall, modules = run_once()
+            walls.append(wall * 1000)
+            app_ms.append(modules["app"][1] / 1000)
+            for name, (_, cumulative, depth) in modules.items():
+                if depth <= 1:
+                    per_module[name].append(cumulative / 1000)
+    finally:
+        if cleanup:
+            cleanup()
+
+    slowest = sorted(((statistics.median(v), k) for k, v in per_module.items()), reverse=True)
+    print(f"slowest top-level imports (median of {args.runs} runs):")
+    for ms, name in slowest[:args.top]:
+        print(f"  {ms:8.1f} ms  {name}")
+
+    median_app = statistics.median(app_ms)
+    print(f"\nimport app (cumulative):  {median_app:.1f} ms   budget {args.budget_ms:.0f} ms")
+    print(f"process wall time:        {statistics.median(walls):.1f} ms")
+    print(f"modules imported:         {len(modules)}")
+
+    failed = False
+    if baseline_dir:
+        base = statistics.median(baseline_ms)
+        limit = base * (1 + args.max_regression)
+        print(f"baseline {args.baseline_ref}:  {base:.1f} ms   limit {limit:.1f} ms "
+              f"({(median_app / base - 1) * 100:+.0f}%)")
+        if median_app > limit:
+            print(f"FAIL: more than {args.max_regression:.0%} slower than {args.baseline_ref}")
+            failed = True
+
+    eager = [m for m in LAZY if m in modules]
+    if eager:
+        print(f"FAIL: imported at startup but should be lazy: {', '.join(eager)}")
+    if median_app > args.budget_ms:
+        print("FAIL: over budget")
+    sys.exit(1 if failed or eager or median_app > args.budget_ms else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Serialization time of API responses under each JSON provider.
+
+Usage:
+    python scripts/bench_json.py [--sizes 100 10000] [--repeat 20]
+
+Each payload is a list of product listings or orders shaped like the
+``list_products`` and ``get_user_orders`` responses. An order carries a
+datetime, two enums and nested items. The script times the building of a
+full ``jsonify`` response in three ways:
+- legacy: the handler pre-formats with ``.isoformat()`` and ``.value``, then
+  Flask's default provider serializes;
+- stdlib: app.json_provider.StdlibJSONProvider on the raw values;
+- orjson: app.json_provider.OrjsonProvider on the raw values. This one is
+  skipped when orjson isn't installed.
+
+It also checks that all three produce the same document.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app.json_provider import OrjsonProvider, StdlibJSONProvider, orjson
+from app.models import OrderStatus, PaymentStatus
+
+START = datetime(2026, 10, 1, 8, 30, 15, 123456)
+
+
+def product(i):
+    return {
+        "id": i, "title": f"Organic wheat lot {i}", "description": "Sharbati, sun-dried, 12% moisture",
+        "category": "grains", "price": 24.5 + i % 7, "unit": "kg", "stock": i % 50, "location": "Nagpur",
+        "image_url": f"https://res.cloudinary.com/demo/image/upload/p{i}.jpg", "seller_id": i % 97,
+        "seller_name": "Ramesh Patil", "seller_rating": 4.25, "product_rating": 4.5, "review_count": 12,
+        "created_at": START - timedelta(minutes=i), "freshness_score": 0.8, "is_available": True,
+    }
+
+
+def order(i):
+    return {
+        "id": i, "created_at": START - timedelta(hours=i), "status": OrderStatus.DELIVERED,
+        "payment_status": PaymentStatus.CAPTURED, "subtotal": 480.0, "delivery_charges": 40.0,
+        "total_amount": 520.0, "buyer_name": "Sunita Devi", "seller_name": "Ramesh Patil",
+        "delivery_address": "Ward 4, Wardha Road, Nagpur 440015",
+        "items": [{"product_id": i * 3 + k, "product_name": "Tur dal", "quantity": 2,
+                   "price_per_unit": 120.0, "total_price": 240.0} for k in range(2)],
+    }
+
+
+def preformat(row):
+    out = dict(row)
+    for key in ("created_at", "status", "payment_status"):
+        if key in out:
+            out[key] = out[key].isoformat() if key == "created_at" else out[key].value
+    return out
+
+
+def timed(app, fn, repeat):
+    samples = []
+    with app.app_context():
+        for _ in range(repeat):
+            started = time.perf_counter()
+            body = fn().get_data()
+            samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples), body
+
+
+def main():
+    parser = argparse.ArgumentParser(description="JSON provider benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 10000])
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    providers = [("legacy", DefaultJSONProvider), ("stdlib", StdlibJSONProvider)]
+    if orjson is not None:
+        providers.append(("orjson", OrjsonProvider))
+    else:
+        print("orjson not installed; skipping it")
+
+    for shape, make in (("products", product), ("orders", order)):
+        for size in args.sizes:
+            rows = [make(i) for i in range(size)]
+            baseline = None
+            print(f"\n{shape} x {size}")
+            for name, cls in providers:
+                app = Flask(__name__)
+                app.json = cls(app)
+                if name == "legacy":
+                    fn = lambda: app.json.response({shape: [preformat(r) for r in rows]})  # noqa: E731
+                else:
+                    fn = lambda: app.json.response({shape: rows})  # noqa: E731
+                ms, body = timed(app, fn, args.repeat)
+                doc = json.loads(body)
+                if baseline is None:
+                    baseline = (ms, doc)
+                elif doc != baseline[1]:
+                    sys.exit(f"{name} output differs from legacy")
+                print(f"  {name:<7} {ms:9.2f} ms  {len(body) / 1024:8.1f} KiB  {baseline[0] / ms:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Check that AI answer cache keys are stable and never fail on odd inputs.
+
+Usage:
+    python scripts/check_ai_cache_keys.py
+
+Each case builds the cache key for two soil inputs and checks whether they
+share it. Readings inside one bucket must share a key, and readings in
+different buckets must not. Non-finite readings ("inf", "nan", float('inf'))
+must produce a key instead of raising, because an exception here becomes a
+500 on /recommend/soil. Exit status is 1 if any case fails.
+"""
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from app.services.ai_cache import cache_key
+
+SOIL = {"ph": 6.8, "nitrogen": 120, "phosphorus": 40, "potassium": 150, "crop": "Wheat"}
+
+# (label, first inputs, second inputs, expect the same key)
+CASES = [
+    ("same bucket", SOIL, {**SOIL, "ph": "6.76", "crop": " wheat "}, True),
+    ("different bucket", SOIL, {**SOIL, "ph": 7.4}, False),
+    ("ignored fields", SOIL, {**SOIL, "id": "card-9", "user_id": 7, "request_id": "abc"}, True),
+    ("string inf", {**SOIL, "ph": "inf"}, {**SOIL, "ph": "Infinity"}, True),
+    ("float inf", {**SOIL, "nitrogen": float("inf")}, SOIL, False),
+    ("string nan", {**SOIL, "ph": "nan"}, {**SOIL, "ph": "NaN"}, True),
+    ("float -inf", {**SOIL, "rainfall": float("-inf")}, {**SOIL, "rainfall": "-inf"}, True),
+]
+
+
+def main():
+    failures = 0
+    for label, first, second, expect_same in CASES:
+        try:
+            same = cache_key("soil", first, "en") == cache_key("soil", second, "en")
+            ok = same == expect_same
+            detail = "same key" if same else "different keys"
+        except Exception as e:
+            ok, detail = False, f"{type(e).__name__}: {e}"
+        failures += not ok
+        print(f"{'ok' if ok else 'FAIL':<5} {label:<18} {detail}")
+    print(f"\n{len(CASES) - failures}/{len(CASES)} cases passed")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
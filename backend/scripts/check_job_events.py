@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Check that /api/v1/jobs/<id>/events polls a job this process doesn't run at SSE_POLL intervals.
+
+Usage:
+    python scripts/check_job_events.py
+
+The script inserts a queued job straight into a scratch SQLite database, the
+way a job submitted by another worker or before a restart looks. It then
+opens its event stream with a short SSE_POLL and SSE_MAX_WAIT and counts the
+``job_runner.get`` calls made while the stream is open. A correct stream
+re-reads the job about SSE_MAX_WAIT / SSE_POLL times. A stream that busy-loops
+makes thousands of calls. Exit status is 1 on a busy loop.
+"""
+import os
+import sys
+import tempfile
+import time
+import uuid
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/jobs.db"
+
+from app import create_app
+from app import db as db_module
+from app import routes_jobs
+from app.db import Base
+from app.models import InferenceJob
+from app.services.jobs import job_runner
+
+POLL = 0.1
+MAX_WAIT = 1.0
+
+
+def main():
+    app = create_app()
+    Base.metadata.create_all(db_module._engine)
+    job_id = uuid.uuid4().hex
+    with db_module.new_session() as session:
+        session.add(InferenceJob(id=job_id, kind="disease", status="queued"))
+        session.commit()
+
+    routes_jobs.SSE_POLL, routes_jobs.SSE_MAX_WAIT = POLL, MAX_WAIT
+    calls = 0
+    get = job_runner.get
+
+    def counting_get(jid):
+        nonlocal calls
+        calls += 1
+        return get(jid)
+
+    job_runner.get = counting_get
+    started = time.monotonic()
+    body = app.test_client().get(f"/api/v1/jobs/{job_id}/events").get_data(as_text=True)
+    elapsed = time.monotonic() - started
+
+    expected = MAX_WAIT / POLL
+    print(f"stream open {elapsed:.2f}s, job_runner.get called {calls} times (expected ~{expected:.0f})")
+    ok = "event: timeout" in body and calls <= expected * 1.5 + 2
+    print("ok" if ok else "FAIL: stream is not waiting SSE_POLL between checks")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+EXPLAIN the hot marketplace/order/review/messaging queries and fail on full table scans.
+
+Usage:
+    python scripts/check_query_plans.py            # scratch SQLite DB built from the models
+    DATABASE_URL=mysql+pymysql://... python scripts/check_query_plans.py --existing
+
+The queries mirror the filters and orderings used by the route modules. A
+plan step counts as a full scan when SQLite reports ``SCAN <table>`` without
+an index, or MySQL reports ``type=ALL`` with no usable key (small MySQL
+tables may be scanned by choice, so only scans with ``possible_keys`` empty
+fail). Exit status is 1 if any query falls back to a full scan, so this can
+gate CI after a migration or a model change.
+"""
+import argparse
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+if not os.getenv("DATABASE_URL"):
+    os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/plans.db"
+
+from sqlalchemy import create_engine, func, select, text
+
+from app.config import settings
+from app.db import Base
+from app.models import (
+    CartItem, Conversation, EquipmentBooking, BookingStatus, FarmerReview, Message,
+    Order, OrderItem, OrderStatus, Product, ProductReview,
+)
+
+DONE = [OrderStatus.DELIVERED, OrderStatus.SHIPPED]
+SINCE = datetime(2026, 1, 1)
+
+HOT_QUERIES = {
+    "marketplace: active listings, newest first":
+        select(Product).where(Product.status == "active").order_by(Product.created_at.desc()).limit(20),
+    "marketplace: category counts":
+        select(Product.category, func.count(Product.id)).where(Product.status == "active").group_by(Product.category),
+    "marketplace: my products":
+        select(Product).where(Product.seller_id == 1, Product.status != "deleted"),
+    "orders: seller order list":
+        select(Order).where(Order.seller_id == 1).order_by(Order.created_at.desc()),
+    "orders: buyer order list":
+        select(Order).where(Order.buyer_id == 1).order_by(Order.created_at.desc()),
+    "orders: order items for a page of orders":
+        select(OrderItem).where(OrderItem.order_id.in_([1, 2, 3])),
+    "analytics: seller revenue last 30 days":
+        select(func.sum(Order.total_amount)).where(
+            Order.seller_id == 1, Order.status.in_(DONE), Order.created_at >= SINCE),
+    "analytics: platform revenue since date":
+        select(func.sum(Order.total_amount)).where(Order.status.in_(DONE), Order.created_at >= SINCE),
+    "analytics: seller top products":
+        select(Product.id, func.sum(OrderItem.quantity)).join(OrderItem).join(Order).where(
+            Product.seller_id == 1, Order.status.in_(DONE)).group_by(Product.id),
+    "reviews: product reviews, newest first":
+        select(ProductReview).where(ProductReview.product_id == 1).order_by(ProductReview.created_at.desc()).limit(10),
+    "reviews: farmer average rating":
+        select(func.avg(FarmerReview.rating)).where(FarmerReview.farmer_id == 1),
+    "messages: conversation page":
+        select(Message).where(Message.conversation_id == 1).order_by(Message.created_at.desc()).limit(50),
+    "messages: unread count":
+        select(func.count(Message.id)).where(
+            Message.conversation_id == 1, Message.sender_id != 2, Message.is_read == False),  # noqa: E712
+    "messages: farmer inbox":
+        select(Conversation).where(Conversation.farmer_id == 1, Conversation.is_active == True)  # noqa: E712
+        .order_by(Conversation.updated_at.desc()),
+    "cart: items for user":
+        select(CartItem).where(CartItem.user_id == 1),
+    "equipment: upcoming bookings":
+        select(EquipmentBooking).where(
+            EquipmentBooking.equipment_id == 1,
+            EquipmentBooking.status.in_([BookingStatus.CONFIRMED, BookingStatus.ACTIVE]),
+            EquipmentBooking.end_datetime >= SINCE + timedelta(days=1)),
+}
+
+
+def explain(conn, stmt):
+    """Returns (plan lines, full-scan tables)."""
+    sql = str(stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+    if conn.dialect.name == "sqlite":
+        rows = conn.execute(text("EXPLAIN QUERY PLAN " + sql)).all()
+        lines = [r[-1] for r in rows]
+        scans = [d.split()[1] for d in lines if d.startswith("SCAN ") and " INDEX " not in d
+                 and not d.startswith("SCAN CONSTANT")]
+        return lines, scans
+    rows = conn.execute(text("EXPLAIN " + sql)).mappings().all()
+    lines = [f"{r['table']}: type={r['type']} key={r['key']} rows={r['rows']}" for r in rows]
+    scans = [r["table"] for r in rows if r["type"] == "ALL" and not r["possible_keys"]]
+    return lines, scans
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fail if a hot query plans a full table scan")
+    parser.add_argument("--existing", action="store_true",
+                        help="check the schema already in DATABASE_URL instead of creating it from the models")
+    parser.add_argument("-v", "--verbose", action="store_true", help="print every plan")
+    args = parser.parse_args()
+
+    engine = create_engine(settings.DATABASE_URL, future=True)
+    if not args.existing:
+        Base.metadata.create_all(engine)
+
+    failures = 0
+    with engine.connect() as conn:
+        for label, stmt in HOT_QUERIES.items():
+            lines, scans = explain(conn, stmt)
+            status = "FULL SCAN " + ",".join(scans) if scans else "ok"
+            failures += bool(scans)
+            print(f"{status:<24} {label}")
+            if args.verbose or scans:
+                for line in lines:
+                    print(f"{'':<24}   {line}")
+    print(f"\n{len(HOT_QUERIES) - failures}/{len(HOT_QUERIES)} hot queries use an index")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
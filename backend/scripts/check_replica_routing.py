@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Local check of read-replica routing with one primary and two replica databases.
+
+Usage:
+    python scripts/check_replica_routing.py
+    DATABASE_URL=mysql+pymysql://.../primary \\
+    DATABASE_REPLICA_URLS=mysql+pymysql://.../replica1,mysql+pymysql://.../replica2 \\
+        python scripts/check_replica_routing.py --no-seed
+
+Without DATABASE_URL, three SQLite files are used: the primary is seeded,
+copied to both replicas, and then given one more listing that the replicas
+"haven't replicated yet". Read-only endpoints should then report the
+replica's count, and the primary's once they fall back. It simulates one
+lagging replica and then both, to show the fallback to the primary.
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+if not os.getenv("DATABASE_URL"):
+    tmp = tempfile.mkdtemp()
+    os.environ["DATABASE_URL"] = f"sqlite:///{tmp}/primary.db"
+    os.environ["DATABASE_REPLICA_URLS"] = f"sqlite:///{tmp}/replica1.db,sqlite:///{tmp}/replica2.db"
+
+from app import create_app
+from app import db as db_module
+from app.db import Base
+from app.models import Product, User
+from app.services.metrics import counter
+
+sessions = counter("db_request_sessions_total", "", ["target"])
+
+
+def add_product(session, seller, title):
+    session.add(Product(seller_id=seller.id, title=title, category="grains", price=20, unit="kg",
+                        stock=10, location="Nagpur", status="active"))
+
+
+def seed_sqlite():
+    Base.metadata.create_all(db_module._engine)
+    session = db_module.new_session()
+    try:
+        seller = User(email="replica-seller@example.com", name="Replica Seller", role="farmer", password_hash="x")
+        session.add(seller)
+        session.flush()
+        for i in range(3):
+            add_product(session, seller, f"Wheat {i}")
+        session.commit()
+        primary = db_module._engine.url.database
+        for replica in db_module._replicas:
+            replica.engine.dispose()
+            shutil.copyfile(primary, replica.engine.url.database)
+        # Written after the "snapshot": only the primary has it
+        add_product(session, seller, "Fresh wheat")
+        session.commit()
+    finally:
+        session.close()
+
+
+def snapshot():
+    values = dict(sessions.samples())
+    return {t: values.get((t,), 0.0) for t in ("primary", "replica")}
+
+
+def run(client, label, n=6):
+    before = snapshot()
+    totals = set()
+    for _ in range(n):
+        r = client.get("/api/v1/marketplace/products?limit=1")
+        assert r.status_code == 200, r.get_data(as_text=True)
+        totals.add(r.get_json()["pagination"]["total"])
+    after = snapshot()
+    served = {t: after[t] - before[t] for t in after}
+    print(f"{label:<28} primary={served['primary']:<3.0f} replica={served['replica']:<3.0f} totals seen={sorted(totals)}")
+    return served
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Read-replica routing check")
+    parser.add_argument("--no-seed", action="store_true", help="use existing databases as they are")
+    args = parser.parse_args()
+
+    app = create_app()
+    if not db_module._replicas:
+        sys.exit("DATABASE_REPLICA_URLS is not set")
+    if not args.no_seed:
+        seed_sqlite()
+    client = app.test_client()
+
+    served = run(client, "all replicas healthy")
+    assert served["replica"] and not served["primary"]
+
+    # Simulate replication lag above DB_REPLICA_MAX_LAG
+    probes = [r._probe for r in db_module._replicas]
+    for replica in db_module._replicas[:1]:
+        replica._probe, replica.checked_at = (lambda: 3600.0), 0.0
+    served = run(client, "first replica lagging")
+    assert served["replica"] and not served["primary"]
+
+    for replica in db_module._replicas:
+        replica._probe, replica.checked_at = (lambda: 3600.0), 0.0
+    served = run(client, "all replicas lagging")
+    assert served["primary"] and not served["replica"]
+
+    for replica, probe in zip(db_module._replicas, probes):
+        replica._probe, replica.checked_at = probe, 0.0
+    served = run(client, "replicas caught up")
+    assert served["replica"] and not served["primary"]
+
+    print(db_module.replica_status())
+
+
+if __name__ == "__main__":
+    main()
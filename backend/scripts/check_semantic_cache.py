@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Check that the chat semantic cache only reuses answers that are safe to reuse.
+
+Usage:
+    python scripts/check_semantic_cache.py
+
+Each case stores one question with its answer, then looks up a second
+question. A paraphrase must be served from cache. A question that differs
+in a number ("2 acres" vs "20 acres") or in negation ("should I" vs
+"should I not") must miss, however similar the rest of the text is,
+because the cached answer would give the wrong dosage or the opposite
+advice. Exit status is 1 if any case fails.
+"""
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from app.services.semantic_cache import SemanticCache
+
+# (stored question, looked-up question, language, expect a hit)
+CASES = [
+    ("How much urea should I apply for 2 acres of wheat?",
+     "how much urea should i apply for 2 acres of wheat", "en", True),
+    ("how much urea should i apply for 2 acres of wheat",
+     "how much urea should i apply for 20 acres of wheat", "en", False),
+    ("how much urea should i apply for 2 acres of wheat",
+     "how much urea should i apply for 2.5 acres of wheat", "en", False),
+    ("should i irrigate wheat before applying urea",
+     "should i not irrigate wheat before applying urea", "en", False),
+    ("should i irrigate wheat before applying urea",
+     "shouldn't i irrigate wheat before applying urea", "en", False),
+    ("2 एकड़ गेहूं के लिए कितना यूरिया डालें",
+     "20 एकड़ गेहूं के लिए कितना यूरिया डालें", "hi", False),
+    ("२ एकड़ गेहूं के लिए कितना यूरिया डालें",
+     "2 एकड़ गेहूं के लिए कितना यूरिया डालें", "hi", True),
+    ("क्या गेहूं में यूरिया डालें",
+     "क्या गेहूं में यूरिया नहीं डालें", "hi", False),
+]
+
+
+def main():
+    failures = 0
+    for stored, asked, lang, expect_hit in CASES:
+        cache = SemanticCache(capacity_per_language=16, ttl_seconds=600, thresholds={lang: 0.8})
+        cache.store(stored, lang, {"reply": stored})
+        hit = cache.lookup(asked, lang) is not None
+        ok = hit == expect_hit
+        failures += not ok
+        print(f"{'ok' if ok else 'FAIL':<5} {'hit ' if hit else 'miss'}  {stored!r} -> {asked!r}")
+    print(f"\n{len(CASES) - failures}/{len(CASES)} cases passed")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
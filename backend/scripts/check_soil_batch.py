@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Check that /api/v1/ai/recommend/soil/batch groups identical soils regardless of client id.
+
+Usage:
+    python scripts/check_soil_batch.py
+
+The script posts one batch to a scratch SQLite database. The batch holds
+the same soil three times, under three different client ids: twice as a
+bare item with the id beside the readings, and once in the
+``{"id": ..., "soil": {...}}`` envelope. It also holds one different soil.
+The check passes if the batch reports exactly two groups and each result
+echoes its own id. Exit status is 1 otherwise.
+
+With no GEMINI_API_KEY the groups get the rule-based answer, which is enough
+to check grouping.
+"""
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+os.environ["DATABASE_URL"] = f"sqlite:///{tempfile.mkdtemp()}/soil_batch.db"
+
+from app import create_app
+from app import db as db_module
+from app.db import Base
+
+SOIL = {"ph": 6.8, "nitrogen": 120, "phosphorus": 40, "potassium": 150, "soil_type": "loamy"}
+ITEMS = [
+    {"id": "farmer-1", **SOIL},
+    {"id": "farmer-2", **SOIL},
+    {"id": "farmer-3", "soil": dict(SOIL)},
+    {"id": "farmer-4", **SOIL, "ph": 8.2},
+]
+
+
+def main():
+    app = create_app()
+    Base.metadata.create_all(db_module._engine)
+    resp = app.test_client().post("/api/v1/ai/recommend/soil/batch", json={"items": ITEMS, "language": "en"})
+    body = resp.get_json()
+    ids = [r.get("id") for r in body.get("results", [])]
+    print(f"status {resp.status_code}, {body.get('items')} items in {body.get('groups')} groups, ids {ids}")
+    ok = resp.status_code == 200 and body.get("groups") == 2 and ids == [item["id"] for item in ITEMS]
+    print("ok" if ok else "FAIL: identical soils with different ids were not grouped")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Rebuild the day/week market price rollups from the raw market_prices rows.
+
+Run after bulk-loading or correcting price history. The schema itself is
+managed by Alembic (``alembic upgrade head``).
+"""
+import sys, os
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+from app.config import settings
+from app.services.price_history import rebuild_rollups
+
+def main():
+    engine = create_engine(settings.DATABASE_URL)
+    session = sessionmaker(bind=engine)()
+    try:
+        count = rebuild_rollups(session)
+        print(f"Folded {count} price rows into rollups")
+    finally:
+        session.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the OpenWeather 2.5 API, for exercising the weather cache
+without network access or an API key quota.
+
+Usage:
+    python scripts/weather_stub_server.py --port 8765 [--delay 0.2]
+    OPENWEATHER_BASE_URL=http://127.0.0.1:8765 OPENWEATHER_API_KEY=stub python run_server.py
+
+Serves /weather and /forecast with deterministic data derived from lat/lon,
+and /_stats with the number of upstream calls received per endpoint.
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+_counts = {}
+_counts_lock = threading.Lock()
+
+
+def _current(lat, lon):
+    temp = round(20 + (lat % 10) + (lon % 5) / 2, 1)
+    return {
+        "coord": {"lat": lat, "lon": lon},
+        "weather": [{"id": 800, "main": "Clear", "description": "clear sky", "icon": "01d"}],
+        "main": {"temp": temp, "feels_like": temp + 1, "humidity": 60, "pressure": 1010},
+        "wind": {"speed": 3.2, "deg": 180},
+        "name": f"Stub {lat:.2f},{lon:.2f}",
+        "cod": 200,
+    }
+
+
+def _forecast(lat, lon, cnt):
+    base = _current(lat, lon)
+    now = int(time.time())
+    items = []
+    for i in range(cnt):
+        items.append({
+            "dt": now + (i + 1) * 3 * 3600,
+            "main": {**base["main"], "temp": round(base["main"]["temp"] + (i % 8) - 4, 1)},
+            "weather": base["weather"],
+            "wind": base["wind"],
+            "pop": round((i % 5) / 10, 1),
+        })
+    return {"cod": "200", "cnt": cnt, "list": items, "city": {"name": base["name"], "coord": base["coord"]}}
+
+
+class Handler(BaseHTTPRequestHandler):
+    delay = 0.0
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        qs = parse_qs(url.query)
+        endpoint = url.path.rstrip("/").rsplit("/", 1)[-1]
+        with _counts_lock:
+            _counts[endpoint] = _counts.get(endpoint, 0) + 1
+        if endpoint == "_stats":
+            return self._send(200, dict(_counts))
+        if not qs.get("appid"):
+            return self._send(401, {"cod": 401, "message": "Invalid API key"})
+        try:
+            lat = float(qs["lat"][0])
+            lon = float(qs["lon"][0])
+        except (KeyError, ValueError):
+            return self._send(400, {"cod": "400", "message": "wrong latitude"})
+        if self.delay:
+            time.sleep(self.delay)
+        if endpoint == "weather":
+            return self._send(200, _current(lat, lon))
+        if endpoint == "forecast":
+            cnt = int((qs.get("cnt") or ["40"])[0])
+            return self._send(200, _forecast(lat, lon, cnt))
+        return self._send(404, {"cod": "404", "message": "not found"})
+
+    def _send(self, status, body):
+        raw = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def log_message(self, fmt, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OpenWeather stub server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds to sleep per request")
+    args = parser.parse_args()
+    Handler.delay = args.delay
+    server = ThreadingHTTPServer((args.host, args.port), Handler)
+    print(f"OpenWeather stub listening on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
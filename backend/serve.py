@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Production entry point for the KrishiMitra backend.
+
+    python serve.py                      # waitress (SERVER_MODE=wsgi, the default)
+    SERVER_MODE=asgi python serve.py     # uvicorn + a2wsgi, see asgi.py
+
+Run ``alembic upgrade head`` before starting; the app does not create tables.
+
+Process and thread layout (wsgi mode)
+-------------------------------------
+waitress is a single process. One I/O thread accepts and buffers every
+connection, up to SERVER_CONNECTION_LIMIT. It reads each request in full
+before handing it to one of SERVER_THREADS request threads, and writes each
+response back to the client itself. A slow upload or a slow client
+therefore never holds a request thread. Requests beyond SERVER_THREADS
+wait on the I/O thread, and connections idle for longer than
+SERVER_CHANNEL_TIMEOUT are closed.
+
+All of the following are per process, shared by its threads:
+- the SQLAlchemy pool (DB_POOL_SIZE + DB_MAX_OVERFLOW);
+- the Gemini bulkhead (GEMINI_MAX_CONCURRENCY);
+- the HTTP clients;
+- the in-memory caches.
+
+Keep SERVER_THREADS at or below the pool's capacity, or threads queue for
+a connection for up to DB_POOL_TIMEOUT. To use more cores, run one
+process per core under systemd or as container replicas, each on its own
+PORT, behind the load balancer.
+
+Server-sent-event streams (/api/v1/ai/chat/stream and
+/api/v1/jobs/<id>/events) are the exception to "slow clients don't hold a
+thread". The response is a generator, and a request thread iterates it for
+the life of the stream, up to 120 s for job events. Each open SSE client
+therefore takes one of SERVER_THREADS, in both modes. Size SERVER_THREADS
+for the expected number of concurrent SSE clients plus normal traffic; the
+default of 8 suits light streaming use only. Raise DB_POOL_SIZE /
+DB_MAX_OVERFLOW to match if needed, although a job-events stream only
+borrows a connection while it re-reads the job.
+
+Process and thread layout (asgi mode)
+-------------------------------------
+uvicorn runs SERVER_WORKERS processes on the same port. In each one, an
+event loop owns the sockets, keep-alive connections and slow request
+bodies. Flask still runs synchronously, on a pool of SERVER_THREADS
+threads inside the a2wsgi adapter. a2wsgi iterates the response on that
+pool too, so an SSE stream holds an adapter thread for its whole life,
+just as it holds a request thread under waitress. ASGI mode adds processes
+on one port and event-loop connection handling. It doesn't make streams
+cheaper; that would need async views.
+"""
+import sys
+
+from app import create_app
+from app.config import settings
+
+
+def check_layout():
+    pool = settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+    if settings.SERVER_THREADS > pool:
+        print(f"warning: SERVER_THREADS={settings.SERVER_THREADS} exceeds the DB pool "
+              f"({settings.DB_POOL_SIZE}+{settings.DB_MAX_OVERFLOW}); threads will wait for connections",
+              file=sys.stderr)
+
+
+def serve_wsgi():
+    from waitress import serve
+
+    app = create_app()
+    options = dict(
+        host=settings.SERVER_HOST,
+        port=settings.PORT,
+        threads=settings.SERVER_THREADS,
+        connection_limit=settings.SERVER_CONNECTION_LIMIT,
+        channel_timeout=settings.SERVER_CHANNEL_TIMEOUT,
+        backlog=settings.SERVER_BACKLOG,
+        max_request_body_size=app.config["MAX_CONTENT_LENGTH"],
+        ident="krishimitra",
+    )
+    if settings.SERVER_TRUSTED_PROXY:
+        options.update(
+            trusted_proxy=settings.SERVER_TRUSTED_PROXY,
+            trusted_proxy_headers="x-forwarded-for x-forwarded-proto x-forwarded-host",
+            clear_untrusted_proxy_headers=True,
+        )
+    serve(app, **options)
+
+
+def serve_asgi():
+    try:
+        import uvicorn
+    except ImportError:
+        sys.exit("SERVER_MODE=asgi needs uvicorn and a2wsgi: pip install uvicorn a2wsgi")
+    uvicorn.run(
+        "asgi:app",
+        host=settings.SERVER_HOST,
+        port=settings.PORT,
+        workers=settings.SERVER_WORKERS,
+        limit_concurrency=settings.SERVER_CONNECTION_LIMIT,
+        timeout_keep_alive=settings.SERVER_CHANNEL_TIMEOUT,
+        backlog=settings.SERVER_BACKLOG,
+        proxy_headers=bool(settings.SERVER_TRUSTED_PROXY),
+        forwarded_allow_ips=settings.SERVER_TRUSTED_PROXY,
+    )
+
+
+if __name__ == "__main__":
+    check_layout()
+    if settings.SERVER_MODE == "asgi":
+        serve_asgi()
+    elif settings.SERVER_MODE == "wsgi":
+        serve_wsgi()
+    else:
+        sys.exit(f"unknown SERVER_MODE {settings.SERVER_MODE!r}; expected wsgi or asgi")
@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
 """
-KrishiMitra Backend Server Startup Script
+KrishiMitra Backend Server Startup Script (dev server; use serve.py in production)
 """
 from app import create_app
+from app.config import settings
 
 if __name__ == "__main__":
     print("🚀 Starting KrishiMitra Backend Server...")
@@ -16,6 +17,6 @@ if __name__ == "__main__":
     print("-" * 50)
     
     try:
-        app.run(host='0.0.0.0', port=8000, debug=True)
+        app.run(host='0.0.0.0', port=8000, debug=settings.ENV == "development")
     except KeyboardInterrupt:
         print("🛑 Server stopped")
\ No newline at end of file
@@ -2,4 +2,5 @@
 # Dev helper (bash) - optional
 export FLASK_APP=backend/wsgi.py
 export FLASK_ENV=development
+(cd backend && alembic upgrade head)
 flask run --host 0.0.0.0 --port 8000
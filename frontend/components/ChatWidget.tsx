@@ -2,6 +2,7 @@
 import { useState } from "react";
 import Markdown from "./Markdown";
 import { useI18n } from "../lib/i18n";
+import { streamChat } from "../lib/chatService";
 import { useEffect, useRef } from "react";
 import { Mic, MicOff, Image as ImageIcon } from "lucide-react";
 
@@ -112,17 +113,8 @@ export default function ChatWidget() {
         if (fileRef.current) fileRef.current.value = '';
       } else {
         try { localStorage.setItem('km_widget_busy', '1'); localStorage.setItem('km_widget_msg', message || ''); } catch {}
-        const r = await fetch(`${base}/api/v1/ai/chat`, {
-          method: 'POST',
-          headers: { 'Content-Type': 'application/json' },
-          body: JSON.stringify({ message, language: lang })
-        });
-        if (!r.ok) {
-          const ttxt = await r.text().catch(() => '');
-          throw new Error(ttxt || `HTTP ${r.status}`);
-        }
-        const data = await r.json().catch(() => null);
-        const text = (data && (data.reply || JSON.stringify(data))) || '';
+        // Render tokens as they stream in; the final reply replaces the partial text
+        const { reply: text } = await streamChat(base, message, lang, (partial) => setReply(partial));
         setReply(text);
         try { localStorage.setItem('km_widget_reply', text); } catch {}
       }
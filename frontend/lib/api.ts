@@ -254,3 +254,11 @@ export async function recommendSoil(body: any) {
     body: JSON.stringify(body),
   });
 }
+
+// Weather APIs
+export async function getWeatherBatch(points: { lat: number; lon: number; id?: string | number }[], forecast = true) {
+  return apiCall('/api/v1/weather/batch', {
+    method: 'POST',
+    body: JSON.stringify({ points, forecast }),
+  });
+}
@@ -12,6 +12,71 @@ export type ChatState = {
 
 type Listener = () => void;
 
+export type ChatStreamResult = { reply: string; model?: string; cached?: boolean };
+
+// POST /api/v1/ai/chat/stream and parse its Server-Sent Events ("delta", then "done" or "error").
+// onDelta receives the reply accumulated so far. Falls back to the JSON endpoint when the
+// stream can't be opened (e.g. older backend) so callers only need one code path.
+export async function streamChat(
+  baseUrl: string,
+  message: string,
+  lang: string,
+  onDelta: (replySoFar: string) => void
+): Promise<ChatStreamResult> {
+  const r = await fetch(`${baseUrl}/api/v1/ai/chat/stream`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json', Accept: 'text/event-stream' },
+    body: JSON.stringify({ message, language: lang })
+  }).catch(() => null);
+
+  if (!r || !r.ok || !r.body) {
+    const jr = await fetch(`${baseUrl}/api/v1/ai/chat`, {
+      method: 'POST', headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({ message, language: lang })
+    });
+    if (!jr.ok) {
+      const tt = await jr.text().catch(() => '');
+      throw new Error(`HTTP ${jr.status} ${tt}`);
+    }
+    const data = await jr.json().catch(() => null);
+    const reply = (data && (data.reply || JSON.stringify(data))) || '';
+    onDelta(reply);
+    return { reply, model: data?.model, cached: data?.cached };
+  }
+
+  const reader = r.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = '';
+  let reply = '';
+  let result: ChatStreamResult | null = null;
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    let sep: number;
+    while ((sep = buffer.indexOf('\n\n')) !== -1) {
+      const frame = buffer.slice(0, sep);
+      buffer = buffer.slice(sep + 2);
+      let event = 'message';
+      let data = '';
+      for (const line of frame.split('\n')) {
+        if (line.startsWith('event:')) event = line.slice(6).trim();
+        else if (line.startsWith('data:')) data += line.slice(5).trim();
+      }
+      const payload = data ? JSON.parse(data) : {};
+      if (event === 'delta') {
+        reply += payload.text || '';
+        onDelta(reply);
+      } else if (event === 'done') {
+        result = { reply: payload.reply ?? reply, model: payload.model, cached: payload.cached };
+      } else if (event === 'error') {
+        throw new Error(payload.error || 'stream error');
+      }
+    }
+  }
+  return result || { reply };
+}
+
 class ChatServiceImpl {
   private state: ChatState = { message: "", reply: null, error: null, sending: false };
   private listeners: Set<Listener> = new Set();
@@ -61,17 +126,11 @@ class ChatServiceImpl {
     this.state = { ...this.state, sending: true, error: null, reply: null };
     this.emit();
     try {
-      const r = await fetch(`${baseUrl}/api/v1/ai/chat`, {
-        method: 'POST', headers: { 'Content-Type': 'application/json' },
-        body: JSON.stringify({ message, language: lang })
+      const result = await streamChat(baseUrl, message, lang, (partial) => {
+        this.state = { ...this.state, reply: partial };
+        this.emit();
       });
-      if (!r.ok) {
-        const tt = await r.text().catch(() => '');
-        throw new Error(`HTTP ${r.status} ${tt}`);
-      }
-      const data = await r.json().catch(() => null);
-      const reply = (data && (data.reply || JSON.stringify(data))) || '';
-      this.state = { ...this.state, sending: false, reply, model: data?.model };
+      this.state = { ...this.state, sending: false, reply: result.reply, model: result.model };
       this.emit();
     } catch (e: any) {
       this.state = { ...this.state, sending: false, error: e?.message || 'Failed' };